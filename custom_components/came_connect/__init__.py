@@ -1,25 +1,34 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
     DOMAIN, PLATFORMS,
+    STORAGE_KEY_SNAPSHOT, STORAGE_VERSION, SNAPSHOT_SEED_RETRY, SNAPSHOT_SEED_RETRY_MAX,
     # creds & device
-    CONF_CLIENT_ID, CONF_CLIENT_SECRET, CONF_USERNAME, CONF_PASSWORD,
+    CONF_CLIENT_ID, CONF_USERNAME,
     CONF_REDIRECT_URI, CONF_DEVICE_ID, DEFAULT_REDIRECT_URI,
     # websocket options
-    CONF_WEBSOCKET_URL, DEFAULT_WEBSOCKET_URL,
+    CONF_WEBSOCKET_URL, DEFAULT_WEBSOCKET_URL, CONF_WEBSOCKET_RECORD_PATH,
 )
-from .api import CameConnectClient, CameWebsocketClient
+from .account import account_key, async_acquire_account, async_release_account, token_store_for
+from .events import CameEvent
 from .hub import CameEventHub
 
 COORD_LOGGER = logging.getLogger(f"{__name__}.coordinator")
 _LOGGER = logging.getLogger(__name__)
 
+
+def _snapshot_store(hass: HomeAssistant, entry_id: str) -> Store:
+    return Store(hass, STORAGE_VERSION, STORAGE_KEY_SNAPSHOT.format(entry_id=entry_id))
+
+
 async def async_setup(hass: HomeAssistant, config):
     return True
 
@@ -45,25 +54,46 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     redirect_uri = (current_opts.get(CONF_REDIRECT_URI) or DEFAULT_REDIRECT_URI).strip()
     ws_url = (current_opts.get(CONF_WEBSOCKET_URL) or DEFAULT_WEBSOCKET_URL).strip()
+    record_path = (current_opts.get(CONF_WEBSOCKET_RECORD_PATH) or "").strip()
+    if record_path:
+        record_path = hass.config.path(record_path)  # absolute paths pass through
 
     device_id = entry.data[CONF_DEVICE_ID]
-    session = async_get_clientsession(hass)
-
-    client = CameConnectClient(
-        session,
-        entry.data[CONF_CLIENT_ID],
-        entry.data[CONF_CLIENT_SECRET],
-        entry.data[CONF_USERNAME],
-        entry.data[CONF_PASSWORD],
-        redirect_uri,
+
+    # One client/token/WebSocket per CAME account, shared across entries
+    account = await async_acquire_account(
+        hass, entry, redirect_uri=redirect_uri, ws_url=ws_url, record_path=record_path or None
     )
+    client = account.client
+
+    # The hub owns the snapshot entities read; it persists it for the next start
+    hub = CameEventHub(device_id, store=_snapshot_store(hass, entry.entry_id))
 
     async def _async_update_data():
         """One-shot/adhoc fetch; no periodic polling."""
+        requested_at = time.monotonic()
         try:
-            return await client.get_device_status(device_id)
+            record = await client.get_device_status(device_id)
         except Exception as e:
             raise UpdateFailed(str(e)) from e
+        # WS updates that arrived while the request was in flight win
+        return hub.merge_devicestatus(record, requested_at)
+
+    async def _async_seed_restored():
+        """REST seed after a warm start. A failure keeps the restored
+        snapshot (assumed_state) instead of making entities unavailable,
+        and is retried until a record arrives here or via a WS resync."""
+        delay = SNAPSHOT_SEED_RETRY
+        while hub.restored:
+            requested_at = time.monotonic()
+            try:
+                record = await client.get_device_status(device_id)
+            except Exception as e:
+                COORD_LOGGER.debug("Seed for %s failed (%s); retrying in %ss", device_id, e, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, SNAPSHOT_SEED_RETRY_MAX)
+                continue
+            coordinator.async_set_updated_data(hub.merge_devicestatus(record, requested_at))
 
     # Coordinator WITHOUT interval: we seed once, then push WS updates into it.
     coordinator = DataUpdateCoordinator(
@@ -74,39 +104,49 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         update_interval=None,  # no periodic polling
     )
 
-    # Initial seed from REST so entities start with correct state
-    await coordinator.async_config_entry_first_refresh()
+    # Warm start: entities come up from the snapshot saved by the previous
+    # run and the REST seed runs in the background. Without one, seed from
+    # REST first so entities start with correct state.
+    warm_start = await hub.async_restore()
+    if warm_start:
+        coordinator.async_set_updated_data(hub.snapshot)
+    else:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await async_release_account(hass, entry)
+            raise
 
     # --- WebSocket hub wiring ---
-    hub = CameEventHub(device_id)
-    hub.seed_from_devicestatus(coordinator.data or {})
-
-    async def _on_ws_event(code: int, value: int | None):
+    async def _on_ws_event(event: CameEvent):
         """Apply WS event; push snapshot only if it represents a state change.
         """
-        new_snapshot = hub.apply_event(code, value)
+        new_snapshot = hub.apply_event(event)
         if new_snapshot is None:
-            _LOGGER.debug("WS code=%s value=%r ignored (no state change)", code, value)
+            _LOGGER.debug("WS %r ignored (no state change)", event)
             return
 
         # Push to entities (no await)
         coordinator.async_set_updated_data(new_snapshot)
 
-    ws_client = CameWebsocketClient(
-        session=session,
-        ws_url=ws_url,
-        token_getter=client.ensure_token,
-        on_event=_on_ws_event,
+    def _on_resync(record: dict, requested_at: float) -> None:
+        """REST status fetched after a WS (re)connect; WS data newer than it wins."""
+        coordinator.async_set_updated_data(hub.merge_devicestatus(record, requested_at))
+
+    await account.async_add_handler(
+        entry.entry_id,
+        _on_ws_event,
+        device_id=device_id,
+        on_resync=_on_resync,
     )
-    await ws_client.start()
 
     # Stash shared objects
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
+        "account": account,
         "client": client,
         "coordinator": coordinator,
         "device_id": device_id,
-        "ws_client": ws_client,
         "hub": hub,
     }
 
@@ -114,6 +154,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     entry.async_on_unload(entry.add_update_listener(_async_reload_entry))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    if warm_start:
+        entry.async_create_background_task(hass, _async_seed_restored(), f"{DOMAIN}-{device_id}-seed")
     return True
 
 
@@ -125,15 +167,24 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     # Unload platforms first
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        entry_data = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
-        if entry_data:
-            # Stop WS if running
-            ws_client: CameWebsocketClient | None = entry_data.get("ws_client")
-            if ws_client:
-                try:
-                    await ws_client.stop()
-                except Exception:
-                    _LOGGER.debug("WS stop raised", exc_info=True)
+        data = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        if data is not None:
+            # flush the debounced snapshot save before the store can be removed
+            await data["hub"].async_close()
+        # Last entry of the account stops the shared WS and flushes the token
+        await async_release_account(hass, entry)
         if not hass.data.get(DOMAIN):
             hass.data.pop(DOMAIN, None)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    await _snapshot_store(hass, entry.entry_id).async_remove()
+    # Drop the persisted token once no other entry uses the same account
+    key = account_key(entry.data[CONF_CLIENT_ID], entry.data[CONF_USERNAME])
+    for other in hass.config_entries.async_entries(DOMAIN):
+        if other.entry_id != entry.entry_id and account_key(
+            other.data[CONF_CLIENT_ID], other.data[CONF_USERNAME]
+        ) == key:
+            return
+    await token_store_for(hass, key).async_remove()
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+
+from .api import CameConnectClient, CameWebsocketClient, FrameRecorder, ReconnectScheduler
+from .const import (
+    CONF_CLIENT_ID,
+    CONF_CLIENT_SECRET,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DATA_ACCOUNTS,
+    DATA_RECONNECT,
+    DOMAIN,
+    STORAGE_KEY_TOKEN,
+    STORAGE_VERSION,
+    TOKEN_SAVE_DELAY,
+)
+from .events import CameEvent
+
+_LOGGER = logging.getLogger(__name__)
+
+EventHandler = Callable[[CameEvent], Awaitable[None]]
+# (devicestatus record, monotonic time the fetch was issued)
+ResyncHandler = Callable[[dict[str, Any], float], None]
+
+
+def account_key(client_id: str, username: str) -> tuple[str, str]:
+    return (client_id, username.strip().lower())
+
+
+def _account_storage_id(key: tuple[str, str]) -> str:
+    # hashed so the e-mail address does not end up in a .storage file name
+    return hashlib.sha256("\n".join(key).encode("utf-8")).hexdigest()[:16]
+
+
+def token_store_for(hass: HomeAssistant, key: tuple[str, str]) -> Store:
+    return Store(hass, STORAGE_VERSION, STORAGE_KEY_TOKEN.format(account_id=_account_storage_id(key)))
+
+
+class CameAccount:
+    """One CAME Connect login shared by every config entry of that account.
+
+    Holds the client (token, lock, refresh task) and the realtime WebSocket.
+    Entries attach an event handler; the socket runs while at least one is
+    attached. Redirect URI and WebSocket URL come from the first entry; the
+    socket records frames to the path of the entry that most recently
+    enabled recording, swapped live as entries are reloaded or removed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        key: tuple[str, str],
+        entry: ConfigEntry,
+        redirect_uri: str,
+        ws_url: str,
+        scheduler: ReconnectScheduler | None = None,
+    ) -> None:
+        self.key = key
+        # entry id -> recording path, in the order recording was enabled
+        self._record_paths: dict[str, str] = {}
+        self.scheduler = scheduler or ReconnectScheduler()
+        self.entry_ids: set[str] = set()
+        self._session = async_get_clientsession(hass)
+        self._ws_url = ws_url
+        self._token_store = token_store_for(hass, key)
+        self._start_lock = asyncio.Lock()
+        self._started = False
+        self._handlers: dict[str, EventHandler] = {}
+        # device id -> {entry id: handler}; entries without a device get everything
+        self._routes: dict[str, dict[str, EventHandler]] = {}
+        self._unrouted: dict[str, EventHandler] = {}
+        self.unrouted_events = 0
+        self._resync_handlers: dict[str, tuple[str, ResyncHandler]] = {}
+        self.ws_client: CameWebsocketClient | None = None
+        self.client = CameConnectClient(
+            self._session,
+            entry.data[CONF_CLIENT_ID],
+            entry.data[CONF_CLIENT_SECRET],
+            entry.data[CONF_USERNAME],
+            entry.data[CONF_PASSWORD],
+            redirect_uri,
+            on_token_update=self._save_token,
+        )
+
+    def _save_token(self) -> None:
+        self._token_store.async_delay_save(self.client.export_token_state, TOKEN_SAVE_DELAY)
+
+    async def async_start(self) -> None:
+        async with self._start_lock:
+            if self._started:
+                return
+            try:
+                if self.client.restore_token_state(await self._token_store.async_load()):
+                    _LOGGER.debug("Reusing persisted CAME Connect token for account %s", self.key[1])
+            except Exception:
+                _LOGGER.debug("Persisted token could not be loaded; logging in fresh", exc_info=True)
+            self.client.start_token_refresh()
+            self._started = True
+
+    async def async_add_handler(
+        self,
+        entry_id: str,
+        handler: EventHandler,
+        *,
+        device_id: str | None = None,
+        on_resync: ResyncHandler | None = None,
+    ) -> None:
+        """Attach an entry. Events are routed to it by `device_id`; `on_resync`
+        receives the device's REST status after every WebSocket (re)connect,
+        to fill in events missed while down."""
+        self.remove_handler(entry_id)
+        self._handlers[entry_id] = handler
+        if device_id is None:
+            self._unrouted[entry_id] = handler
+        else:
+            self._routes.setdefault(str(device_id), {})[entry_id] = handler
+            if on_resync is not None:
+                self._resync_handlers[entry_id] = (str(device_id), on_resync)
+        if self.ws_client is None:
+            self.ws_client = CameWebsocketClient(
+                session=self._session,
+                ws_url=self._ws_url,
+                token_getter=self.client.ensure_token,
+                on_event=self._dispatch,
+                circuit_breaker=self.client.circuit_breaker,
+                on_connect=self._resync,
+                token_ttl=self.client.token_expires_in,
+                device_filter=self._wants_device,
+                scheduler=self.scheduler,
+                on_auth_failure=self.client.invalidate_token,
+                recorder=FrameRecorder(self.record_path) if self.record_path else None,
+            )
+            await self.ws_client.start()
+
+    @property
+    def record_path(self) -> str | None:
+        return next(reversed(self._record_paths.values()), None)
+
+    async def async_set_record_path(self, entry_id: str, path: str | None) -> None:
+        """Set (or with None clear) the recording path of `entry_id`; a
+        running socket switches to the resulting path at once."""
+        before = self.record_path
+        self._record_paths.pop(entry_id, None)
+        if path:
+            self._record_paths[entry_id] = path
+        after = self.record_path
+        if after != before and self.ws_client is not None:
+            await self.ws_client.async_set_recorder(FrameRecorder(after) if after else None)
+
+    def remove_handler(self, entry_id: str) -> None:
+        self._handlers.pop(entry_id, None)
+        self._unrouted.pop(entry_id, None)
+        self._resync_handlers.pop(entry_id, None)
+        for device_id, handlers in list(self._routes.items()):
+            if handlers.pop(entry_id, None) is not None and not handlers:
+                del self._routes[device_id]
+
+    def _wants_device(self, device_id: str) -> bool:
+        return bool(self._unrouted) or device_id in self._routes
+
+    async def _resync(self) -> None:
+        """One batched /devicestatus for every attached device."""
+        targets = list(self._resync_handlers.values())
+        if not targets:
+            return
+        requested_at = time.monotonic()
+        try:
+            # a fresh request: one already in flight may predate the connect
+            records = await self.client.get_devices_status(
+                sorted({device_id for device_id, _ in targets}), coalesce=False
+            )
+        except Exception as err:
+            _LOGGER.debug("Resync after WS connect failed: %s", err)
+            return
+        for device_id, on_resync in targets:
+            record = records.get(device_id)
+            if record is None:
+                continue
+            try:
+                on_resync(record, requested_at)
+            except Exception:
+                _LOGGER.exception("Resync handler failed")
+
+    async def _dispatch(self, event: CameEvent) -> None:
+        if event.device_id is None:
+            # frame without a device id: every entry decides for itself
+            handlers = list(self._handlers.values())
+        else:
+            routed = self._routes.get(str(event.device_id))
+            if routed is None and not self._unrouted:
+                self.unrouted_events += 1
+                return
+            handlers = [*(routed or {}).values(), *self._unrouted.values()]
+        for handler in handlers:
+            try:
+                await handler(event)
+            except Exception:
+                _LOGGER.exception("WS event handler failed")
+
+    async def async_close(self) -> None:
+        if self.ws_client:
+            try:
+                await self.ws_client.stop()
+            except Exception:
+                _LOGGER.debug("WS stop raised", exc_info=True)
+            self.ws_client = None
+        await self.client.async_close()
+        # Flush the token now so a reload picks it up instead of logging in again
+        await self._token_store.async_save(self.client.export_token_state())
+
+
+async def async_acquire_account(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    *,
+    redirect_uri: str,
+    ws_url: str,
+    record_path: str | None = None,
+) -> CameAccount:
+    """Return the shared account for `entry`, creating it on first use.
+    `record_path` is this entry's recording option (see CameAccount)."""
+    accounts: dict[tuple[str, str], CameAccount] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ACCOUNTS, {})
+    key = account_key(entry.data[CONF_CLIENT_ID], entry.data[CONF_USERNAME])
+    account = accounts.get(key)
+    if account is None:
+        # one scheduler for every account, so all sockets share the pacing
+        scheduler = hass.data[DOMAIN].setdefault(DATA_RECONNECT, ReconnectScheduler())
+        account = accounts[key] = CameAccount(
+            hass, key, entry, redirect_uri, ws_url, scheduler
+        )
+    account.entry_ids.add(entry.entry_id)
+    await account.async_set_record_path(entry.entry_id, record_path)
+    try:
+        await account.async_start()
+    except Exception:
+        await async_release_account(hass, entry)
+        raise
+    return account
+
+
+async def async_release_account(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Detach `entry`; the last entry out tears the account down."""
+    accounts: dict[tuple[str, str], CameAccount] = hass.data.get(DOMAIN, {}).get(DATA_ACCOUNTS, {})
+    key = account_key(entry.data[CONF_CLIENT_ID], entry.data[CONF_USERNAME])
+    account = accounts.get(key)
+    if account is None:
+        return
+    account.remove_handler(entry.entry_id)
+    account.entry_ids.discard(entry.entry_id)
+    if account.entry_ids:
+        await account.async_set_record_path(entry.entry_id, None)
+        return
+    accounts.pop(key, None)
+    if not accounts:
+        hass.data.get(DOMAIN, {}).pop(DATA_ACCOUNTS, None)
+        hass.data.get(DOMAIN, {}).pop(DATA_RECONNECT, None)
+    await account.async_close()
@@ -11,17 +11,35 @@ import ssl
 import aiohttp
 import logging
 import json
+import random
 import contextlib
+import functools
+import heapq
+import math
 import re
 import uuid
 
-from dataclasses import dataclass
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlencode
 
-from typing import Any, Dict, Optional, Callable, Awaitable, Mapping
+from typing import Any, Dict, Optional, Callable, Awaitable, Iterable, Mapping
 
 from .const import (
     API_BASE,
+    BPT_CACHE_MAX_ENTRIES,
+    BPT_CACHE_TTL_NEGATIVE,
+    BPT_CACHE_TTL_SIPACCOUNTS,
+    BPT_CACHE_TTL_SITE_DEVICES,
+    BPT_CACHE_TTL_SITES,
+    CIRCUIT_CLOSED,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_MIN_CALLS,
+    CIRCUIT_OPEN,
+    CIRCUIT_OPEN_SECONDS,
+    CIRCUIT_WINDOW,
     CONF_BPT_DEVICE_TOKEN,
     CONF_BPT_KEYCODE,
     CONF_BPT_PANEL_ADDR,
@@ -39,19 +57,109 @@ from .const import (
     DEFAULT_BPT_SIP_PROXY_HOST,
     DEFAULT_BPT_SIP_PROXY_PORT,
     DEFAULT_BPT_TARGET_USER,
+    DEFAULT_TOKEN_REFRESH_FRACTION,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_MIN_RATE,
+    RATE_LIMIT_RATE,
+    RATE_LIMIT_RECOVERY_STEP,
+    REQUEST_DEADLINE_COMMAND,
+    REQUEST_DEADLINE_DEFAULT,
+    REQUEST_DEADLINE_STATUS,
+    RETRY_AFTER_MAX,
+    STATUS_BATCH_WINDOW,
+    TOKEN_EXPIRY_SKEW,
+    TOKEN_FALLBACK_TTL,
+    TOKEN_REFRESH_RETRY,
+    WS_COMPRESS,
+    WS_EVENT_QUEUE_SIZE,
+    WS_HEARTBEAT_INTERVAL,
+    WS_IDLE_TIMEOUT,
+    WS_RECONNECT_BASE,
+    WS_RECONNECT_CAP,
+    WS_RECONNECT_CONCURRENCY,
+    WS_RECONNECT_OVERLOAD,
+    WS_ROTATE_DEDUPE_WINDOW,
+    WS_ROTATE_LEAD,
+    WS_ROTATE_RETRY,
 )
 
+from .events import EVENT_DECODERS, CameEvent, decode_event
+
+try:  # shipped with Home Assistant core; plain json is the fallback
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    _orjson = None
+
 _LOGGER = logging.getLogger(__name__)
 WS_LOGGER = logging.getLogger(__name__ + ".ws")  
 
+_ws_json_loads: Callable[[str | bytes], Any] = _orjson.loads if _orjson else json.loads
+
+# Outer "EventId" of a realtime frame. The inner Data is a JSON-encoded
+# string, so its quotes are escaped and cannot match this pattern.
+_WS_EVENT_ID_RE = re.compile(r'"EventId"\s*:\s*(\d+)')
+_WS_EVENT_ID_RE_BYTES = re.compile(_WS_EVENT_ID_RE.pattern.encode())
+_WS_DEVICE_ID_RE = re.compile(r'"DeviceId"\s*:\s*"?(\d+)')
+_WS_DEVICE_ID_RE_BYTES = re.compile(_WS_DEVICE_ID_RE.pattern.encode())
+# _parse_frame default: the caller has not looked for a DeviceId yet
+_NOT_SNIFFED: Any = object()
+
+
+def _sniff_device_id(data: str | bytes) -> str | None:
+    if isinstance(data, str):
+        device = _WS_DEVICE_ID_RE.search(data)
+        return device.group(1) if device else None
+    device = _WS_DEVICE_ID_RE_BYTES.search(data)
+    return device.group(1).decode() if device else None
+
+# How the socket ended, from its close code or handshake HTTP status.
+# 4xxx codes are application-defined; the ones below are the usual auth codes.
+WS_OUTCOME_NORMAL = "normal"
+WS_OUTCOME_AUTH = "auth"
+WS_OUTCOME_OVERLOAD = "overload"
+WS_OUTCOME_ERROR = "error"
+_WS_NORMAL_CLOSE_CODES = frozenset({1000, 1001, 1012})  # normal, going away, service restart
+_WS_AUTH_CLOSE_CODES = frozenset({1008, 4001, 4003, 4401, 4403})  # policy violation, app auth codes
+_WS_OVERLOAD_CLOSE_CODES = frozenset({1013, 1014})  # try again later, bad gateway
+_WS_AUTH_STATUSES = frozenset({401, 403})
+_WS_OVERLOAD_STATUSES = frozenset({429, 502, 503, 504})
+
+
+def classify_ws_close(close_code: int | None = None, status: int | None = None) -> str:
+    """Map a close code or a handshake HTTP status to a WS_OUTCOME_* value."""
+    if status is not None:
+        if status in _WS_AUTH_STATUSES:
+            return WS_OUTCOME_AUTH
+        if status in _WS_OVERLOAD_STATUSES:
+            return WS_OUTCOME_OVERLOAD
+        return WS_OUTCOME_ERROR
+    if close_code in _WS_NORMAL_CLOSE_CODES:
+        return WS_OUTCOME_NORMAL
+    if close_code in _WS_AUTH_CLOSE_CODES:
+        return WS_OUTCOME_AUTH
+    if close_code in _WS_OVERLOAD_CLOSE_CODES:
+        return WS_OUTCOME_OVERLOAD
+    return WS_OUTCOME_ERROR
+
+
+# Events with a registered decoder; others are skipped unparsed
+_WS_HANDLED_EVENTS = frozenset(EVENT_DECODERS)
+
 class CameAuthError(Exception):
     """Authentication/authorization failure (bad creds or rejected token)."""
 
 class CameApiError(Exception):
     """Non-auth API failure (bad request/server error/etc.)."""
 
+class CameCircuitOpenError(CameApiError):
+    """The cloud API is failing; calls are rejected until a probe succeeds."""
+
 class CameRateLimitError(Exception):
-    """429 rate limit (we'll use this later)."""
+    """429 rate limit; `retry_after` is the server's hint in seconds, if any."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 MOBILE_APP_FEATURE_ID = 4
@@ -67,6 +175,53 @@ SETTING_ENABLED = 5
 SETTING_ICON = 6
 
 
+@dataclass
+class TokenStats:
+    """Counters for the background token lifecycle."""
+
+    renewals: int = 0
+    refresh_grants: int = 0
+    password_logins: int = 0
+    failures: int = 0
+    last_latency: float | None = None
+    last_error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class RequestStats:
+    """Counters for REST traffic issued by the client."""
+
+    issued: int = 0
+    coalesced: int = 0
+    retries: int = 0
+    deadline_exceeded: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retries for idempotent calls on 5xx and connection errors.
+
+    Backoff is exponential with full jitter; the per-call deadline still caps
+    the total time spent across attempts.
+    """
+
+    attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 2.0
+    retry_statuses: frozenset[int] = frozenset({500, 502, 503, 504})
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
 @dataclass(frozen=True)
 class BptDiscovery:
     keycode: str
@@ -206,6 +361,241 @@ class BptSetupPreview:
     token_source: str
 
 
+class _AdaptiveRateLimiter:
+    """Token bucket shared by every REST call of one account.
+
+    Each 429 halves the rate and pauses the bucket for Retry-After; every
+    successful call wins back a small step until the ceiling is reached.
+    """
+
+    def __init__(self, rate: float, burst: int, min_rate: float, recovery_step: float) -> None:
+        self.rate = rate
+        self._max_rate = rate
+        self._min_rate = min_rate
+        self._recovery_step = recovery_step
+        self._burst = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self.throttled = 0
+        self.rate_limited = 0
+
+    async def acquire(self, timeout: float | None = None) -> None:
+        """Take one token. With `timeout`, a bucket that stays empty or
+        paused for longer raises CameRateLimitError at once instead of
+        sleeping past the caller's deadline."""
+        throttled = False
+        give_up_at = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = self._blocked_until - now
+            if wait <= 0:
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            if give_up_at is not None and now + wait > give_up_at:
+                raise CameRateLimitError(f"rate limited for another {wait:.1f}s", wait)
+            if not throttled:
+                throttled = True
+                self.throttled += 1
+            await asyncio.sleep(wait)
+
+    def on_success(self) -> None:
+        if self.rate < self._max_rate:
+            self.rate = min(self._max_rate, self.rate + self._recovery_step)
+
+    def on_rate_limited(self, retry_after: float | None) -> None:
+        self.rate_limited += 1
+        self.rate = max(self._min_rate, self.rate / 2)
+        self._tokens = 0.0
+        pause = retry_after if retry_after is not None else 1 / self.rate
+        self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self._max_rate,
+            "throttled": self.throttled,
+            "rate_limited": self.rate_limited,
+        }
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a sliding window of call outcomes.
+
+    While open every call fails fast with CameCircuitOpenError. After
+    `open_seconds` one caller is let through as a probe; its outcome closes
+    the breaker again or re-opens it.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: int = CIRCUIT_WINDOW,
+        min_calls: int = CIRCUIT_MIN_CALLS,
+        failure_threshold: float = CIRCUIT_FAILURE_THRESHOLD,
+        open_seconds: float = CIRCUIT_OPEN_SECONDS,
+    ) -> None:
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._min_calls = min_calls
+        self._failure_threshold = failure_threshold
+        self._open_seconds = open_seconds
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._listeners: list[Callable[[], None]] = []
+        self.state = CIRCUIT_CLOSED
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def retry_in(self) -> float:
+        """Seconds until a probe may be attempted; 0 when calls may go through."""
+        if self.state != CIRCUIT_OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._open_seconds - time.monotonic())
+
+    def before_call(self) -> None:
+        if self.state == CIRCUIT_OPEN and self.retry_in() <= 0:
+            self._set_state(CIRCUIT_HALF_OPEN)
+        if self.state == CIRCUIT_OPEN or (self.state == CIRCUIT_HALF_OPEN and self._probe_in_flight):
+            self.rejected += 1
+            raise CameCircuitOpenError(
+                f"CAME Connect cloud unavailable (circuit {self.state}); "
+                f"next attempt in {self.retry_in():.0f}s"
+            )
+        if self.state == CIRCUIT_HALF_OPEN:
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self._probe_in_flight = False
+        if self.state != CIRCUIT_CLOSED:
+            self._outcomes.clear()
+            self._set_state(CIRCUIT_CLOSED)
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        if self.state == CIRCUIT_HALF_OPEN:
+            self._open()
+            return
+        self._outcomes.append(False)
+        if (
+            self.state == CIRCUIT_CLOSED
+            and len(self._outcomes) >= self._min_calls
+            and self.failure_rate >= self._failure_threshold
+        ):
+            self._open()
+
+    def release_probe(self) -> None:
+        """The probe was abandoned (cancelled) without an outcome."""
+        self._probe_in_flight = False
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "failure_rate": round(self.failure_rate, 3),
+            "retry_in": round(self.retry_in(), 1),
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+        self._set_state(CIRCUIT_OPEN)
+
+    def _set_state(self, state: str) -> None:
+        if state == self.state:
+            return
+        _LOGGER.info("CAME Connect circuit %s -> %s", self.state, state)
+        self.state = state
+        for listener in list(self._listeners):
+            try:
+                listener()
+            except Exception:
+                _LOGGER.debug("Circuit listener raised", exc_info=True)
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Retry-After as seconds; accepts both delta-seconds and HTTP dates."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    if not math.isfinite(seconds):
+        return None  # "inf" / "nan" parse as floats but are not delays
+    return min(max(0.0, seconds), RETRY_AFTER_MAX)
+
+
+class _CachedFailure:
+    """Negative cache entry: every lookup raises a fresh CameApiError with
+    this message, so repeated hits do not grow one shared traceback."""
+
+    __slots__ = ("message",)
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+
+class _TtlLruCache:
+    """Bounded cache with per-entry expiry; least recently used entries go first.
+
+    A stored _CachedFailure is a negative result and is raised on lookup.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._data: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: tuple) -> tuple[bool, Any]:
+        item = self._data.get(key)
+        if item is None:
+            return False, None
+        expires_at, value = item
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        if isinstance(value, _CachedFailure):
+            raise CameApiError(value.message)
+        return True, value
+
+    def set(self, key: tuple, value: Any, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+
+    def discard_kind(self, kind: str) -> None:
+        """Drop every entry whose key starts with `kind`."""
+        for key in [key for key in self._data if key[0] == kind]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 def _coerce_list(payload: Any) -> list[dict[str, Any]]:
     if isinstance(payload, list):
         return [item for item in payload if isinstance(item, dict)]
@@ -254,6 +644,24 @@ def _extract_aux_code(
     raise CameApiError(f"Unable to determine AUX code for feature {feature_id} ({name or label})")
 
 
+def _retrieve_exception(future: asyncio.Future) -> None:
+    """Mark a shared future's exception as seen so asyncio does not log it."""
+    if not future.cancelled():
+        future.exception()
+
+
+def _index_device_status(records: list[dict[str, Any]], requested: list[str]) -> dict[str, dict[str, Any]]:
+    result: dict[str, dict[str, Any]] = {}
+    for record in records:
+        record_id = record.get("DeviceId", record.get("Id"))
+        if record_id is not None:
+            result[str(record_id)] = record
+    # single-device answers have been seen without an id; keep that working
+    if not result and len(requested) == 1 and len(records) == 1:
+        result[requested[0]] = records[0]
+    return result
+
+
 def _find_device_record(devices_payload: Any, device_id: int | str) -> dict[str, Any] | None:
     wanted = str(device_id)
     for device in _coerce_list(devices_payload):
@@ -635,6 +1043,20 @@ def _generate_code_challenge(code_verifier: str) -> str:
     return base64.urlsafe_b64encode(digest).decode("utf-8").rstrip("=")
 
 
+def _jwt_expiry(token: str) -> float | None:
+    """Return the `exp` claim (epoch seconds) of a JWT, or None if unreadable."""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = parts[1] + "=" * (-len(parts[1]) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        exp = claims.get("exp") if isinstance(claims, dict) else None
+        return float(exp) if isinstance(exp, (int, float)) else None
+    except (ValueError, TypeError):
+        return None
+
+
 class CameConnectClient:
     def __init__(
         self,
@@ -644,6 +1066,10 @@ class CameConnectClient:
         username: str,
         password: str,
         redirect_uri: str,
+        *,
+        on_token_update: Callable[[], None] | None = None,
+        refresh_fraction: float = DEFAULT_TOKEN_REFRESH_FRACTION,
+        retry_policy: RetryPolicy | None = None,
     ) -> None:
         self._session = session
         self._client_id = client_id
@@ -652,9 +1078,95 @@ class CameConnectClient:
         self._password = password
         self._redirect_uri = redirect_uri
         self._access_token: Optional[str] = None
+        self._refresh_token: Optional[str] = None
         self._code_verifier: Optional[str] = None
         self._expires_at: float = 0.0  # monotonic deadline for the token
+        self._refresh_at: float = 0.0  # monotonic time for background renewal
+        self._refresh_fraction = min(0.95, max(0.1, refresh_fraction))
         self._lock = asyncio.Lock()
+        self._retry_policy = retry_policy or RetryPolicy()
+        # called whenever the token changes so the owner can persist it
+        self._on_token_update = on_token_update
+        self._token_changed = asyncio.Event()
+        self._refresh_task: asyncio.Task | None = None
+        self.token_stats = TokenStats()
+        # BPT discovery responses (/sipaccounts, /sites, /sites/{id}/devices)
+        self._bpt_cache = _TtlLruCache(BPT_CACHE_MAX_ENTRIES)
+        self.circuit_breaker = CircuitBreaker()
+        self.rate_limiter = _AdaptiveRateLimiter(
+            RATE_LIMIT_RATE, RATE_LIMIT_BURST, RATE_LIMIT_MIN_RATE, RATE_LIMIT_RECOVERY_STEP
+        )
+        # in-flight idempotent GETs keyed by (method, url, params)
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self.request_stats = RequestStats()
+        # pending single-device /devicestatus lookups, flushed as one request
+        self._status_waiters: dict[str, asyncio.Future] = {}
+        self._status_flush: asyncio.TimerHandle | None = None
+        self._status_tasks: set[asyncio.Task] = set()
+
+    # ---------- token persistence ----------
+    def export_token_state(self) -> dict[str, Any]:
+        """Return the token state in a JSON-safe form (wall-clock expiry)."""
+        state: dict[str, Any] = {}
+        if self._token_valid():
+            state.update(
+                access_token=self._access_token,
+                expires_at=time.time() + (self._expires_at - time.monotonic()),
+                code_verifier=self._code_verifier,
+            )
+        if self._refresh_token:
+            state["refresh_token"] = self._refresh_token
+        return state
+
+    def restore_token_state(self, state: Mapping[str, Any] | None) -> bool:
+        """Reuse a previously exported token if it is still valid.
+
+        Returns True when an access or refresh token was adopted. A token the
+        server no longer accepts is dropped on the first 401 and renewed.
+        """
+        if not state:
+            return False
+        refresh_token = state.get("refresh_token")
+        if isinstance(refresh_token, str) and refresh_token:
+            self._refresh_token = refresh_token
+        token = state.get("access_token")
+        expires_at = state.get("expires_at")
+        if not isinstance(token, str) or not token or not isinstance(expires_at, (int, float)):
+            return bool(self._refresh_token)
+        remaining = float(expires_at) - time.time()
+        if remaining <= 0:
+            return bool(self._refresh_token)
+        self._access_token = token
+        self._set_token_deadlines(remaining)
+        verifier = state.get("code_verifier")
+        self._code_verifier = verifier if isinstance(verifier, str) and verifier else None
+        return True
+
+    def invalidate_token(self) -> None:
+        """Forget the access token; the next call renews it.
+
+        The refresh token is kept: it is only dropped once the server rejects
+        it, at which point the password flow takes over.
+        """
+        self._access_token = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._notify_token_update()
+
+    def _set_token_deadlines(self, lifetime: float) -> None:
+        now = time.monotonic()
+        skew = min(TOKEN_EXPIRY_SKEW, lifetime * 0.1)
+        self._expires_at = now + max(0.0, lifetime - skew)
+        self._refresh_at = now + lifetime * self._refresh_fraction
+
+    def _notify_token_update(self) -> None:
+        self._token_changed.set()
+        if self._on_token_update is None:
+            return
+        try:
+            self._on_token_update()
+        except Exception:
+            _LOGGER.debug("Token update callback raised", exc_info=True)
 
     # ---------- OAuth helpers ----------
     async def _fetch_auth_code(self) -> str:
@@ -716,65 +1228,370 @@ class CameConnectClient:
             if resp.status != 200 or "access_token" not in js:
                 raise CameApiError(f"token failed: {resp.status} {js}")
 
-            self._access_token = js["access_token"]
-            ttl = int(js.get("expires_in", 0)) or 0
-            # refresh a minute early; keep at least 30s to avoid thrashing
-            self._expires_at = time.monotonic() + max(30, ttl - 60)
-            return self._access_token
+            return self._store_token_response(js)
+
+    async def _fetch_refreshed_token(self) -> str:
+        data = {
+            "grant_type": "refresh_token",
+            "refresh_token": self._refresh_token,
+        }
+        headers = _basic_header(self._client_id, self._client_secret)
+
+        async with self._session.post(f"{API_BASE}/oauth/token", data=data, headers=headers, timeout=20) as resp:
+            js = await resp.json(content_type=None)
+            if resp.status == 401:
+                raise CameAuthError("Refresh token rejected (401)")
+            if resp.status == 400 and isinstance(js, dict) and js.get("error") in {
+                "invalid_grant", "invalid_client", "unauthorized_client"
+            }:
+                raise CameAuthError(f"Refresh token rejected: {js}")
+            if resp.status != 200 or "access_token" not in js:
+                raise CameApiError(f"token refresh failed: {resp.status} {js}")
+
+            return self._store_token_response(js)
+
+    def _store_token_response(self, js: Mapping[str, Any]) -> str:
+        self._access_token = js["access_token"]
+        # servers may omit refresh_token on renewal; keep the one we have then
+        refresh_token = js.get("refresh_token")
+        if isinstance(refresh_token, str) and refresh_token:
+            self._refresh_token = refresh_token
+        ttl = float(js.get("expires_in") or 0)
+        if ttl <= 0:
+            # no expires_in: trust the JWT itself before falling back to a guess
+            exp = _jwt_expiry(self._access_token)
+            ttl = exp - time.time() if exp else TOKEN_FALLBACK_TTL
+        self._set_token_deadlines(max(0.0, ttl))
+        self._notify_token_update()
+        return self._access_token
+
+    def token_expires_in(self) -> float | None:
+        """Seconds until the current token must be replaced; None without one."""
+        if not self._access_token:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
 
     def _token_valid(self) -> bool:
         return bool(self._access_token) and time.monotonic() < self._expires_at
 
+    async def _renew_token(self) -> None:
+        """Refresh-token grant when possible, password auth-code flow otherwise."""
+        started = time.monotonic()
+        try:
+            if not await self._try_refresh_grant():
+                code = await self._fetch_auth_code()
+                await self._fetch_token(code)
+                self.token_stats.password_logins += 1
+        except Exception as err:
+            self.token_stats.failures += 1
+            self.token_stats.last_error = str(err)
+            if isinstance(err, CameAuthError):
+                self.invalidate_bpt_cache()
+            raise
+        else:
+            self.token_stats.renewals += 1
+        finally:
+            self.token_stats.last_latency = time.monotonic() - started
+
+    async def _try_refresh_grant(self) -> bool:
+        """True when the refresh token produced a new access token."""
+        if not self._refresh_token:
+            return False
+        try:
+            await self._fetch_refreshed_token()
+        except CameAuthError as err:
+            _LOGGER.debug("Refresh token rejected, falling back to password login: %s", err)
+            self._refresh_token = None
+            return False
+        self.token_stats.refresh_grants += 1
+        return True
+
     async def ensure_token(self) -> str:
         if self._token_valid():
             return self._access_token  # type: ignore[return-value]
         async with self._lock:
             if not self._token_valid():
-                code = await self._fetch_auth_code()
-                await self._fetch_token(code)
+                await self._renew_token()
             return self._access_token  # type: ignore[return-value]
 
-    # ---------- request helper with 401 retry ----------
-    async def _request(self, method: str, url: str, *, json: Any | None = None, params: dict | None = None) -> tuple[int, Any]:
-        await self.ensure_token()
-        headers = {"Authorization": f"Bearer {self._access_token}", "Accept": "application/json"}
-        # try once; on 401 refresh token and retry once
-        for attempt in (1, 2):
-            async with self._session.request(method, url, headers=headers, json=json, params=params, timeout=20) as resp:
+    # ---------- background token lifecycle ----------
+    def start_token_refresh(self) -> None:
+        """Renew the token in the background before foreground calls need it."""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._token_refresh_loop(), name="came_token_refresh")
+
+    async def async_close(self) -> None:
+        if self._status_flush:
+            self._status_flush.cancel()
+            self._status_flush = None
+            for future in self._status_waiters.values():
+                future.cancel()
+            self._status_waiters = {}
+        for task in list(self._status_tasks):
+            task.cancel()
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresh_task
+            self._refresh_task = None
+
+    async def _token_refresh_loop(self) -> None:
+        while True:
+            # no token yet: wait for the first foreground login to set one
+            delay = max(0.0, self._refresh_at - time.monotonic()) if self._access_token else None
+            self._token_changed.clear()
+            try:
+                await asyncio.wait_for(self._token_changed.wait(), timeout=delay)
+                continue  # token replaced meanwhile; re-plan
+            except asyncio.TimeoutError:
+                pass
+
+            async with self._lock:
+                if not self._access_token or time.monotonic() < self._refresh_at:
+                    continue
                 try:
-                    js = await resp.json(content_type=None)
+                    await self._renew_token()
+                except asyncio.CancelledError:
+                    raise
                 except Exception:
-                    js = {"ok": resp.status}
-                if resp.status == 401 and attempt == 1:
-                    # token expired on the server; clear and refresh
-                    self._access_token = None
-                    await self.ensure_token()
-                    headers["Authorization"] = f"Bearer {self._access_token}"
+                    _LOGGER.warning(
+                        "Background token renewal failed; retrying in %ss", TOKEN_REFRESH_RETRY, exc_info=True
+                    )
+                    self._refresh_at = time.monotonic() + TOKEN_REFRESH_RETRY
+
+    # ---------- request helper with 401 retry ----------
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        json: Any | None = None,
+        params: dict | None = None,
+        deadline: float = REQUEST_DEADLINE_DEFAULT,
+        coalesce: bool = True,
+    ) -> tuple[int, Any]:
+        """Authenticated request; identical in-flight GETs share one response.
+
+        Coalesced callers get the same decoded body object, so treat it as
+        read-only. `deadline` bounds the whole call, retries included. With
+        `coalesce=False` a GET never joins one issued earlier (its answer
+        must postdate the call); later identical GETs join it instead.
+        """
+        if method != "GET" or json is not None:
+            self.request_stats.issued += 1
+            return await self._send_request(method, url, json=json, params=params, deadline=deadline)
+
+        key = (method, url, tuple(sorted((params or {}).items())))
+        task = self._inflight.get(key) if coalesce else None
+        if task is None:
+            task = asyncio.create_task(self._send_request(method, url, params=params, deadline=deadline))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._inflight_done, key))
+            self.request_stats.issued += 1
+        else:
+            self.request_stats.coalesced += 1
+        # shield: a cancelled caller must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    def _inflight_done(self, key: tuple, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:  # not replaced by a fresh GET meanwhile
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every caller went away
+
+    async def _send_request(
+        self,
+        method: str,
+        url: str,
+        *,
+        json: Any | None = None,
+        params: dict | None = None,
+        deadline: float = REQUEST_DEADLINE_DEFAULT,
+    ) -> tuple[int, Any]:
+        breaker = self.circuit_breaker
+        breaker.before_call()
+        try:
+            status, js = await self._send_with_retries(method, url, json=json, params=params, deadline=deadline)
+        except asyncio.CancelledError:
+            breaker.release_probe()
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError, CameApiError):
+            # unreachable, timed out or out of budget
+            breaker.record_failure()
+            raise
+        except Exception:
+            # the server answered (rate limit, rejected credentials)
+            breaker.record_success()
+            raise
+        if status >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return status, js
+
+    async def _send_with_retries(
+        self,
+        method: str,
+        url: str,
+        *,
+        json: Any | None = None,
+        params: dict | None = None,
+        deadline: float = REQUEST_DEADLINE_DEFAULT,
+    ) -> tuple[int, Any]:
+        give_up_at = time.monotonic() + deadline
+        # only GETs are replayed on 5xx/connection errors; commands are not
+        policy = self._retry_policy
+        attempts = policy.attempts if method == "GET" else 1
+        auth_retried = False
+        attempt = 0
+
+        # the deadline covers getting a token and waiting for the rate limiter too
+        await self._ensure_token_by(give_up_at, f"{method} {url}", deadline)
+        headers = {"Authorization": f"Bearer {self._access_token}", "Accept": "application/json"}
+        while True:
+            attempt += 1
+            remaining = give_up_at - time.monotonic()
+            if remaining > 0:
+                await self.rate_limiter.acquire(timeout=remaining)
+                remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                self.request_stats.deadline_exceeded += 1
+                raise CameApiError(f"{method} {url} exceeded its {deadline}s deadline")
+            try:
+                async with asyncio.timeout(remaining):
+                    async with self._session.request(
+                        method, url, headers=headers, json=json, params=params
+                    ) as resp:
+                        try:
+                            js = await resp.json(content_type=None)
+                        except Exception:
+                            js = {"ok": resp.status}
+                        status = resp.status
+                        retry_after = resp.headers.get("Retry-After") if status == 429 else None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                delay = policy.backoff(attempt)
+                if attempt < attempts and time.monotonic() + delay < give_up_at:
+                    _LOGGER.debug("%s %s failed (%s); retrying in %.2fs", method, url, err, delay)
+                    self.request_stats.retries += 1
+                    await asyncio.sleep(delay)
+                    continue
+                if isinstance(err, asyncio.TimeoutError):
+                    self.request_stats.deadline_exceeded += 1
+                    raise CameApiError(f"{method} {url} timed out after {deadline}s") from err
+                raise
+
+            if status == 429:
+                wait = _parse_retry_after(retry_after)
+                self.rate_limiter.on_rate_limited(wait)
+                raise CameRateLimitError(f"{method} {url} rate limited: {js}", wait)
+            self.rate_limiter.on_success()
+            if status == 401 and not auth_retried:
+                # token expired or revoked on the server (also covers a
+                # stale persisted token); clear and renew, once
+                auth_retried = True
+                attempt -= 1
+                self.invalidate_token()
+                await self._ensure_token_by(give_up_at, f"{method} {url}", deadline)
+                headers["Authorization"] = f"Bearer {self._access_token}"
+                continue
+            if status in policy.retry_statuses and attempt < attempts:
+                delay = policy.backoff(attempt)
+                if time.monotonic() + delay < give_up_at:
+                    _LOGGER.debug("%s %s returned %s; retrying in %.2fs", method, url, status, delay)
+                    self.request_stats.retries += 1
+                    await asyncio.sleep(delay)
                     continue
-                return resp.status, js
-        # not reached
-        return 500, {"error": "unknown"}
+            return status, js
+
+    async def _ensure_token_by(self, give_up_at: float, call: str, deadline: float) -> None:
+        """ensure_token() within a call's deadline. The renewal is shared
+        (shielded), so giving up here does not abort it for other callers."""
+        if self._token_valid():
+            return
+        try:
+            async with asyncio.timeout(max(0.0, give_up_at - time.monotonic())):
+                await asyncio.shield(self.ensure_token())
+        except asyncio.TimeoutError as err:
+            self.request_stats.deadline_exceeded += 1
+            raise CameApiError(f"{call} exceeded its {deadline}s deadline waiting for a token") from err
 
     # ---------- public API ----------
-    async def get_device_status(self, device_id: int | str) -> Dict[str, Any]:
-        status, js = await self._request("GET", f"{API_BASE}/devicestatus", params={"devices": f"[{device_id}]"})
+    async def get_devices_status(
+        self, device_ids: Iterable[int | str], *, coalesce: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch /devicestatus for several devices in one request, keyed by
+        device id. `coalesce=False` forces a request issued now (see _request)."""
+        ids = list(dict.fromkeys(str(device_id) for device_id in device_ids))
+        if not ids:
+            return {}
+        status, js = await self._request(
+            "GET",
+            f"{API_BASE}/devicestatus",
+            params={"devices": f"[{','.join(ids)}]"},
+            deadline=REQUEST_DEADLINE_STATUS,
+            coalesce=coalesce,
+        )
         if status != 200:
             raise RuntimeError(f"devicestatus failed: {status} {js}")
-        arr = js.get("Data") or js.get("data") or []
-        if not arr:
-            raise RuntimeError("No Data from devicestatus")
-        return arr[0]
+        return _index_device_status(_coerce_list(js), ids)
+
+    async def get_device_status(self, device_id: int | str) -> Dict[str, Any]:
+        """Single-device status; concurrent callers share one batched request."""
+        key = str(device_id)
+        future = self._status_waiters.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._status_waiters[key] = loop.create_future()
+            # callers that gave up (cancelled shield) never await it
+            future.add_done_callback(_retrieve_exception)
+            if self._status_flush is None:
+                self._status_flush = loop.call_later(STATUS_BATCH_WINDOW, self._flush_status_batch)
+        # shield: one caller giving up must not cancel the others' result
+        return await asyncio.shield(future)
+
+    def _flush_status_batch(self) -> None:
+        waiters, self._status_waiters = self._status_waiters, {}
+        self._status_flush = None
+        task = asyncio.get_running_loop().create_task(
+            self._async_resolve_status_batch(waiters), name="came_status_batch"
+        )
+        self._status_tasks.add(task)
+        task.add_done_callback(self._status_tasks.discard)
+
+    async def _async_resolve_status_batch(self, waiters: dict[str, asyncio.Future]) -> None:
+        try:
+            results = await self.get_devices_status(waiters)
+        except asyncio.CancelledError:
+            for future in waiters.values():
+                future.cancel()
+            raise
+        except Exception as err:
+            for future in waiters.values():
+                if not future.done():
+                    future.set_exception(err)
+            return
+        for key, future in waiters.items():
+            if future.done():
+                continue
+            if key in results:
+                future.set_result(results[key])
+            else:
+                future.set_exception(RuntimeError("No Data from devicestatus"))
 
     async def send_command(self, device_id: int | str, command_id: int) -> Any:
-        status, js = await self._request("POST", f"{API_BASE}/automations/{device_id}/commands/{command_id}", json={})
+        status, js = await self._request(
+            "POST",
+            f"{API_BASE}/automations/{device_id}/commands/{command_id}",
+            json={},
+            deadline=REQUEST_DEADLINE_COMMAND,
+        )
         if status not in (200, 202):
             raise RuntimeError(f"command {command_id} failed: {status} {js}")
         return js
 
     async def async_open_bpt_door(self, config: BptDoorConfig) -> dict[str, Any]:
         xip_result = await self._async_bpt_xipregister(config)
-        result = await asyncio.to_thread(
-            self._send_bpt_xml_command,
+        result = await self._async_send_bpt_xml_command(
             config,
             _build_open_door_xml(config.src_addr, config.panel_addr),
             _build_subject(config.src_addr, config.panel_addr, config.subject_label),
@@ -784,8 +1601,7 @@ class CameConnectClient:
 
     async def async_open_bpt_aux(self, config: BptDoorConfig, aux_code: int) -> dict[str, Any]:
         xip_result = await self._async_bpt_xipregister(config)
-        result = await asyncio.to_thread(
-            self._send_bpt_xml_command,
+        result = await self._async_send_bpt_xml_command(
             config,
             _build_aux_xml(config.src_addr, config.panel_addr, aux_code),
             None,
@@ -794,6 +1610,31 @@ class CameConnectClient:
         result.update(xip_result)
         return result
 
+    async def _async_send_bpt_xml_command(
+        self,
+        config: BptDoorConfig,
+        body: str,
+        subject: str | None,
+    ) -> dict[str, Any]:
+        try:
+            return await asyncio.to_thread(self._send_bpt_xml_command, config, body, subject)
+        except CameAuthError:
+            # SIP REGISTER rejected: the discovered slot/token may be stale
+            self.invalidate_bpt_cache()
+            raise
+
+    def invalidate_bpt_cache(self) -> None:
+        """Drop cached BPT discovery so the next lookup hits the cloud."""
+        self._bpt_cache.clear()
+
+    def _bpt_cache_get(self, key: tuple) -> tuple[bool, Any]:
+        hit, value = self._bpt_cache.get(key)
+        if hit:
+            self.request_stats.cache_hits += 1
+        else:
+            self.request_stats.cache_misses += 1
+        return hit, value
+
     async def _async_bpt_xipregister(self, config: BptDoorConfig) -> dict[str, Any]:
         xip_status, xip_body = await self._request(
             "GET",
@@ -970,6 +1811,9 @@ class CameConnectClient:
         preferred_src_addr: str = "",
     ) -> BptResolvedTarget:
         device_token = str(options.get(CONF_BPT_DEVICE_TOKEN, "")).strip()
+        missing_key = ("bpt_target_missing", str(device_id), device_token, preferred_sip_user, preferred_src_addr)
+        # raises a recent "not found" again; not a lookup for the hit/miss stats
+        self._bpt_cache.get(missing_key)
 
         token_candidates: list[tuple[str, BptSipAccount | None]] = []
         if device_token:
@@ -1040,18 +1884,33 @@ class CameConnectClient:
 
         if last_error:
             raise last_error
-        raise CameApiError(f"BPT device {device_id} was not found during autodiscovery")
+        message = f"BPT device {device_id} was not found during autodiscovery"
+        # remember the miss briefly, and refetch the device lists once it expires
+        self._bpt_cache.discard_kind("site_devices")
+        self._bpt_cache.set(missing_key, _CachedFailure(message), BPT_CACHE_TTL_NEGATIVE)
+        raise CameApiError(message)
 
     async def async_get_sip_accounts(self) -> list[BptSipAccount]:
+        key = ("sipaccounts",)
+        hit, cached = self._bpt_cache_get(key)
+        if hit:
+            return list(cached)
         status, js = await self._request("GET", f"{API_BASE}/sipaccounts")
         if status != 200:
             raise CameApiError(f"sipaccounts discovery failed: {status} {js}")
         accounts = _extract_bpt_sip_accounts(js)
         if not accounts:
-            raise CameApiError("No BPT SIP accounts returned during autodiscovery")
+            message = "No BPT SIP accounts returned during autodiscovery"
+            self._bpt_cache.set(key, _CachedFailure(message), BPT_CACHE_TTL_NEGATIVE)
+            raise CameApiError(message)
+        self._bpt_cache.set(key, tuple(accounts), BPT_CACHE_TTL_SIPACCOUNTS)
         return accounts
 
     async def async_get_sites(self, device_token: str) -> list[dict[str, Any]]:
+        key = ("sites", device_token)
+        hit, cached = self._bpt_cache_get(key)
+        if hit:
+            return list(cached)
         status, js = await self._request(
             "GET",
             f"{API_BASE}/evo/v1/sites",
@@ -1061,10 +1920,17 @@ class CameConnectClient:
             raise CameApiError(f"site discovery failed: {status} {js}")
         sites = _coerce_list(js)
         if not sites:
-            raise CameApiError("No sites returned during BPT autodiscovery")
+            message = "No sites returned during BPT autodiscovery"
+            self._bpt_cache.set(key, _CachedFailure(message), BPT_CACHE_TTL_NEGATIVE)
+            raise CameApiError(message)
+        self._bpt_cache.set(key, tuple(sites), BPT_CACHE_TTL_SITES)
         return sites
 
     async def async_get_site_devices(self, site_id: int | str, device_token: str) -> list[dict[str, Any]]:
+        key = ("site_devices", str(site_id), device_token)
+        hit, cached = self._bpt_cache_get(key)
+        if hit:
+            return list(cached)
         status, js = await self._request(
             "GET",
             f"{API_BASE}/evo/v1/sites/{site_id}/devices",
@@ -1072,7 +1938,11 @@ class CameConnectClient:
         )
         if status != 200:
             raise CameApiError(f"device discovery failed for site {site_id}: {status} {js}")
-        return _coerce_list(js)
+        devices = _coerce_list(js)
+        self._bpt_cache.set(
+            key, tuple(devices), BPT_CACHE_TTL_SITE_DEVICES if devices else BPT_CACHE_TTL_NEGATIVE
+        )
+        return devices
 
     def _send_bpt_xml_command(
         self,
@@ -1339,13 +2209,317 @@ class CameConnectClient:
 
 
 
+class ReconnectScheduler:
+    """Paces WebSocket reconnects across every socket that shares it.
+
+    Delays use decorrelated jitter so sockets dropped together do not come
+    back in lockstep, and at most `concurrency` sockets fetch a token and
+    connect at once. Waiting sockets are admitted most recently active
+    first. Outage-to-recovery time (first socket lost until all are back)
+    is recorded for diagnostics.
+    """
+
+    def __init__(
+        self,
+        *,
+        base: float = WS_RECONNECT_BASE,
+        cap: float = WS_RECONNECT_CAP,
+        concurrency: int = WS_RECONNECT_CONCURRENCY,
+    ) -> None:
+        self._base = base
+        self._cap = cap
+        self._limit = max(1, concurrency)
+        self._active = 0
+        self._waiters: list[tuple[float, int, asyncio.Future]] = []
+        self._seq = 0
+        self._clients: set[Any] = set()
+        self._connected: set[Any] = set()
+        self._outage_started: float | None = None
+        self.attempts = 0
+        self.outages = 0
+        self.last_recovery_seconds: float | None = None
+
+    def backoff(self, previous: float | None) -> float:
+        """Next reconnect delay given the previous one (None after a success)."""
+        previous = previous or self._base
+        return min(self._cap, random.uniform(self._base, previous * 3))
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: float = 0.0):
+        """Hold one of the connect slots; lower `priority` is admitted first."""
+        await self._acquire(priority)
+        self.attempts += 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: float) -> None:
+        if self._active < self._limit and not self._waiters:
+            self._active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        heapq.heappush(self._waiters, (priority, self._seq, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()  # admitted just as we were cancelled
+            raise
+
+    def _release(self) -> None:
+        while self._waiters:
+            _priority, _seq, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)  # hand the slot straight over
+                return
+        self._active -= 1
+
+    def register(self, client: Any) -> None:
+        self._clients.add(client)
+
+    def unregister(self, client: Any) -> None:
+        self._clients.discard(client)
+        self._connected.discard(client)
+        self._check_recovered()
+
+    def mark_connected(self, client: Any) -> None:
+        self._connected.add(client)
+        self._check_recovered()
+
+    def mark_disconnected(self, client: Any) -> None:
+        if client not in self._connected:
+            return
+        self._connected.discard(client)
+        if self._outage_started is None:
+            self._outage_started = time.monotonic()
+            self.outages += 1
+
+    def _check_recovered(self) -> None:
+        if self._outage_started is not None and self._connected >= self._clients:
+            self.last_recovery_seconds = time.monotonic() - self._outage_started
+            self._outage_started = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "sockets": len(self._clients),
+            "connected": len(self._connected),
+            "connecting": self._active,
+            "waiting": sum(1 for *_rest, future in self._waiters if not future.done()),
+            "attempts": self.attempts,
+            "outages": self.outages,
+            "outage_seconds": (
+                round(time.monotonic() - self._outage_started, 1) if self._outage_started is not None else None
+            ),
+            "last_recovery_seconds": (
+                round(self.last_recovery_seconds, 1) if self.last_recovery_seconds is not None else None
+            ),
+        }
+
+
+class FrameRecorder:
+    """Appends raw WebSocket frames to a JSONL file for offline replay.
+
+    One line per frame: {"t": <monotonic>, "type": "text"|"binary", "data": ...}
+    with binary payloads base64-encoded. Lines are buffered and written in
+    batches off the event loop.
+    """
+
+    def __init__(self, path: str, *, flush_interval: float = 1.0, max_buffer: int = 200) -> None:
+        self.path = path
+        self._flush_interval = flush_interval
+        self._max_buffer = max_buffer
+        self._buffer: list[str] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._write_lock = asyncio.Lock()
+        self._writes: set[asyncio.Task] = set()
+        self.frames = 0
+
+    def record(self, data: str | bytes) -> None:
+        if isinstance(data, bytes):
+            entry = {"t": time.monotonic(), "type": "binary", "data": base64.b64encode(data).decode("ascii")}
+        else:
+            entry = {"t": time.monotonic(), "type": "text", "data": data}
+        self._buffer.append(json.dumps(entry, separators=(",", ":")))
+        self.frames += 1
+        if len(self._buffer) >= self._max_buffer:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self._flush_interval, self._flush)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._buffer:
+            return
+        lines, self._buffer = self._buffer, []
+        task = asyncio.get_running_loop().create_task(self._write(lines))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _write(self, lines: list[str]) -> None:
+        async with self._write_lock:  # keeps batches in order
+            try:
+                await asyncio.to_thread(self._append, lines)
+            except OSError:
+                WS_LOGGER.warning("Could not write WS recording to %s", self.path, exc_info=True)
+
+    def _append(self, lines: list[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+
+    async def async_close(self) -> None:
+        self._flush()
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+
+@dataclass
+class WebsocketStats:
+    """Counters for the realtime socket's reader/dispatcher pipeline."""
+
+    frames: int = 0
+    events: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    handler_calls: int = 0
+    handler_last_latency: float = 0.0
+    handler_max_latency: float = 0.0
+    pings: int = 0
+    last_rtt: float | None = None
+    stale_reconnects: int = 0
+    rotations: int = 0
+    duplicates_dropped: int = 0
+    foreign_frames: int = 0
+    auth_rejections: int = 0
+    last_close_code: int | None = None
+    last_outcome: str | None = None
+    last_frame_at: float | None = None  # monotonic
+    # permessage-deflate window bits in use; 0 = uncompressed, None = never connected
+    compression: int | None = None
+    compression_fallbacks: int = 0
+    # bytes read off the socket before inflating vs. message payload after it;
+    # wire counts stay None when the transport could not be instrumented
+    wire_bytes: int | None = None
+    payload_bytes: int = 0
+    connection_frames: int = 0
+    connection_wire_bytes: int | None = None
+    connection_payload_bytes: int = 0
+    device_payload_bytes: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def seconds_since_last_frame(self) -> float | None:
+        if self.last_frame_at is None:
+            return None
+        return time.monotonic() - self.last_frame_at
+
+    @property
+    def compression_ratio(self) -> float | None:
+        """Payload bytes per wire byte on the current connection."""
+        if not self.connection_wire_bytes:
+            return None
+        return self.connection_payload_bytes / self.connection_wire_bytes
+
+    def as_dict(self) -> dict[str, Any]:
+        info = asdict(self)
+        info.pop("last_frame_at")
+        info["seconds_since_last_frame"] = self.seconds_since_last_frame
+        info["compression_ratio"] = self.compression_ratio
+        return info
+
+    def new_connection(self, compression: int) -> None:
+        self.compression = compression
+        self.connection_frames = 0
+        self.connection_wire_bytes = None
+        self.connection_payload_bytes = 0
+
+    def count_wire(self, size: int) -> None:
+        self.wire_bytes = (self.wire_bytes or 0) + size
+        self.connection_wire_bytes = (self.connection_wire_bytes or 0) + size
+
+    def count_payload(self, device_id: str | None, size: int) -> None:
+        self.connection_frames += 1
+        self.payload_bytes += size
+        self.connection_payload_bytes += size
+        key = device_id or "unknown"
+        self.device_payload_bytes[key] = self.device_payload_bytes.get(key, 0) + size
+
+
+class _CoalescingEventQueue:
+    """Bounded FIFO of (key, event) pairs.
+
+    On overflow the queue first collapses to the latest event per key;
+    only if that frees nothing is the oldest event dropped. Events with a
+    None key are never coalesced.
+    """
+
+    def __init__(self, maxsize: int, stats: WebsocketStats) -> None:
+        self._maxsize = max(1, maxsize)
+        self._items: deque[tuple[Any, Any]] = deque()
+        self._ready = asyncio.Event()
+        self._stats = stats
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put_nowait(self, key: Any, item: Any) -> None:
+        if len(self._items) >= self._maxsize:
+            self._compact()
+        if len(self._items) >= self._maxsize:
+            self._items.popleft()
+            self._stats.dropped += 1
+        self._items.append((key, item))
+        self._stats.queue_depth = len(self._items)
+        self._stats.max_queue_depth = max(self._stats.max_queue_depth, len(self._items))
+        self._ready.set()
+
+    async def get(self) -> tuple[Any, Any]:
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        entry = self._items.popleft()
+        self._stats.queue_depth = len(self._items)
+        return entry
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._stats.queue_depth = 0
+
+    def _compact(self) -> None:
+        seen: set[Any] = set()
+        kept: list[tuple[Any, Any]] = []
+        for entry in reversed(self._items):
+            key = entry[0]
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            kept.append(entry)
+        self._stats.coalesced += len(self._items) - len(kept)
+        kept.reverse()
+        self._items = deque(kept)
+
+
 class CameWebsocketClient:
     """
     Minimal WS client:
       - Connects with Authorization: Bearer <token>
-      - Parses TEXT frames and calls `on_event(code, value)`
-      - Reconnects only when the server closes/errors
-      - No ping/pong or stale watchdog (by design for now)
+      - A reader task parses TEXT frames into a bounded queue; a dispatcher
+        task drains it and calls `on_event(event)`, so slow handlers
+        never stall socket reads
+      - With `token_ttl`, opens a replacement socket with the fresh token
+        shortly before the current one expires and closes the old socket
+        only once the new one is reading (make-before-break)
+      - Pings every `heartbeat` seconds (RTT in stats) and reconnects when
+        no frame at all arrived within `idle_timeout`, so a half-open TCP
+        connection is noticed within seconds instead of never
+      - Offers permessage-deflate (`compress` window bits) and drops it for
+        good if the server answers the offer with a broken handshake; wire
+        vs. payload bytes are counted per connection and per device
     """
 
     def __init__(
@@ -1353,112 +2527,486 @@ class CameWebsocketClient:
         session: aiohttp.ClientSession,
         ws_url: str,
         token_getter: Callable[[], Awaitable[str]],
-        on_event: Callable[[int, Optional[int]], Awaitable[None]],
+        on_event: Callable[[CameEvent], Awaitable[None]],
+        circuit_breaker: CircuitBreaker | None = None,
+        queue_size: int = WS_EVENT_QUEUE_SIZE,
+        heartbeat: float = WS_HEARTBEAT_INTERVAL,
+        idle_timeout: float = WS_IDLE_TIMEOUT,
+        on_connect: Callable[[], Awaitable[None]] | None = None,
+        token_ttl: Callable[[], float | None] | None = None,
+        device_filter: Callable[[str], bool] | None = None,
+        scheduler: ReconnectScheduler | None = None,
+        on_auth_failure: Callable[[], None] | None = None,
+        recorder: FrameRecorder | None = None,
+        compress: int = WS_COMPRESS,
     ):
         self._session = session
         self._ws_url = ws_url
         self._token_getter = token_getter
         self._on_event = on_event
+        # shared with the REST client so a dead cloud is not hammered twice
+        self._breaker = circuit_breaker
         self._task: asyncio.Task | None = None
+        self._dispatch_task: asyncio.Task | None = None
         self._stop = asyncio.Event()
+        # runs after every (re)connect, e.g. to fetch what was missed meanwhile
+        self._on_connect = on_connect
+        self._connect_task: asyncio.Task | None = None
+        self._resync_pending = False
+        self._token_ttl = token_ttl
+        # shared across sockets so a cloud blip does not cause a reconnect storm
+        self._scheduler = scheduler or ReconnectScheduler()
+        self._last_event_at = 0.0
+        # drops the cached token so the next connect does not reuse a rejected one
+        self._on_auth_failure = on_auth_failure
+        self._auth_retry_used = False
+        self._recorder = recorder
+        self._compress = compress
+        # frames for devices it rejects are dropped before JSON decoding
+        self._device_filter = device_filter
+        self._dedupe_until = 0.0
+        # (frame hash, socket id) seen during a rotation
+        self._recent_frames: deque[tuple[int, int]] = deque(maxlen=64)
+        self._heartbeat = heartbeat
+        self._idle_timeout = max(idle_timeout, heartbeat)
+        # ping payload -> monotonic send time, oldest first; a pong echoes its payload
+        self._pings_in_flight: dict[bytes, float] = {}
+        self.stats = WebsocketStats()
+        self._queue = _CoalescingEventQueue(queue_size, self.stats)
 
     async def start(self) -> None:
         if self._task:
             return
         self._stop.clear()
+        self._scheduler.register(self)
+        self._dispatch_task = asyncio.create_task(self._dispatch_loop(), name="came_ws_dispatch")
         self._task = asyncio.create_task(self._run(), name="came_ws_run")
 
     async def stop(self) -> None:
         self._stop.set()
-        if self._task:
-            self._task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self._task
-            self._task = None
+        self._scheduler.unregister(self)
+        for task in (self._task, self._dispatch_task, self._connect_task):
+            if task:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._task = None
+        self._dispatch_task = None
+        self._connect_task = None
+        self._queue.clear()
+        if self._recorder is not None:
+            await self._recorder.async_close()
+
+    async def async_set_recorder(self, recorder: FrameRecorder | None) -> None:
+        """Record frames to `recorder` from now on (None stops recording)."""
+        previous, self._recorder = self._recorder, recorder
+        if previous is not None and previous is not recorder:
+            await previous.async_close()
+
+    def _notify_connected(self) -> None:
+        if self._on_connect is None:
+            return
+        if self._connect_task and not self._connect_task.done():
+            # a resync from the previous connect is still running and may
+            # predate this connect: run one more once it is done
+            self._resync_pending = True
+            return
+        self._connect_task = asyncio.create_task(self._run_on_connect(), name="came_ws_on_connect")
+
+    async def _run_on_connect(self) -> None:
+        while True:
+            self._resync_pending = False
+            try:
+                await self._on_connect()
+            except Exception:
+                WS_LOGGER.warning("WS on_connect hook failed", exc_info=True)
+            if not self._resync_pending:
+                return
+
+    def _enqueue_frame(
+        self, text: str | bytes, received_at: float | None = None, device_id: str | None = _NOT_SNIFFED
+    ) -> None:
+        self.stats.frames += 1
+        event = self._parse_frame(text, device_id)
+        if event is not None:
+            self.stats.events += 1
+            self._last_event_at = time.monotonic()
+            event.received_at = received_at if received_at is not None else self._last_event_at
+            # only the latest event of each kind per device matters
+            key = (event.device_id, type(event)) if event.device_id is not None else None
+            self._queue.put_nowait(key, event)
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            _key, event = await self._queue.get()
+            started = time.monotonic()
+            try:
+                await self._on_event(event)
+            except Exception:
+                WS_LOGGER.exception("WS event handler failed")
+            latency = time.monotonic() - started
+            self.stats.handler_calls += 1
+            self.stats.handler_last_latency = latency
+            self.stats.handler_max_latency = max(self.stats.handler_max_latency, latency)
 
     async def _run(self) -> None:
-        backoff = 1
+        delay: float | None = None
         while not self._stop.is_set():
+            if self._breaker and (wait := self._breaker.retry_in()) > 0:
+                # the cloud is known to be down; sit out the open period
+                WS_LOGGER.debug("WS reconnect held for %.0fs (circuit open)", wait)
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            outcome = WS_OUTCOME_ERROR
             try:
-                token = await self._token_getter()  # this should be the raw JWT (no "Bearer " prefix)
-
-                # Build WS URL like the browser (note the language param)
-                url = self._ws_url
-                q = {"language": "en-US"}
-                sep = "&" if "?" in url else "?"
-                url = f"{url}{sep}{urlencode(q)}"
-
-                # Web apps send the JWT as a subprotocol
-                # aiohttp exposes this via the `protocols` argument
-                protocols = [token]
-
-                # Many servers also check Origin
-                headers = {"Origin": "https://www.cameconnect.net"}
-
-                async with self._session.ws_connect(
-                    url,
-                    protocols=protocols,
-                    headers=headers,
-                    timeout=20,
-                ) as ws:
-                    WS_LOGGER.info("WS connected")
-                    backoff = 1
-
-                    async for msg in ws:
-                        if msg.type == aiohttp.WSMsgType.TEXT:
-                            WS_LOGGER.debug("WS TEXT: %s", msg.data)
-                            try:
-                                code, value = self._parse_frame(msg.data)
-                                if code is not None:
-                                    await self._on_event(code, value)
-                            except Exception:
-                                WS_LOGGER.warning("WS frame parse failed", exc_info=True)
-                        elif msg.type in (
-                            aiohttp.WSMsgType.CLOSE,
-                            aiohttp.WSMsgType.CLOSED,
-                            aiohttp.WSMsgType.ERROR,
-                        ):
-                            WS_LOGGER.warning("WS closed: %s", msg.type)
+                # most recently active sockets reconnect first
+                async with self._scheduler.slot(-self._last_event_at):
+                    token = await self._token_getter()  # this should be the raw JWT (no "Bearer " prefix)
+                    ws = await self._guarded_connect(token)
+                WS_LOGGER.info("WS connected")
+                delay = None
+                self._scheduler.mark_connected(self)
+                self._notify_connected()
+                receive = None
+                try:
+                    while True:
+                        rotated = await self._read(ws, token, receive)
+                        if rotated is None:
                             break
+                        ws, token, receive = rotated
+                finally:
+                    self._scheduler.mark_disconnected(self)
+                    await ws.close()
+                self.stats.last_close_code = ws.close_code
+                outcome = classify_ws_close(close_code=ws.close_code)
+                WS_LOGGER.info("WS closed (code %s, %s)", ws.close_code, outcome)
 
             except aiohttp.ClientResponseError as e:
                 WS_LOGGER.warning("WS HTTP error %s: %s", e.status, e)
+                outcome = classify_ws_close(status=e.status)
+            except CameCircuitOpenError as e:
+                # another caller holds the half-open probe
+                WS_LOGGER.debug("WS connect held back: %s", e)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                WS_LOGGER.warning("WS connect failed", exc_info=True)
             except asyncio.CancelledError:
                 WS_LOGGER.debug("WS task cancelled")
                 break
             except Exception:
                 WS_LOGGER.exception("WS connect/run error")
 
-            # simple backoff before reconnect
+            delay = self._reconnect_delay(outcome, delay)
             try:
-                await asyncio.wait_for(self._stop.wait(), timeout=backoff)
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
             except asyncio.TimeoutError:
                 pass
-            backoff = min(backoff * 2, 30)
+
+    def _reconnect_delay(self, outcome: str, previous: float | None) -> float:
+        """Delay before the next connect, by how the last attempt ended."""
+        self.stats.last_outcome = outcome
+        if outcome == WS_OUTCOME_AUTH:
+            self.stats.auth_rejections += 1
+            if self._on_auth_failure is not None:
+                self._on_auth_failure()
+            if not self._auth_retry_used:
+                # retry at once with a fresh token; repeated rejections back off
+                self._auth_retry_used = True
+                return 0.0
+            return self._scheduler.backoff(previous)
+        self._auth_retry_used = False
+        if outcome == WS_OUTCOME_NORMAL:
+            return random.uniform(0, WS_RECONNECT_BASE)
+        if outcome == WS_OUTCOME_OVERLOAD:
+            return max(WS_RECONNECT_OVERLOAD, self._scheduler.backoff(previous))
+        return self._scheduler.backoff(previous)
+
+    async def _guarded_connect(self, token: str) -> aiohttp.ClientWebSocketResponse:
+        """_connect as one circuit breaker call: it may be the half-open probe."""
+        if self._breaker is None:
+            return await self._connect(token)
+        self._breaker.before_call()
+        try:
+            ws = await self._connect(token)
+        except aiohttp.ClientResponseError as e:
+            # the cloud answered; only a server-side error counts against it
+            if e.status >= 500:
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
+            raise
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            self._breaker.record_failure()
+            raise
+        except BaseException:
+            self._breaker.release_probe()
+            raise
+        self._breaker.record_success()
+        return ws
+
+    async def _connect(self, token: str) -> aiohttp.ClientWebSocketResponse:
+        # Build WS URL like the browser (note the language param)
+        url = self._ws_url
+        q = {"language": "en-US"}
+        sep = "&" if "?" in url else "?"
+        url = f"{url}{sep}{urlencode(q)}"
+
+        # Web apps send the JWT as a subprotocol
+        # aiohttp exposes this via the `protocols` argument
+        protocols = [token]
+
+        # Many servers also check Origin
+        headers = {"Origin": "https://www.cameconnect.net"}
+
+        try:
+            ws = await self._session.ws_connect(
+                url,
+                protocols=protocols,
+                headers=headers,
+                timeout=20,
+                autoping=False,  # pongs are timed in _receive for RTT
+                compress=self._compress,
+            )
+        except aiohttp.WSServerHandshakeError as e:
+            # a 101 that still fails is a bad Sec-WebSocket-Extensions answer;
+            # servers that do not support deflate simply leave the header out
+            if not self._compress or e.status != 101:
+                raise
+            WS_LOGGER.warning("WS compression negotiation failed (%s); reconnecting uncompressed", e.message)
+            self._compress = 0
+            self.stats.compression_fallbacks += 1
+            return await self._connect(token)
+        self._track_connection(ws)
+        return ws
+
+    def _track_connection(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        self.stats.new_connection(getattr(ws, "compress", 0) or 0)
+        # Count bytes as they come off the transport, ahead of aiohttp's
+        # frame parser and inflater. This reaches into aiohttp internals,
+        # so anything unexpected just leaves the wire counters at None.
+        protocol = getattr(getattr(ws, "_conn", None), "protocol", None)
+        data_received = getattr(protocol, "data_received", None)
+        if data_received is None:
+            return
+        count_wire = self.stats.count_wire
+
+        def counting_data_received(data: bytes) -> None:
+            count_wire(len(data))
+            data_received(data)
+
+        try:
+            protocol.data_received = counting_data_received
+        except (AttributeError, TypeError):
+            WS_LOGGER.debug("WS wire byte counting unavailable", exc_info=True)
+
+    async def _read(
+        self,
+        ws: aiohttp.ClientWebSocketResponse,
+        token: str | None = None,
+        receive: asyncio.Task | None = None,
+    ) -> tuple[aiohttp.ClientWebSocketResponse, str, asyncio.Task] | None:
+        """Read until the socket closes or the keepalive declares it stale.
+
+        Returns (socket, token, receive task) of the replacement when the
+        connection was rotated ahead of token expiry, None otherwise.
+        """
+        self.stats.last_frame_at = time.monotonic()
+        self._pings_in_flight.clear()
+        receive = receive or asyncio.create_task(self._receive(ws), name="came_ws_receive")
+        tasks = {receive, asyncio.create_task(self._keepalive(ws), name="came_ws_keepalive")}
+        rotate = None
+        if token is not None and self._token_ttl is not None:
+            rotate = asyncio.create_task(self._rotate(token), name="came_ws_rotate")
+            tasks.add(rotate)
+        try:
+            while True:
+                done, _pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                if rotate in done:
+                    tasks.discard(rotate)
+                    done.discard(rotate)
+                    replacement = rotate.result()
+                    rotate = None
+                    if replacement is not None:
+                        return await self._hand_over(ws, *replacement)
+                for task in done:
+                    task.result()
+                    return None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if rotate is not None and rotate.done() and not rotate.cancelled() and rotate.exception() is None:
+                # replacement opened but never adopted
+                if (leftover := rotate.result()) is not None:
+                    await leftover[0].close()
+
+    async def _rotate(self, token: str) -> tuple[aiohttp.ClientWebSocketResponse, str] | None:
+        """Open a socket with a fresh token shortly before `token` expires.
+
+        Retried every WS_ROTATE_RETRY seconds while the token is not renewed
+        yet or the connect fails; gives up (None) when `token` is about to
+        expire, leaving the socket to the normal reconnect path.
+        """
+        ttl = self._token_ttl() if self._token_ttl else None
+        if ttl is None:
+            await asyncio.Future()  # nothing to rotate for; wait to be cancelled
+        expires_at = time.monotonic() + ttl
+        await asyncio.sleep(max(ttl - WS_ROTATE_LEAD, ttl / 2))
+        while True:
+            try:
+                fresh = await self._token_getter()
+                if fresh != token:
+                    new_ws = await self._guarded_connect(fresh)
+                    break
+                WS_LOGGER.debug("WS rotation deferred: token not renewed yet")
+            except Exception:
+                WS_LOGGER.warning("WS rotation connect failed; keeping current socket", exc_info=True)
+            if expires_at - time.monotonic() <= WS_ROTATE_RETRY:
+                return None
+            await asyncio.sleep(WS_ROTATE_RETRY)
+        # frames from here on may arrive on both sockets
+        self._dedupe_until = time.monotonic() + WS_ROTATE_DEDUPE_WINDOW
+        self._recent_frames.clear()
+        return new_ws, fresh
+
+    async def _hand_over(
+        self,
+        old_ws: aiohttp.ClientWebSocketResponse,
+        new_ws: aiohttp.ClientWebSocketResponse,
+        token: str,
+    ) -> tuple[aiohttp.ClientWebSocketResponse, str, asyncio.Task]:
+        receive = asyncio.create_task(self._receive(new_ws), name="came_ws_receive")
+        self.stats.rotations += 1
+        WS_LOGGER.info("WS rotated to a fresh token")
+        try:
+            await old_ws.close()
+        except Exception:
+            WS_LOGGER.debug("Closing the previous WS raised", exc_info=True)
+        return new_ws, token, receive
+
+    def _is_duplicate(self, data: str | bytes, socket_id: int) -> bool:
+        """
+        True for a frame already received on the other socket during a
+        rotation. Repeats on the same socket are real events and are kept;
+        each copy on one socket cancels at most one copy on the other.
+        """
+        if not self._dedupe_until:
+            return False
+        if time.monotonic() >= self._dedupe_until:
+            self._dedupe_until = 0.0
+            self._recent_frames.clear()
+            return False
+        digest = hash(data)
+        for index, (seen, seen_on) in enumerate(self._recent_frames):
+            if seen == digest and seen_on != socket_id:
+                del self._recent_frames[index]
+                self.stats.duplicates_dropped += 1
+                return True
+        self._recent_frames.append((digest, socket_id))
+        return False
+
+    async def _receive(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        async for msg in ws:
+            self.stats.last_frame_at = time.monotonic()
+            if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                WS_LOGGER.debug("WS %s: %s", msg.type.name, msg.data)
+                device_id = _sniff_device_id(msg.data)
+                self._count_payload(msg.data, device_id)
+                if self._recorder is not None:
+                    self._recorder.record(msg.data)
+                if self._is_duplicate(msg.data, id(ws)):
+                    continue
+                try:
+                    self._enqueue_frame(msg.data, self.stats.last_frame_at, device_id)
+                except Exception:
+                    WS_LOGGER.warning("WS frame parse failed", exc_info=True)
+            elif msg.type == aiohttp.WSMsgType.PING:
+                await ws.pong(msg.data)
+            elif msg.type == aiohttp.WSMsgType.PONG:
+                self._on_pong(msg.data, self.stats.last_frame_at)
+            elif msg.type in (
+                aiohttp.WSMsgType.CLOSE,
+                aiohttp.WSMsgType.CLOSED,
+                aiohttp.WSMsgType.ERROR,
+            ):
+                WS_LOGGER.warning("WS closed: %s", msg.type)
+                break
+
+    async def _keepalive(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """Ping periodically; return once the socket has been silent too long."""
+        tick = min(self._heartbeat, self._idle_timeout) / 2
+        next_ping = time.monotonic() + self._heartbeat
+        while True:
+            await asyncio.sleep(tick)
+            now = time.monotonic()
+            idle = now - (self.stats.last_frame_at or now)
+            if idle >= self._idle_timeout:
+                WS_LOGGER.warning("WS silent for %.0fs; reconnecting", idle)
+                self.stats.stale_reconnects += 1
+                return
+            if now >= next_ping:
+                next_ping = now + self._heartbeat
+                self.stats.pings += 1
+                payload = str(self.stats.pings).encode()
+                self._pings_in_flight[payload] = now
+                try:
+                    await ws.ping(payload)
+                except (ConnectionError, RuntimeError):
+                    # transport already gone; the receive loop ends on its own
+                    WS_LOGGER.debug("WS ping failed", exc_info=True)
+
+    def _on_pong(self, payload: bytes, received_at: float) -> None:
+        """RTT from the ping this pong answers; earlier unanswered pings are lost."""
+        sent_at = self._pings_in_flight.get(payload)
+        if sent_at is None:
+            return  # unsolicited pong, or one for a ping already given up on
+        for key in list(self._pings_in_flight):
+            del self._pings_in_flight[key]
+            if key == payload:
+                break
+        self.stats.last_rtt = received_at - sent_at
+
+    def _count_payload(self, data: str | bytes, device_id: str | None) -> None:
+        # characters for text frames: the same as bytes for the ASCII JSON
+        # the cloud sends, without encoding every frame again
+        self.stats.count_payload(device_id, len(data))
 
     # --- frame parsing ---
 
-    def _parse_frame(self, text: str) -> tuple[int | None, int | None]:
+    def _parse_frame(self, text: str | bytes, device_id: str | None = _NOT_SNIFFED) -> CameEvent | None:
         """
-        For EventId=21 (VarcoStatusUpdate), return (phase, percent).
-        Everything else → (None, None).
+        Decode a frame into a typed event via the EventId decoder registry
+        (see events.py). Unknown or malformed frames return None.
+
+        EventId and DeviceId are sniffed from the raw frame first so ignored
+        events and other devices' frames never reach the JSON parser;
+        `device_id` is the DeviceId the caller already sniffed, if any.
+        Accepts str or bytes frames.
         """
         try:
-            outer = json.loads(text)
+            is_str = isinstance(text, str)
+            sniffed = (_WS_EVENT_ID_RE if is_str else _WS_EVENT_ID_RE_BYTES).search(text)
+            if sniffed and int(sniffed.group(1)) not in _WS_HANDLED_EVENTS:
+                return None
+            if self._device_filter is not None:
+                if device_id is _NOT_SNIFFED:
+                    device_id = _sniff_device_id(text)
+                if device_id is not None and not self._device_filter(device_id):
+                    self.stats.foreign_frames += 1
+                    return None
+
+            outer = _ws_json_loads(text)
             data = outer.get("Data") or {}
             event_id = data.get("EventId")
+            if event_id not in _WS_HANDLED_EVENTS:
+                return None
 
             inner_raw = data.get("Data")  # JSON-as-string
-            inner = json.loads(inner_raw) if isinstance(inner_raw, str) else (inner_raw or {})
-            payload = inner.get("Payload")
-
-            if event_id == 21 and isinstance(payload, list) and len(payload) >= 2:
-                phase = int(payload[0])
-                percent = int(payload[1])
-                return phase, percent
-
-            # ignore 5/6/23 etc. here; REST fallback will handle if needed
-            return None, None
+            inner = _ws_json_loads(inner_raw) if isinstance(inner_raw, (str, bytes)) else (inner_raw or {})
+            device_id = data.get("DeviceId", inner.get("DeviceId"))
+            return decode_event(event_id, device_id, inner)
         except Exception:
             WS_LOGGER.exception("WS frame parse failed")
-            return None, None
+            return None
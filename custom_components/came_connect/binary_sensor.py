@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any
 
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
@@ -8,33 +8,20 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
-    DOMAIN, PHASE_OPEN, PHASE_CLOSED, PHASE_OPENING, PHASE_CLOSING, PHASE_STOPPED,
+    DOMAIN, FIELD_ONLINE, FIELD_PHASE, FIELD_POSITION,
+    PHASE_OPEN, PHASE_CLOSED, PHASE_OPENING, PHASE_CLOSING, PHASE_STOPPED,
 )
+from .entity import CameGateEntity
 
-class _BaseBS(CoordinatorEntity, BinarySensorEntity):
+class _BaseBS(CameGateEntity, BinarySensorEntity):
     def __init__(self, coordinator, device_id: str, name: str, slug: str):
         super().__init__(coordinator)
         self._device_id = device_id
         self._attr_name = name
         self._attr_unique_id = f"came_gate_{slug}_{device_id}"
 
-    def _raw(self) -> list[int]:
-        data = self.coordinator.data or {}
-        states = data.get("States") or []
-        return (states[2].get("Data") or []) if len(states) >= 3 else []
-
-    def _phase(self) -> Optional[int]:
-        raw = self._raw()
-        if len(raw) >= 1:
-            try:
-                return int(raw[0])
-            except Exception:
-                pass
-        return None
-
     @property
     def device_info(self) -> dict[str, Any]:
         return {"identifiers": {(DOMAIN, self._device_id)}, "name": "Gate", "manufacturer": "CAME", "model": "CAME Connect"}
@@ -43,13 +30,15 @@ class _BaseBS(CoordinatorEntity, BinarySensorEntity):
 class CameMovingBinarySensor(_BaseBS):
     """True while the gate is moving."""
 
+    _hub_fields = frozenset((FIELD_PHASE, FIELD_POSITION))  # raw_data attribute
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(coordinator, device_id, "Gate Moving", "moving")
         self._attr_device_class = BinarySensorDeviceClass.MOVING
 
     @property
     def is_on(self) -> bool | None:
-        ph = self._phase()
+        ph = self.gate.phase
         if ph in (PHASE_OPENING, PHASE_CLOSING):
             return True
         if ph in (PHASE_OPEN, PHASE_CLOSED, PHASE_STOPPED):
@@ -59,22 +48,23 @@ class CameMovingBinarySensor(_BaseBS):
 
     @property
     def extra_state_attributes(self) -> dict:
-        ph = self._phase()
+        ph = self.gate.phase
         direction = "opening" if ph == PHASE_OPENING else "closing" if ph == PHASE_CLOSING else None
-        return {"phase": ph, "direction": direction, "raw_data": self._raw()}
+        return {"phase": ph, "direction": direction, "raw_data": self.gate.raw}
 
 
 class CameHubOnlineBinarySensor(_BaseBS):
     """Connectivity status of the cloud hub."""
 
+    _hub_fields = frozenset((FIELD_ONLINE,))
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(coordinator, device_id, "Gate Hub Online", "online")
         self._attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
 
     @property
     def is_on(self) -> bool | None:
-        val = (self.coordinator.data or {}).get("Online")
-        return bool(val) if val is not None else None
+        return self.gate.online
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
@@ -25,6 +25,7 @@ from .const import (
     CONF_PASSWORD,
     CONF_REDIRECT_URI,
     CONF_USERNAME,
+    CONF_WEBSOCKET_RECORD_PATH,
     CONF_WEBSOCKET_URL,
     DEFAULT_REDIRECT_URI,
     DEFAULT_WEBSOCKET_URL,
@@ -91,6 +92,7 @@ class CameConnectOptionsFlow(config_entries.OptionsFlow):
                 or DEFAULT_REDIRECT_URI
             ),
             CONF_WEBSOCKET_URL: entry.options.get(CONF_WEBSOCKET_URL, DEFAULT_WEBSOCKET_URL),
+            CONF_WEBSOCKET_RECORD_PATH: entry.options.get(CONF_WEBSOCKET_RECORD_PATH, ""),
         }
         for key in BPT_OPTION_KEYS:
             current_options[key] = entry.options.get(key, "")
@@ -275,6 +277,7 @@ class CameConnectOptionsFlow(config_entries.OptionsFlow):
             updates = {
                 CONF_REDIRECT_URI: self._clean(user_input, CONF_REDIRECT_URI),
                 CONF_WEBSOCKET_URL: self._clean(user_input, CONF_WEBSOCKET_URL),
+                CONF_WEBSOCKET_RECORD_PATH: self._clean(user_input, CONF_WEBSOCKET_RECORD_PATH),
             }
             return self.async_create_entry(data=self._build_options(updates=updates))
 
@@ -287,6 +290,8 @@ class CameConnectOptionsFlow(config_entries.OptionsFlow):
                         self._text_selector(),
                     vol.Required(CONF_WEBSOCKET_URL, default=current[CONF_WEBSOCKET_URL]):
                         self._text_selector(),
+                    vol.Optional(CONF_WEBSOCKET_RECORD_PATH, default=current[CONF_WEBSOCKET_RECORD_PATH]):
+                        self._text_selector(),
                 }
             ),
         )
@@ -7,10 +7,73 @@ API_BASE = "https://app.cameconnect.net/api"
 # OAuth / redirect
 DEFAULT_REDIRECT_URI = "https://app.cameconnect.net/role"  # production default
 
+# hass.data[DOMAIN] keys for the shared per-account registry and reconnect pacing
+DATA_ACCOUNTS = "accounts"
+DATA_RECONNECT = "reconnect_scheduler"
+
+# Persistent storage (.storage/came_connect.<account_id>.token)
+STORAGE_VERSION = 1
+STORAGE_KEY_TOKEN = f"{DOMAIN}.{{account_id}}.token"
+TOKEN_SAVE_DELAY = 1  # seconds; coalesces back-to-back token writes
+# Last hub snapshot per entry (.storage/came_connect.<entry_id>.snapshot), for warm starts
+STORAGE_KEY_SNAPSHOT = f"{DOMAIN}.{{entry_id}}.snapshot"
+SNAPSHOT_SAVE_DELAY = 10  # seconds; a moving gate publishes many snapshots
+SNAPSHOT_SEED_RETRY = 15      # first retry of the REST seed after a warm start (seconds)
+SNAPSHOT_SEED_RETRY_MAX = 300 # doubles up to this while the cloud does not answer
+
+# OAuth token lifecycle
+DEFAULT_TOKEN_REFRESH_FRACTION = 0.8  # renew in the background at 80% of the lifetime
+TOKEN_EXPIRY_SKEW = 30                # seconds before expiry a token counts as invalid
+TOKEN_FALLBACK_TTL = 3600             # used when neither expires_in nor a JWT exp is present
+TOKEN_REFRESH_RETRY = 30              # seconds between background retries after a failure
+
+# REST batching
+STATUS_BATCH_WINDOW = 0.05  # seconds single-device /devicestatus calls wait to share a request
+
+# BPT discovery cache (seconds / entries)
+BPT_CACHE_TTL_SIPACCOUNTS = 300
+BPT_CACHE_TTL_SITES = 900
+BPT_CACHE_TTL_SITE_DEVICES = 300
+BPT_CACHE_TTL_NEGATIVE = 30  # "nothing found" answers, so fixes on the cloud side show up quickly
+BPT_CACHE_MAX_ENTRIES = 64
+
+# Per-account REST rate limiter (token bucket, AIMD on 429)
+RATE_LIMIT_RATE = 5.0            # requests per second when the cloud is happy
+RATE_LIMIT_BURST = 10            # bucket size
+RATE_LIMIT_MIN_RATE = 0.2        # floor after repeated 429s
+RATE_LIMIT_RECOVERY_STEP = 0.1   # req/s regained per successful call
+RETRY_AFTER_MAX = 300           # cap on a server-sent Retry-After (seconds)
+
+# Per-call deadlines: total seconds across all attempts of one REST call
+REQUEST_DEADLINE_DEFAULT = 20   # discovery and other background lookups
+REQUEST_DEADLINE_STATUS = 10    # /devicestatus
+REQUEST_DEADLINE_COMMAND = 3    # gate commands; the user is waiting on these
+
+# Circuit breaker around the cloud API
+CIRCUIT_WINDOW = 20              # most recent calls considered
+CIRCUIT_MIN_CALLS = 5            # do not judge the failure rate on fewer calls
+CIRCUIT_FAILURE_THRESHOLD = 0.5  # open at or above this failure rate
+CIRCUIT_OPEN_SECONDS = 30        # fail fast this long before a half-open probe
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
 # --- WebSocket (new push path) ---
 DEFAULT_WEBSOCKET_URL = "wss://app.cameconnect.net/api/events-real-time"
 CONF_USE_WEBSOCKET = "use_websocket"
 CONF_WEBSOCKET_URL = "websocket_url"
+CONF_WEBSOCKET_RECORD_PATH = "websocket_record_path"  # opt-in raw frame capture (JSONL)
+WS_EVENT_QUEUE_SIZE = 64  # decoded events waiting for the dispatcher
+WS_HEARTBEAT_INTERVAL = 30  # seconds between our pings
+WS_IDLE_TIMEOUT = 90        # reconnect when nothing (not even a pong) arrived for this long
+WS_ROTATE_LEAD = 60         # open a replacement socket this long before the token expires
+WS_ROTATE_RETRY = 10        # retry a rotation that found no fresh token or failed to connect
+WS_ROTATE_DEDUPE_WINDOW = 5 # drop frames seen on both sockets during a rotation
+WS_RECONNECT_BASE = 1       # decorrelated-jitter reconnect delay bounds (seconds)
+WS_RECONNECT_CAP = 30
+WS_RECONNECT_CONCURRENCY = 2  # sockets allowed to fetch a token and connect at once
+WS_RECONNECT_OVERLOAD = 15  # minimum delay after the server signals overload
+WS_COMPRESS = 15            # permessage-deflate window bits to offer; 0 disables compression
 
 # Config entry fields
 CONF_CLIENT_ID = "client_id"
@@ -45,4 +108,16 @@ PHASE_CLOSED      = 17
 PHASE_OPENING     = 32
 PHASE_CLOSING     = 33
 PHASE_STOPPED      = 19  # seen when STOP mid-travel
+EVENT_DEVICE_ONLINE  = 5   # unconfirmed: {"Online": true}
+EVENT_DEVICE_OFFLINE = 6   # unconfirmed: {"Online": false}
+EVENT_STATUS_UPDATE  = 21  # "VarcoStatusUpdate": [phase, percent]
+EVENT_ERROR          = 22  # unconfirmed: {"ErrorCode": n}
 EVENT_SNAPSHOT    = 23  # "ManeuverCountUpdate" / full snapshot
+
+# Snapshot fields entities subscribe to; HubSnapshot.changed holds these
+FIELD_PHASE = "phase"
+FIELD_POSITION = "position"
+FIELD_ONLINE = "online"
+FIELD_LAST_SEEN = "last_seen"
+FIELD_ERROR = "error"
+FIELD_MANEUVER_COUNT = "maneuver_count"
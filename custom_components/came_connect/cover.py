@@ -10,20 +10,22 @@ from homeassistant.components.cover import (
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 
 from .const import (
     DOMAIN,    
+    FIELD_PHASE, FIELD_POSITION,
     PHASE_OPEN, PHASE_CLOSED, PHASE_OPENING, PHASE_CLOSING, PHASE_STOPPED,
 )
 
 from .api import CameConnectClient
+from .entity import CameGateEntity
 
 _LOGGER = logging.getLogger(__name__)
 
-class CameGateCover(CoordinatorEntity, CoverEntity):
+class CameGateCover(CameGateEntity, CoverEntity):
     _attr_name = "Gate"
+    _hub_fields = frozenset((FIELD_PHASE, FIELD_POSITION))
     _attr_device_class = CoverDeviceClass.GATE
     _attr_supported_features = (
         CoverEntityFeature.OPEN
@@ -48,41 +50,17 @@ class CameGateCover(CoordinatorEntity, CoverEntity):
             configuration_url="https://app.cameconnect.net/",
         )
  
-    # ---------- helpers ----------
-    def _raw(self) -> list[int]:
-        data = self.coordinator.data or {}
-        states = data.get("States") or []
-        return (states[2].get("Data") or []) if len(states) >= 3 else []
-
-    @staticmethod
-    def _pos_from_raw(raw: list[int]) -> int | None:
-        if len(raw) >= 2:
-            try:
-                return int(raw[1])
-            except Exception:
-                return None
-        return None
-
-    @staticmethod
-    def _phase_from_raw(raw: list[int]) -> int | None:
-        if len(raw) >= 1:
-            try:
-                return int(raw[0])
-            except Exception:
-                return None
-        return None
-
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        raw = self._raw()
-        self._last_pos = self._pos_from_raw(raw)
-        self._phase = self._phase_from_raw(raw)
+        gate = self.gate
+        self._last_pos = gate.position
+        self._phase = gate.phase
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        raw = self._raw()
-        new_pos = self._pos_from_raw(raw)
-        new_phase = self._phase_from_raw(raw)
+    def _handle_hub_update(self) -> None:
+        gate = self.gate
+        new_pos = gate.position
+        new_phase = gate.phase
 
         # Reset each cycle
         self._direction = None
@@ -109,13 +87,13 @@ class CameGateCover(CoordinatorEntity, CoverEntity):
         self._last_pos = new_pos
         self._phase = new_phase
 
-        super()._handle_coordinator_update()
+        super()._handle_hub_update()
 
     # ---------- HA properties ----------
     @property
     def current_cover_position(self) -> int | None:
         """Return the last known position (0–100)."""
-        return self._last_pos if self._last_pos is not None else self._pos_from_raw(self._raw())
+        return self._last_pos if self._last_pos is not None else self.gate.position
 
     @property
     def is_closed(self) -> bool | None:
@@ -159,7 +137,7 @@ class CameGateCover(CoordinatorEntity, CoverEntity):
             "phase_name": mapping.get(self._phase, "Unknown"),
             "direction": (self._direction.capitalize() if self._direction else None),  # optional
             "last_pos": self._last_pos,
-            "raw_data": self._raw(),
+            "raw_data": self.gate.raw,
         }
 
     # ---------- actions ----------
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .api import CameConnectClient
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Runtime counters for the cloud client; no credentials or tokens."""
+    data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if not data:
+        return {}
+    client: CameConnectClient = data["client"]
+    ws_client = data["account"].ws_client
+    return {
+        "device_id": data["device_id"],
+        "account_entries": len(data["account"].entry_ids),
+        "snapshot_version": data["hub"].version,
+        "token": client.token_stats.as_dict(),
+        "requests": client.request_stats.as_dict(),
+        "rate_limit": client.rate_limiter.as_dict(),
+        "circuit": client.circuit_breaker.as_dict(),
+        "websocket": ws_client.stats.as_dict() if ws_client else None,
+        "reconnect": data["account"].scheduler.as_dict(),
+    }
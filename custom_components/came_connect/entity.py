@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import FrozenSet, Optional
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .hub import GateState
+
+
+class CameGateEntity(CoordinatorEntity):
+    """
+    Coordinator entity fed with HubSnapshots. It only writes its state when
+    a snapshot changed one of the fields in `_hub_fields`, so a stream of
+    position frames does not wake the online or error entities.
+    """
+
+    # FIELD_* names the entity renders (state and attributes); None = all
+    _hub_fields: Optional[FrozenSet[str]] = None
+
+    def __init__(self, coordinator, context=None):
+        super().__init__(coordinator, context)
+        self._hub_version: Optional[int] = None
+
+    @property
+    def gate(self) -> GateState:
+        """Typed state of the current snapshot (precomputed by the hub)."""
+        data = self.coordinator.data
+        state = getattr(data, "gate", None)
+        return state if state is not None else GateState.from_snapshot(data or {})
+
+    @property
+    def assumed_state(self) -> bool:
+        """True while showing the snapshot saved by the previous run."""
+        return bool(getattr(self.coordinator.data, "restored", False))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._is_relevant_update():
+            self._handle_hub_update()
+
+    @callback
+    def _handle_hub_update(self) -> None:
+        super()._handle_coordinator_update()
+
+    def _is_relevant_update(self) -> bool:
+        data = self.coordinator.data
+        version = getattr(data, "version", None)
+        seen, self._hub_version = self._hub_version, version
+        if version is None or seen is None or self._hub_fields is None:
+            return True
+        if version != seen + 1:
+            # same snapshot again (availability change) or one this entity missed
+            return True
+        return not data.changed.isdisjoint(self._hub_fields)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from .const import (
+    EVENT_DEVICE_OFFLINE,
+    EVENT_DEVICE_ONLINE,
+    EVENT_ERROR,
+    EVENT_SNAPSHOT,
+    EVENT_STATUS_UPDATE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _fields(event: "CameEvent"):
+    """Slot names that make up the event's content (not when it arrived)."""
+    for cls in type(event).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if name != "received_at":
+                yield name
+
+
+class CameEvent:
+    """
+    A decoded realtime event. device_id is None when the frame has none;
+    received_at is the monotonic time its frame came off the socket.
+    """
+
+    __slots__ = ("device_id", "received_at")
+
+    def __init__(self, device_id: Any = None) -> None:
+        self.device_id = device_id
+        self.received_at: Optional[float] = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in _fields(self))
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _fields(self))
+
+
+class StatusEvent(CameEvent):
+    """VarcoStatusUpdate: movement phase and position percent."""
+
+    __slots__ = ("phase", "percent")
+
+    def __init__(self, device_id: Any, phase: int, percent: Optional[int]) -> None:
+        super().__init__(device_id)
+        self.phase = phase
+        self.percent = percent
+
+
+class ConnectivityEvent(CameEvent):
+    """The hub went online or offline."""
+
+    __slots__ = ("online",)
+
+    def __init__(self, device_id: Any, online: bool) -> None:
+        super().__init__(device_id)
+        self.online = online
+
+
+class ErrorEvent(CameEvent):
+    """Error code reported by the automation; 0 clears it."""
+
+    __slots__ = ("code",)
+
+    def __init__(self, device_id: Any, code: int) -> None:
+        super().__init__(device_id)
+        self.code = code
+
+
+class ManeuverCountEvent(CameEvent):
+    """Running total of manoeuvres performed by the operator."""
+
+    __slots__ = ("count",)
+
+    def __init__(self, device_id: Any, count: int) -> None:
+        super().__init__(device_id)
+        self.count = count
+
+
+class SnapshotEvent(CameEvent):
+    """Full /devicestatus-shaped record pushed by the server."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, device_id: Any, data: Dict[str, Any]) -> None:
+        super().__init__(device_id)
+        self.data = data
+
+
+# EventId -> decoder(device_id, inner) ; inner is the decoded inner Data dict
+EventDecoder = Callable[[Any, Dict[str, Any]], Optional[CameEvent]]
+EVENT_DECODERS: Dict[int, EventDecoder] = {}
+
+
+def event_decoder(event_id: int) -> Callable[[EventDecoder], EventDecoder]:
+    def register(func: EventDecoder) -> EventDecoder:
+        EVENT_DECODERS[event_id] = func
+        return func
+
+    return register
+
+
+def _first_int(payload: Any) -> Optional[int]:
+    if isinstance(payload, list):
+        payload = payload[0] if payload else None
+    if isinstance(payload, dict):
+        payload = payload.get("Code", payload.get("Value"))
+    try:
+        return int(payload)
+    except (TypeError, ValueError):
+        return None
+
+
+@event_decoder(EVENT_STATUS_UPDATE)
+def _decode_status(device_id: Any, inner: Dict[str, Any]) -> Optional[CameEvent]:
+    payload = inner.get("Payload")
+    if isinstance(payload, list) and len(payload) >= 2:
+        return StatusEvent(device_id, int(payload[0]), int(payload[1]))
+    return None
+
+
+# 5, 6 and 22 are not confirmed by captured traffic: their decoders only
+# accept the /devicestatus field they would update, so a different event
+# reusing one of these ids is dropped instead of misread.
+
+
+def _online_flag(inner: Dict[str, Any]) -> Optional[bool]:
+    payload = inner.get("Payload")
+    online = payload.get("Online") if isinstance(payload, dict) else None
+    return online if isinstance(online, bool) else None
+
+
+@event_decoder(EVENT_DEVICE_ONLINE)
+def _decode_online(device_id: Any, inner: Dict[str, Any]) -> Optional[CameEvent]:
+    return ConnectivityEvent(device_id, True) if _online_flag(inner) is True else None
+
+
+@event_decoder(EVENT_DEVICE_OFFLINE)
+def _decode_offline(device_id: Any, inner: Dict[str, Any]) -> Optional[CameEvent]:
+    return ConnectivityEvent(device_id, False) if _online_flag(inner) is False else None
+
+
+@event_decoder(EVENT_ERROR)
+def _decode_error(device_id: Any, inner: Dict[str, Any]) -> Optional[CameEvent]:
+    payload = inner.get("Payload")
+    code = payload.get("ErrorCode") if isinstance(payload, dict) else None
+    if isinstance(code, bool) or not isinstance(code, int):
+        return None
+    return ErrorEvent(device_id, code)
+
+
+@event_decoder(EVENT_SNAPSHOT)
+def _decode_snapshot(device_id: Any, inner: Dict[str, Any]) -> Optional[CameEvent]:
+    # 23 carries either a full status record or just the manoeuvre counter
+    payload = inner.get("Payload")
+    if isinstance(payload, dict) and "States" in payload:
+        return SnapshotEvent(device_id, payload)
+    count = _first_int(payload)
+    return ManeuverCountEvent(device_id, count) if count is not None else None
+
+
+def decode_event(event_id: Any, device_id: Any, inner: Dict[str, Any]) -> Optional[CameEvent]:
+    decoder = EVENT_DECODERS.get(event_id)
+    if decoder is None:
+        return None
+    try:
+        return decoder(device_id, inner)
+    except (TypeError, ValueError):
+        _LOGGER.debug("Malformed payload for EventId %s: %r", event_id, inner, exc_info=True)
+        return None
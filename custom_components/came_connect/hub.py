@@ -1,58 +1,387 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, List
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Optional, Tuple
 import logging
+import time
+from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 from .const import (
+    FIELD_ERROR, FIELD_LAST_SEEN, FIELD_MANEUVER_COUNT, FIELD_ONLINE, FIELD_PHASE, FIELD_POSITION,
     PHASE_OPEN, PHASE_CLOSED, PHASE_OPENING, PHASE_CLOSING, PHASE_STOPPED,
+    SNAPSHOT_SAVE_DELAY,
+)
+from .events import (
+    CameEvent, ConnectivityEvent, ErrorEvent, ManeuverCountEvent, SnapshotEvent, StatusEvent,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 _VALID_PHASES = {PHASE_OPEN, PHASE_CLOSED, PHASE_OPENING, PHASE_CLOSING, PHASE_STOPPED}
 
+# Snapshot fields the WebSocket can update independently
+_FIELDS = ("status", "online", "error", "maneuver_count")
+
+ALL_FIELDS: FrozenSet[str] = frozenset(
+    (FIELD_PHASE, FIELD_POSITION, FIELD_ONLINE, FIELD_LAST_SEEN, FIELD_ERROR, FIELD_MANEUVER_COUNT)
+)
+
+
+class _FrozenDict(dict):
+    """dict that refuses mutation; still serializes and compares like a dict."""
+
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> "_FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "_FrozenDict":
+        return self
+
+    def __reduce__(self) -> Any:
+        return (type(self), (dict(self),))
+
+
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_last_seen(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = dt_util.parse_datetime(value)
+    except Exception:
+        return None
+    if parsed and parsed.tzinfo is None:
+        parsed = dt_util.as_utc(parsed)
+    return parsed
+
+
+class GateState:
+    """
+    Typed view of one snapshot, computed once per publish so entities read
+    attributes instead of walking States[2]['Data'] on every state write.
+    """
+
+    __slots__ = ("phase", "position", "online", "last_seen", "error", "maneuver_count", "raw")
+
+    def __init__(
+        self,
+        phase: Optional[int],
+        position: Optional[int],
+        online: Optional[bool],
+        last_seen: Optional[datetime],
+        error: Optional[int],
+        maneuver_count: Optional[int],
+        raw: Tuple[Any, ...] = (),
+    ) -> None:
+        self.phase = phase
+        self.position = position
+        self.online = online
+        self.last_seen = last_seen
+        self.error = error  # last non-zero ErrorCode/ResponseCode across state slots
+        self.maneuver_count = maneuver_count
+        self.raw = raw  # States[2]['Data'] as received
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"GateState({fields})"
+
+    @classmethod
+    def from_values(cls, values: Dict[str, Any], last_seen: Optional[datetime] = None) -> "GateState":
+        """
+        Build from _field_values(). `last_seen` is the datetime behind
+        values' LastSeen when the caller already has it; otherwise it is
+        parsed.
+        """
+        error = None
+        for slot in values[FIELD_ERROR]:
+            for code in slot:
+                if isinstance(code, int) and code != 0:
+                    error = code
+        online = values[FIELD_ONLINE]
+        count = values[FIELD_MANEUVER_COUNT]
+        return cls(
+            phase=_as_int(values[FIELD_PHASE]),
+            position=_as_int(values[FIELD_POSITION]),
+            online=bool(online) if online is not None else None,
+            last_seen=last_seen if last_seen is not None else _parse_last_seen(values[FIELD_LAST_SEEN]),
+            error=error,
+            maneuver_count=count if isinstance(count, int) else None,
+            raw=values["raw"],
+        )
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> "GateState":
+        return cls.from_values(_field_values(data))
+
+
+class HubSnapshot(_FrozenDict):
+    """
+    Immutable /devicestatus-shaped snapshot published by CameEventHub.
+
+    Nested dicts are read-only and lists are tuples. Every publish gets a
+    higher `version`, so consumers can tell "changed since I last looked"
+    with one integer compare; parts an update did not touch are the very
+    same objects as in the previous snapshot. `changed` holds the FIELD_*
+    names that differ from version - 1; `gate` is the typed GateState.
+    `restored` is True while the data still comes from the copy persisted
+    by the previous run, until the first REST record replaces it.
+    """
+
+    __slots__ = ("version", "changed", "gate", "restored")
+
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        version: int,
+        changed: FrozenSet[str] = ALL_FIELDS,
+        gate: Optional[GateState] = None,
+        restored: bool = False,
+    ) -> None:
+        super().__init__(data)
+        self.version = version
+        self.changed = changed
+        self.gate = gate if gate is not None else GateState.from_snapshot(self)
+        self.restored = restored
+
+    def __repr__(self) -> str:
+        return f"HubSnapshot(v{self.version}, changed={sorted(self.changed)}, {dict.__repr__(self)})"
+
+    def __reduce__(self) -> Any:
+        return (type(self), (dict(self), self.version, self.changed, self.gate, self.restored))
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, _FrozenDict):
+        return value  # frozen all the way down already
+    if isinstance(value, dict):
+        return _FrozenDict({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, tuple):
+        items = tuple(_freeze(item) for item in value)
+        # a tuple of frozen items is frozen already; keep the same object
+        return value if all(new is old for new, old in zip(items, value)) else items
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _field_values(data: Dict[str, Any]) -> Dict[str, Any]:
+    states = data.get("States") or ()
+    gate = states[2] if len(states) > 2 and isinstance(states[2], dict) else {}
+    raw = gate.get("Data") or ()
+    return {
+        "raw": tuple(raw),
+        FIELD_PHASE: raw[0] if len(raw) > 0 else None,
+        FIELD_POSITION: raw[1] if len(raw) > 1 else None,
+        FIELD_ONLINE: data.get("Online"),
+        FIELD_LAST_SEEN: data.get("LastSeen"),
+        # the error sensor looks at every slot; pushed ErrorEvents are written
+        # to the gate slot's ErrorCode
+        FIELD_ERROR: tuple(
+            (slot.get("ErrorCode"), slot.get("ResponseCode")) if isinstance(slot, dict) else (None, None)
+            for slot in states
+        ),
+        FIELD_MANEUVER_COUNT: data.get("ManeuverCount"),
+    }
+
 
 class CameEventHub:
-    """Keeps a /devicestatus-like snapshot and applies WS updates to it."""
+    """
+    Keeps a /devicestatus-like snapshot and applies WS updates to it. With
+    a `store`, every change is persisted (debounced) so the next start can
+    bring entities up from it before the cloud answers.
+    """
 
-    def __init__(self, device_id: str) -> None:
+    def __init__(self, device_id: str, store: Optional[Store] = None) -> None:
         self._device_id = str(device_id)
-        # Seed with a sane default shape (Closed / 0%)
-        self._snapshot: Dict[str, Any] = {"States": [{}, {}, {"Data": [PHASE_CLOSED, 0]}]}
+        self._version = 0
         self._phase: Optional[int] = PHASE_CLOSED
         self._pos: Optional[int] = 0
+        # monotonic time each field was last set from the WebSocket
+        self._ws_updated: Dict[str, float] = {}
+        self._values: Optional[Dict[str, Any]] = None
+        # (LastSeen string, datetime) of the last _touch, so it is never re-parsed
+        self._touched: Tuple[Optional[str], Optional[datetime]] = (None, None)
+        # Seed with a sane default shape (Closed / 0%)
+        self._store: Optional[Store] = None
+        self._save_pending = False
+        self._snapshot = self._publish(self._normalized({}))
+        self._store = store
 
     # --- helpers -------------------------------------------------------------
 
-    def _ensure_shape(self) -> None:
-        """Make sure States[2]['Data'] exists and is a 2-item list."""
-        states = self._snapshot.get("States")
-        if not isinstance(states, list) or len(states) < 3:
-            states = [{}, {}, {}]
-        if not isinstance(states[2], dict):
-            states[2] = {}
-        if not isinstance(states[2].get("Data"), list) or len(states[2]["Data"]) < 2:
-            states[2]["Data"] = [PHASE_CLOSED, 0]
-        self._snapshot["States"] = states
+    def _normalized(self, js: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Mutable copy of a REST record with States[2]['Data'] as a 2-item
+        [phase, pos] list; also resets the cached phase/pos from it.
+        """
+        data = dict(js or {})
+        states = list(data.get("States") or ()) if isinstance(data.get("States"), (list, tuple)) else []
+        states += [{}] * (3 - len(states))
+        gate = dict(states[2]) if isinstance(states[2], dict) else {}
+        try:
+            raw = list(gate.get("Data") or ())
+            self._phase = int(raw[0]) if len(raw) > 0 else PHASE_CLOSED
+            self._pos = int(raw[1]) if len(raw) > 1 else 0
+        except Exception:
+            _LOGGER.debug("Hub seed: bad payload, falling back to defaults", exc_info=True)
+            self._phase, self._pos = PHASE_CLOSED, 0
+        gate["Data"] = [self._phase, self._pos]
+        states[2] = gate
+        data["States"] = states
+        return data
+
+    def _draft(self) -> Dict[str, Any]:
+        """
+        Mutable copy of the current snapshot for the next publish: only the
+        top level, the States list and the gate slot are copied, everything
+        else stays shared with the published snapshot.
+        """
+        data = dict(self._snapshot)
+        states = list(data["States"])
+        states[2] = dict(states[2])
+        data["States"] = states
+        return data
+
+    def _publish(self, data: Dict[str, Any], restored: bool = False, save: bool = True) -> HubSnapshot:
+        values = _field_values(data)
+        previous, self._values = self._values, values
+        if previous is None or restored != self._snapshot.restored:
+            changed = ALL_FIELDS
+        else:
+            changed = frozenset(field for field in ALL_FIELDS if previous[field] != values[field])
+        last_seen = None
+        if values[FIELD_LAST_SEEN] is not None:
+            if values[FIELD_LAST_SEEN] == self._touched[0]:
+                last_seen = self._touched[1]
+            elif FIELD_LAST_SEEN not in changed:
+                last_seen = self._snapshot.gate.last_seen
+        gate = GateState.from_values(values, last_seen=last_seen)
+        # values a _draft() did not replace are the published objects already
+        published = self._snapshot if previous is not None else {}
+        frozen = {key: value if published.get(key) is value else _freeze(value) for key, value in data.items()}
+        self._version += 1
+        self._snapshot = HubSnapshot(frozen, self._version, changed, gate, restored)
+        # pushed updates on top of a restored snapshot are saved too
+        if self._store is not None and changed and save:
+            self._save_pending = True
+            self._store.async_delay_save(self._stored_data, SNAPSHOT_SAVE_DELAY)
+        return self._snapshot
+
+    def _stored_data(self) -> Dict[str, Any]:
+        return {"device_id": self._device_id, "snapshot": self._snapshot}
 
     # --- public API ----------------------------------------------------------
 
-    def seed_from_devicestatus(self, js: Dict[str, Any]) -> None:
-        """Initialize snapshot and internal phase/pos from initial REST payload."""
-        self._snapshot = dict(js or {})
-        self._ensure_shape()
+    @property
+    def snapshot(self) -> HubSnapshot:
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def restored(self) -> bool:
+        return self._snapshot.restored
+
+    async def async_restore(self) -> bool:
+        """Publish the snapshot persisted by the previous run; False if none."""
+        if self._store is None:
+            return False
         try:
-            data: List[int] = self._snapshot["States"][2].get("Data") or []
-            self._phase = int(data[0]) if len(data) > 0 else PHASE_CLOSED
-            self._pos   = int(data[1]) if len(data) > 1 else 0
+            stored = await self._store.async_load()
         except Exception:
-            _LOGGER.debug("Hub seed: bad payload, falling back to defaults", exc_info=True)
-            self._phase, self._pos = PHASE_CLOSED, 0
-            self._snapshot["States"][2]["Data"] = [self._phase, self._pos]
+            _LOGGER.debug("Hub restore: stored snapshot unreadable", exc_info=True)
+            return False
+        if (
+            not isinstance(stored, dict)
+            or str(stored.get("device_id")) != self._device_id
+            or not isinstance(stored.get("snapshot"), dict)
+        ):
+            return False
+        self._publish(self._normalized(stored["snapshot"]), restored=True, save=False)
+        return True
+
+    async def async_close(self) -> None:
+        """Write a pending save now and stop saving: nothing may reach the
+        store once the entry is unloaded (or its storage removed)."""
+        store, self._store = self._store, None
+        if store is not None and self._save_pending:
+            self._save_pending = False
+            await store.async_save(self._stored_data())
+
+    def seed_from_devicestatus(self, js: Dict[str, Any]) -> HubSnapshot:
+        """Initialize snapshot and internal phase/pos from initial REST payload."""
+        return self._publish(self._normalized(js))
+
+    def merge_devicestatus(self, js: Dict[str, Any], requested_at: float) -> HubSnapshot:
+        """
+        Merge a REST /devicestatus record fetched at `requested_at` (monotonic).
+        Fields the WebSocket updated after that moment are newer than the
+        record and are kept.
+        """
+        newer = {field for field, at in self._ws_updated.items() if at >= requested_at}
+        kept = {field: self._read_field(field) for field in newer}
+        last_seen = self._snapshot.get("LastSeen")
+        data = self._normalized(js)
+        for field, value in kept.items():
+            self._write_field(data, field, value)
+        if kept and last_seen:
+            data["LastSeen"] = last_seen
+        return self._publish(data)
+
+    def apply_event(self, event: CameEvent) -> Optional[HubSnapshot]:
+        """
+        Apply any decoded realtime event into the snapshot.
+        Return updated snapshot or None if event not applicable (unknown type,
+        or addressed to another device).
+        """
+        if event.device_id is not None and str(event.device_id) != self._device_id:
+            return None
 
-    def apply_event(self, phase: Optional[int], percent: Optional[int]) -> Optional[Dict[str, Any]]:
+        at = event.received_at
+        if isinstance(event, StatusEvent):
+            return self.apply_status(event.phase, event.percent, received_at=at)
+        if isinstance(event, SnapshotEvent):
+            data = self._normalized(event.data)
+            for field in _FIELDS:
+                self._mark(field, at)
+        elif isinstance(event, ConnectivityEvent):
+            data = self._draft()
+            self._write_field(data, "online", event.online)
+            self._mark("online", at)
+        elif isinstance(event, ErrorEvent):
+            data = self._draft()
+            self._write_field(data, "error", event.code)
+            self._mark("error", at)
+        elif isinstance(event, ManeuverCountEvent):
+            data = self._draft()
+            self._write_field(data, "maneuver_count", event.count)
+            self._mark("maneuver_count", at)
+        else:
+            return None
+        self._touch(data)
+        # a single pushed field does not make restored data current
+        return self._publish(data, restored=self.restored and not isinstance(event, SnapshotEvent))
+
+    def apply_status(
+        self, phase: Optional[int], percent: Optional[int], received_at: Optional[float] = None
+    ) -> Optional[HubSnapshot]:
         """
         Apply a VarcoStatusUpdate (phase, percent) into the snapshot.
+        `received_at` is when its frame arrived (monotonic; default now).
         Return updated snapshot or None if event not applicable.
         """
         if phase is None or phase not in _VALID_PHASES:
@@ -65,22 +394,50 @@ class CameEventHub:
             elif phase == PHASE_CLOSED:
                 percent = 0
 
-        self._phase = int(phase)
-
+        pos = self._pos
         if percent is not None:
             try:
                 # clamp 0..100 just in case
-                self._pos = max(0, min(100, int(percent)))
+                pos = max(0, min(100, int(percent)))
             except Exception:
                 pass
 
+        data = self._draft()
+        self._write_field(data, "status", (int(phase), pos))
+        self._mark("status", received_at)
+        self._touch(data)
+        return self._publish(data, restored=self.restored)
 
-        self._ensure_shape()
-        self._snapshot["States"][2]["Data"] = [self._phase, (self._pos if self._pos is not None else 0)]
+    def _mark(self, field: str, received_at: Optional[float] = None) -> None:
+        # when the frame arrived, not when it was dispatched: a frame that
+        # waited in the queue during a REST fetch is older than its dispatch
+        self._ws_updated[field] = received_at if received_at is not None else time.monotonic()
 
+    def _read_field(self, field: str) -> Any:
+        if field == "status":
+            return (self._phase, self._pos)
+        if field == "online":
+            return self._snapshot.get("Online")
+        if field == "error":
+            return self._snapshot["States"][2].get("ErrorCode")
+        return self._snapshot.get("ManeuverCount")
+
+    def _write_field(self, data: Dict[str, Any], field: str, value: Any) -> None:
+        """Set `field` on a draft from _draft() or _normalized()."""
+        if field == "status":
+            self._phase, self._pos = value
+            data["States"][2]["Data"] = [self._phase, (self._pos if self._pos is not None else 0)]
+        elif field == "online":
+            data["Online"] = value
+        elif field == "error":
+            data["States"][2]["ErrorCode"] = value
+        else:
+            data["ManeuverCount"] = value
+
+    def _touch(self, data: Dict[str, Any]) -> None:
         try:
-            self._snapshot["LastSeen"] = dt_util.utcnow().isoformat()
+            now = dt_util.utcnow()
+            data["LastSeen"] = now.isoformat()
+            self._touched = (data["LastSeen"], now)
         except Exception:
             pass
-
-        return self._snapshot
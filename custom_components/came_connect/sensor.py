@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Optional
 
 from homeassistant.components.sensor import (
@@ -12,14 +12,17 @@ from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.const import PERCENTAGE
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.util import dt as dt_util
 
+from .api import CircuitBreaker
 from .const import (
+    CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN,
     DOMAIN,
+    FIELD_ERROR, FIELD_LAST_SEEN, FIELD_MANEUVER_COUNT, FIELD_PHASE, FIELD_POSITION,
     PHASE_OPEN, PHASE_CLOSED, PHASE_OPENING, PHASE_CLOSING, PHASE_STOPPED,
 )
+from .entity import CameGateEntity
 
 # Title-case labels for UI consistency
 _PHASE_LABEL = {
@@ -30,8 +33,11 @@ _PHASE_LABEL = {
     PHASE_STOPPED: "Stopped"
 }
 
+# raw_data attributes show both phase and position
+_GATE_FIELDS = frozenset((FIELD_PHASE, FIELD_POSITION))
 
-class _BaseSensor(CoordinatorEntity, SensorEntity):
+
+class _BaseSensor(CameGateEntity, SensorEntity):
     def __init__(self, coordinator, device_id: str, name: str, slug: str):
         super().__init__(coordinator)
         self._device_id = str(device_id)
@@ -45,52 +51,32 @@ class _BaseSensor(CoordinatorEntity, SensorEntity):
             configuration_url="https://app.cameconnect.net/",
         )
 
-    def _raw(self) -> list[int]:
-        data = self.coordinator.data or {}
-        states = data.get("States") or []
-        return (states[2].get("Data") or []) if len(states) >= 3 else []
-
-    def _phase(self) -> Optional[int]:
-        raw = self._raw()
-        if len(raw) >= 1:
-            try:
-                return int(raw[0])
-            except Exception:
-                pass
-        return None
-
-    def _pos(self) -> Optional[int]:
-        raw = self._raw()
-        if len(raw) >= 2:
-            try:
-                return int(raw[1])
-            except Exception:
-                pass
-        return None
-
 
 class CamePhaseSensor(_BaseSensor):
     """Human-friendly phase text."""
 
+    _hub_fields = _GATE_FIELDS
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(coordinator, device_id, "Gate Phase", "phase")
 
     @property
     def native_value(self) -> Optional[str]:
-        phase = self._phase()
-        return _PHASE_LABEL.get(phase, None)
+        return _PHASE_LABEL.get(self.gate.phase, None)
 
     @property
     def extra_state_attributes(self) -> dict:
         return {
-            "phase_code": self._phase(),
-            "raw_data": self._raw(),
+            "phase_code": self.gate.phase,
+            "raw_data": self.gate.raw,
         }
 
 
 class CamePositionSensor(_BaseSensor):
     """Position % as a sensor."""
 
+    _hub_fields = _GATE_FIELDS
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(coordinator, device_id, "Gate Position", "position")
         self._attr_native_unit_of_measurement = PERCENTAGE
@@ -98,57 +84,104 @@ class CamePositionSensor(_BaseSensor):
 
     @property
     def native_value(self) -> Optional[int]:
-        return self._pos()
+        return self.gate.position
 
     @property
     def extra_state_attributes(self) -> dict:
-        return {"raw_data": self._raw()}
+        return {"raw_data": self.gate.raw}
 
 
 class CameLastSeenSensor(_BaseSensor):
     """Hub last seen timestamp."""
 
+    _hub_fields = frozenset((FIELD_LAST_SEEN,))
+
     def __init__(self, coordinator, device_id: str):
         super().__init__(coordinator, device_id, "Gate Hub Last Seen", "last_seen")
         self._attr_device_class = SensorDeviceClass.TIMESTAMP
 
     @property
     def native_value(self) -> Optional[datetime]:
-        val = (self.coordinator.data or {}).get("LastSeen")
-        if not val:
-            return None
-        try:
-            dt = dt_util.parse_datetime(val)
-            if dt and dt.tzinfo is None:
-                dt = dt_util.as_utc(dt)
-            return dt
-        except Exception:
-            return None
+        return self.gate.last_seen
+
+
+class CameManeuverCountSensor(_BaseSensor):
+    """Total manoeuvres reported by the operator (pushed as EventId 23)."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _hub_fields = frozenset((FIELD_MANEUVER_COUNT,))
+
+    def __init__(self, coordinator, device_id: str):
+        super().__init__(coordinator, device_id, "Gate Maneuver Count", "maneuver_count")
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self) -> Optional[int]:
+        return self.gate.maneuver_count
 
 
 class CameErrorSensor(_BaseSensor):
     """Last non-zero error/response code across state slots."""
 
     _attr_entity_category = EntityCategory.DIAGNOSTIC
+    # written when the error codes change, not on every movement, so the
+    # `states` attribute leaves out the gate's Data (phase, position)
+    _hub_fields = frozenset((FIELD_ERROR,))
 
     def __init__(self, coordinator, device_id: str):
         super().__init__(coordinator, device_id, "Gate Error", "error")
 
     @property
     def native_value(self) -> Optional[int]:
-        data = self.coordinator.data or {}
-        states = data.get("States") or []
-        last_nonzero: Optional[int] = None
-        for s in states:
-            for key in ("ErrorCode", "ResponseCode"):
-                val = s.get(key)
-                if isinstance(val, int) and val != 0:
-                    last_nonzero = val
-        return last_nonzero
+        return self.gate.error
 
     @property
     def extra_state_attributes(self) -> dict:
-        return {"states": (self.coordinator.data or {}).get("States", [])}
+        states = (self.coordinator.data or {}).get("States") or ()
+        return {
+            "states": [
+                {key: value for key, value in slot.items() if key != "Data"} if isinstance(slot, dict) else slot
+                for slot in states
+            ]
+        }
+
+
+class CameCloudCircuitSensor(SensorEntity):
+    """State of the cloud API circuit breaker (closed / open / half_open)."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_HALF_OPEN]
+    _attr_should_poll = False
+
+    def __init__(self, breaker: CircuitBreaker, device_id: str):
+        self._breaker = breaker
+        self._retry_at: Optional[datetime] = None
+        self._attr_name = "Cloud Connection"
+        self._attr_unique_id = f"came_gate_cloud_circuit_{device_id}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, str(device_id))})
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(self._breaker.add_listener(self._async_circuit_changed))
+
+    @callback
+    def _async_circuit_changed(self) -> None:
+        retry_in = self._breaker.retry_in()
+        self._retry_at = dt_util.utcnow() + timedelta(seconds=retry_in) if retry_in > 0 else None
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> str:
+        return self._breaker.state
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        # only values fixed by the last state change; the live counters
+        # (failure rate, rejected calls) are in the diagnostics
+        return {
+            "times_opened": self._breaker.times_opened,
+            "retry_at": self._retry_at.isoformat() if self._retry_at else None,
+        }
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
@@ -160,6 +193,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
             CamePhaseSensor(coordinator, device_id),
             CamePositionSensor(coordinator, device_id),
             CameLastSeenSensor(coordinator, device_id),
+            CameManeuverCountSensor(coordinator, device_id),
             CameErrorSensor(coordinator, device_id),
+            CameCloudCircuitSensor(data["client"].circuit_breaker, device_id),
         ]
     )
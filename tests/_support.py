@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
 import importlib.util
 from pathlib import Path
@@ -51,6 +52,37 @@ def install_homeassistant_stubs() -> None:
     button_mod.ButtonEntity = ButtonEntity
     sys.modules["homeassistant.components.button"] = button_mod
 
+    class _StubEnum:
+        def __init__(self, *names):
+            for name in names:
+                setattr(self, name, name.lower())
+
+    class _StateEntity:
+        @property
+        def name(self):
+            return getattr(self, "_attr_name", None)
+
+        def async_write_ha_state(self) -> None:
+            self._ha_state_written = True
+
+        def async_on_remove(self, func) -> None:
+            self._on_remove = getattr(self, "_on_remove", []) + [func]
+
+    sensor_mod = types.ModuleType("homeassistant.components.sensor")
+    sensor_mod.SensorEntity = type("SensorEntity", (_StateEntity,), {})
+    sensor_mod.SensorDeviceClass = _StubEnum("TIMESTAMP", "ENUM")
+    sensor_mod.SensorStateClass = _StubEnum("MEASUREMENT", "TOTAL_INCREASING")
+    sys.modules["homeassistant.components.sensor"] = sensor_mod
+
+    binary_sensor_mod = types.ModuleType("homeassistant.components.binary_sensor")
+    binary_sensor_mod.BinarySensorEntity = type("BinarySensorEntity", (_StateEntity,), {})
+    binary_sensor_mod.BinarySensorDeviceClass = _StubEnum("MOVING", "CONNECTIVITY")
+    sys.modules["homeassistant.components.binary_sensor"] = binary_sensor_mod
+
+    const_mod = types.ModuleType("homeassistant.const")
+    const_mod.PERCENTAGE = "%"
+    sys.modules["homeassistant.const"] = const_mod
+
     config_entries_mod = types.ModuleType("homeassistant.config_entries")
 
     class ConfigEntry:
@@ -58,6 +90,19 @@ def install_homeassistant_stubs() -> None:
             self.data = data or {}
             self.options = options or {}
             self.entry_id = entry_id
+            self.background_tasks = []
+            self._on_unload = []
+
+        def async_on_unload(self, func) -> None:
+            self._on_unload.append(func)
+
+        def add_update_listener(self, listener):
+            return lambda: None
+
+        def async_create_background_task(self, hass, target, name):
+            task = asyncio.create_task(target, name=name)
+            self.background_tasks.append(task)
+            return task
 
     class ConfigFlow:
         def __init_subclass__(cls, **kwargs):
@@ -133,8 +178,46 @@ def install_homeassistant_stubs() -> None:
             self.__dict__.update(kwargs)
 
     entity_mod.DeviceInfo = DeviceInfo
+    entity_mod.EntityCategory = _StubEnum("DIAGNOSTIC", "CONFIG")
     sys.modules["homeassistant.helpers.entity"] = entity_mod
 
+    update_coordinator_mod = types.ModuleType("homeassistant.helpers.update_coordinator")
+
+    class UpdateFailed(Exception):
+        pass
+
+    class DataUpdateCoordinator:
+        def __init__(self, hass, logger, *, name, update_method=None, update_interval=None):
+            self.hass = hass
+            self.name = name
+            self.update_method = update_method
+            self.data = None
+            self._listeners = []
+
+        async def async_config_entry_first_refresh(self) -> None:
+            self.data = await self.update_method()
+
+        def async_add_listener(self, update_callback, context=None):
+            self._listeners.append(update_callback)
+            return lambda: self._listeners.remove(update_callback)
+
+        def async_set_updated_data(self, data) -> None:
+            self.data = data
+            for update_callback in list(self._listeners):
+                update_callback()
+
+    class CoordinatorEntity:
+        def __init__(self, coordinator, context=None):
+            self.coordinator = coordinator
+
+        def _handle_coordinator_update(self) -> None:
+            self.async_write_ha_state()
+
+    update_coordinator_mod.UpdateFailed = UpdateFailed
+    update_coordinator_mod.DataUpdateCoordinator = DataUpdateCoordinator
+    update_coordinator_mod.CoordinatorEntity = CoordinatorEntity
+    sys.modules["homeassistant.helpers.update_coordinator"] = update_coordinator_mod
+
     aiohttp_client_mod = types.ModuleType("homeassistant.helpers.aiohttp_client")
 
     def async_get_clientsession(hass):
@@ -143,6 +226,28 @@ def install_homeassistant_stubs() -> None:
     aiohttp_client_mod.async_get_clientsession = async_get_clientsession
     sys.modules["homeassistant.helpers.aiohttp_client"] = aiohttp_client_mod
 
+    storage_mod = types.ModuleType("homeassistant.helpers.storage")
+
+    class Store:
+        def __init__(self, hass, version, key):
+            self.key = key
+            self.data = None
+
+        async def async_load(self):
+            return self.data
+
+        def async_delay_save(self, data_func, delay=0):
+            self.data = data_func()
+
+        async def async_save(self, data):
+            self.data = data
+
+        async def async_remove(self):
+            self.data = None
+
+    storage_mod.Store = Store
+    sys.modules["homeassistant.helpers.storage"] = storage_mod
+
     selector_mod = types.ModuleType("homeassistant.helpers.selector")
 
     class TextSelectorType:
@@ -189,7 +294,18 @@ def install_homeassistant_stubs() -> None:
     def utcnow():
         return dt.datetime.now(dt.timezone.utc)
 
+    def parse_datetime(value):
+        try:
+            return dt.datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+
+    def as_utc(value):
+        return value.replace(tzinfo=dt.timezone.utc) if value.tzinfo is None else value.astimezone(dt.timezone.utc)
+
     dt_mod.utcnow = utcnow
+    dt_mod.parse_datetime = parse_datetime
+    dt_mod.as_utc = as_utc
     sys.modules["homeassistant.util.dt"] = dt_mod
 
 
@@ -235,3 +351,46 @@ def install_voluptuous_stub() -> None:
     voluptuous.Optional = Optional
     voluptuous.UNDEFINED = sentinel
     sys.modules["voluptuous"] = voluptuous
+
+
+class FakeResponse:
+    def __init__(self, status: int = 200, payload=None, headers=None):
+        self.status = status
+        self._payload = payload if payload is not None else {}
+        self.headers = headers or {}
+
+    async def json(self, content_type=None):
+        return self._payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """Replays queued responses per URL suffix and records every call."""
+
+    def __init__(self, routes: dict[str, list[FakeResponse]]):
+        self.routes = {suffix: list(responses) for suffix, responses in routes.items()}
+        self.calls: list[tuple[str, str, dict]] = []
+
+    def request(self, method: str, url: str, **kwargs):
+        # copy dict arguments; the client reuses its header dict across retries
+        self.calls.append((method, url, {key: dict(value) if isinstance(value, dict) else value for key, value in kwargs.items()}))
+        for suffix, responses in self.routes.items():
+            if url.endswith(suffix):
+                if not responses:
+                    raise AssertionError(f"No response queued for {method} {url}")
+                return responses.pop(0)
+        raise AssertionError(f"Unexpected request {method} {url}")
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def count(self, suffix: str) -> int:
+        return sum(1 for _, url, _ in self.calls if url.endswith(suffix))
@@ -0,0 +1,79 @@
+"""Micro-benchmark for the realtime frame decoder.
+
+    python tests/bench_ws_decoder.py [frames.txt]
+
+frames.txt holds one raw WebSocket frame per line (copy them from the
+`custom_components.came_connect.api.ws` debug log). Without it a synthetic
+mix is used: status updates, other decoded events and ids without a
+decoder.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+from _support import ROOT, ensure_custom_component_packages, load_module
+
+ensure_custom_component_packages()
+
+load_module(
+    "custom_components.came_connect.const",
+    ROOT / "custom_components" / "came_connect" / "const.py",
+)
+api_module = load_module(
+    "custom_components.came_connect.api",
+    ROOT / "custom_components" / "came_connect" / "api.py",
+)
+
+
+def _legacy_parse_frame(text: str):
+    """The decoder before the EventId fast path, kept for comparison."""
+    outer = json.loads(text)
+    data = outer.get("Data") or {}
+    event_id = data.get("EventId")
+    inner_raw = data.get("Data")
+    inner = json.loads(inner_raw) if isinstance(inner_raw, str) else (inner_raw or {})
+    payload = inner.get("Payload")
+    if event_id == 21 and isinstance(payload, list) and len(payload) >= 2:
+        return data.get("DeviceId"), int(payload[0]), int(payload[1])
+    return None, None, None
+
+
+def _synthetic_frames() -> list[str]:
+    frames = []
+    for i in range(1000):
+        event_id = (21, 21, 5, 6, 23, 40, 41, 42)[i % 8]
+        inner = {"Payload": [32, i % 100], "Timestamp": "2024-01-01T00:00:00Z", "Extra": list(range(8))}
+        frames.append(json.dumps({"Type": "Event", "Data": {"EventId": event_id, "DeviceId": 111111, "Data": json.dumps(inner)}}))
+    return frames
+
+
+def _rate(decode, frames, rounds: int = 50) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for frame in frames:
+            decode(frame)
+    return rounds * len(frames) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        frames = [line for line in Path(sys.argv[1]).read_text().splitlines() if line.strip()]
+    else:
+        frames = _synthetic_frames()
+    client = api_module.CameWebsocketClient(None, "wss://example.test/ws", None, None)
+    encoded = [frame.encode() for frame in frames]
+
+    before = _rate(_legacy_parse_frame, frames)
+    after = _rate(client._parse_frame, frames)
+    after_bytes = _rate(client._parse_frame, encoded)
+    print(f"frames: {len(frames)}  orjson: {'yes' if api_module._orjson else 'no'}")
+    print(f"before      {before:>12,.0f} frames/s")
+    print(f"after (str) {after:>12,.0f} frames/s  x{after / before:.1f}")
+    print(f"after (raw) {after_bytes:>12,.0f} frames/s  x{after_bytes / before:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Replay a WebSocket recording through the push pipeline, without a network.
+
+    python tests/replay_ws.py capture.jsonl [--device 123456] [--speed 0] [--timeline]
+
+The recording is what the "Record realtime frames to file" option writes:
+one JSON object per line, {"t": <monotonic>, "type": "text"|"binary",
+"data": ...}. Each frame goes through CameWebsocketClient._parse_frame,
+CameEventHub.apply_event, the coordinator and the gate entities. --speed 1
+keeps the recorded pacing, 10 plays ten times faster, 0 (default) runs
+flat out. The report has events per second, CPU time per stage and, with
+--timeline, every entity state change.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from _support import ROOT, ensure_custom_component_packages, install_homeassistant_stubs, load_module
+
+ensure_custom_component_packages()
+install_homeassistant_stubs()
+
+load_module(
+    "custom_components.came_connect.const",
+    ROOT / "custom_components" / "came_connect" / "const.py",
+)
+api_module = load_module(
+    "custom_components.came_connect.api",
+    ROOT / "custom_components" / "came_connect" / "api.py",
+)
+hub_module = load_module(
+    "custom_components.came_connect.hub",
+    ROOT / "custom_components" / "came_connect" / "hub.py",
+)
+sensor_module = load_module(
+    "custom_components.came_connect.sensor",
+    ROOT / "custom_components" / "came_connect" / "sensor.py",
+)
+binary_sensor_module = load_module(
+    "custom_components.came_connect.binary_sensor",
+    ROOT / "custom_components" / "came_connect" / "binary_sensor.py",
+)
+
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+STAGES = ("parse", "hub", "coordinator", "entities")
+
+
+@dataclass
+class ReplayReport:
+    frames: int = 0
+    events: int = 0
+    applied: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: dict[str, float] = field(default_factory=lambda: dict.fromkeys(STAGES, 0.0))
+    # (seconds from the first frame, entity name, new state)
+    timeline: list[tuple[float, str, Any]] = field(default_factory=list)
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.wall_seconds if self.wall_seconds else 0.0
+
+
+def load_recording(path: str | Path) -> list[tuple[float, str | bytes]]:
+    frames = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        data = base64.b64decode(entry["data"]) if entry.get("type") == "binary" else entry["data"]
+        frames.append((float(entry["t"]), data))
+    return frames
+
+
+def _first_device_id(frames: list[tuple[float, str | bytes]]) -> str:
+    for _t, data in frames:
+        found = api_module._WS_DEVICE_ID_RE.search(data if isinstance(data, str) else data.decode("utf-8", "replace"))
+        if found:
+            return found.group(1)
+    return "0"
+
+
+def _entities(coordinator, device_id: str) -> list:
+    # Last Seen is left out: it is wall-clock time, not recorded state
+    return [
+        sensor_module.CamePhaseSensor(coordinator, device_id),
+        sensor_module.CamePositionSensor(coordinator, device_id),
+        sensor_module.CameErrorSensor(coordinator, device_id),
+        sensor_module.CameManeuverCountSensor(coordinator, device_id),
+        binary_sensor_module.CameMovingBinarySensor(coordinator, device_id),
+        binary_sensor_module.CameHubOnlineBinarySensor(coordinator, device_id),
+    ]
+
+
+def _state(entity) -> Any:
+    return entity.is_on if hasattr(entity, "is_on") else entity.native_value
+
+
+async def replay(
+    frames: list[tuple[float, str | bytes]],
+    *,
+    device_id: str | None = None,
+    seed: dict | None = None,
+    speed: float = 0.0,
+) -> ReplayReport:
+    device_id = str(device_id or _first_device_id(frames))
+    client = api_module.CameWebsocketClient(None, "wss://replay.invalid/ws", None, None)
+    hub = hub_module.CameEventHub(device_id)
+    hub.seed_from_devicestatus(seed or {})
+    coordinator = DataUpdateCoordinator(None, logging.getLogger(__name__), name=f"replay-{device_id}")
+    coordinator.data = hub.snapshot
+    entities = _entities(coordinator, device_id)
+    last = {entity.name: _state(entity) for entity in entities}
+
+    report = ReplayReport()
+    cpu = report.cpu_seconds
+    started = time.perf_counter()
+    first_t = frames[0][0] if frames else 0.0
+    for t, data in frames:
+        offset = t - first_t
+        if speed > 0:
+            delay = offset / speed - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        report.frames += 1
+
+        mark = time.process_time()
+        event = client._parse_frame(data)
+        cpu["parse"] += time.process_time() - mark
+        if event is None:
+            continue
+        report.events += 1
+
+        mark = time.process_time()
+        snapshot = hub.apply_event(event)
+        cpu["hub"] += time.process_time() - mark
+        if snapshot is None:
+            continue
+        report.applied += 1
+
+        mark = time.process_time()
+        coordinator.async_set_updated_data(snapshot)
+        cpu["coordinator"] += time.process_time() - mark
+
+        mark = time.process_time()
+        for entity in entities:
+            state = _state(entity)
+            if state != last[entity.name]:
+                last[entity.name] = state
+                report.timeline.append((round(offset, 3), entity.name, state))
+        cpu["entities"] += time.process_time() - mark
+
+    report.wall_seconds = time.perf_counter() - started
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording")
+    parser.add_argument("--device", help="device id to follow (default: first DeviceId in the recording)")
+    parser.add_argument("--speed", type=float, default=0.0, help="0 = as fast as possible, 1 = real time")
+    parser.add_argument("--timeline", action="store_true", help="print every entity state change")
+    args = parser.parse_args()
+
+    report = asyncio.run(replay(load_recording(args.recording), device_id=args.device, speed=args.speed))
+    print(f"frames {report.frames}  events {report.events}  applied {report.applied}")
+    print(f"wall {report.wall_seconds:.3f}s  {report.events_per_second:,.0f} events/s")
+    for stage in STAGES:
+        print(f"  cpu {stage:<12}{report.cpu_seconds[stage] * 1000:>10.2f} ms")
+    if args.timeline:
+        for offset, name, state in report.timeline:
+            print(f"  +{offset:>9.3f}s  {name:<24} {state}")
+
+
+if __name__ == "__main__":
+    main()
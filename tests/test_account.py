@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+import unittest
+
+from _support import ROOT, ensure_custom_component_packages, install_homeassistant_stubs, load_module
+
+ensure_custom_component_packages()
+install_homeassistant_stubs()
+
+const_module = load_module(
+    "custom_components.came_connect.const",
+    ROOT / "custom_components" / "came_connect" / "const.py",
+)
+api_module = load_module(
+    "custom_components.came_connect.api",
+    ROOT / "custom_components" / "came_connect" / "api.py",
+)
+account_module = load_module(
+    "custom_components.came_connect.account",
+    ROOT / "custom_components" / "came_connect" / "account.py",
+)
+events_module = sys.modules["custom_components.came_connect.events"]
+
+from homeassistant.config_entries import ConfigEntry
+
+DOMAIN = const_module.DOMAIN
+DATA_ACCOUNTS = const_module.DATA_ACCOUNTS
+
+
+def _entry(entry_id: str, username: str = "user@example.test") -> ConfigEntry:
+    return ConfigEntry(
+        data={
+            const_module.CONF_CLIENT_ID: "client",
+            const_module.CONF_CLIENT_SECRET: "secret",
+            const_module.CONF_USERNAME: username,
+            const_module.CONF_PASSWORD: "pass",
+            const_module.CONF_DEVICE_ID: f"device-{entry_id}",
+        },
+        entry_id=entry_id,
+    )
+
+
+class AccountRegistryTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.hass = SimpleNamespace(data={})
+        self.ws_start = patch.object(api_module.CameWebsocketClient, "start", new=AsyncMock())
+        self.ws_stop = patch.object(api_module.CameWebsocketClient, "stop", new=AsyncMock())
+        self.ws_start.start()
+        self.ws_stop.start()
+
+    async def asyncTearDown(self) -> None:
+        patch.stopall()
+
+    async def _acquire(self, entry: ConfigEntry):
+        return await account_module.async_acquire_account(
+            self.hass,
+            entry,
+            redirect_uri="https://app.cameconnect.net/role",
+            ws_url="wss://example.test/ws",
+        )
+
+    async def test_entries_of_one_account_share_client_and_websocket(self) -> None:
+        first = await self._acquire(_entry("a"))
+        second = await self._acquire(_entry("b", username="USER@example.test"))
+        other = await self._acquire(_entry("c", username="other@example.test"))
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(first.entry_ids, {"a", "b"})
+
+        await first.async_add_handler("a", AsyncMock())
+        await second.async_add_handler("b", AsyncMock())
+        self.assertEqual(api_module.CameWebsocketClient.start.await_count, 1)
+
+        await other.client.async_close()
+
+    async def test_last_release_tears_account_down(self) -> None:
+        account = await self._acquire(_entry("a"))
+        await self._acquire(_entry("b"))
+        await account.async_add_handler("a", AsyncMock())
+
+        await account_module.async_release_account(self.hass, _entry("a"))
+        self.assertIn(account.key, self.hass.data[DOMAIN][DATA_ACCOUNTS])
+        api_module.CameWebsocketClient.stop.assert_not_awaited()
+
+        await account_module.async_release_account(self.hass, _entry("b"))
+        self.assertNotIn(DATA_ACCOUNTS, self.hass.data[DOMAIN])
+        api_module.CameWebsocketClient.stop.assert_awaited_once()
+        self.assertIsNone(account.client._refresh_task)
+
+    async def test_recording_follows_the_entries_of_a_live_account(self) -> None:
+        close = patch.object(api_module.FrameRecorder, "async_close", new=AsyncMock()).start()
+        account = await self._acquire(_entry("a"))
+        await account.async_add_handler("a", AsyncMock())
+        self.assertIsNone(account.ws_client._recorder)
+
+        await account_module.async_acquire_account(
+            self.hass, _entry("b"), redirect_uri="", ws_url="", record_path="/tmp/b.jsonl"
+        )
+        self.assertEqual(account.ws_client._recorder.path, "/tmp/b.jsonl")
+
+        await account_module.async_release_account(self.hass, _entry("b"))
+        self.assertIsNone(account.ws_client._recorder)
+        close.assert_awaited_once()
+        await account_module.async_release_account(self.hass, _entry("a"))
+
+    async def test_dispatch_fans_out_to_every_entry(self) -> None:
+        account = await self._acquire(_entry("a"))
+        handler_a, handler_b = AsyncMock(), AsyncMock()
+        await account.async_add_handler("a", handler_a)
+        await account.async_add_handler("b", handler_b)
+
+        event = events_module.StatusEvent(None, 16, 100)
+        await account._dispatch(event)
+
+        handler_a.assert_awaited_once_with(event)
+        handler_b.assert_awaited_once_with(event)
+        await account.async_close()
+
+    async def test_events_are_routed_by_device_id(self) -> None:
+        account = await self._acquire(_entry("a"))
+        handler_a, handler_b = AsyncMock(), AsyncMock()
+        await account.async_add_handler("a", handler_a, device_id="111")
+        await account.async_add_handler("b", handler_b, device_id="222")
+
+        event = events_module.StatusEvent(222, 16, 100)
+        await account._dispatch(event)
+        await account._dispatch(events_module.StatusEvent(333, 16, 100))
+
+        handler_a.assert_not_awaited()
+        handler_b.assert_awaited_once_with(event)
+        self.assertEqual(account.unrouted_events, 1)
+        self.assertTrue(account._wants_device("111"))
+        self.assertFalse(account._wants_device("333"))
+
+        account.remove_handler("b")
+        self.assertFalse(account._wants_device("222"))
+        await account.async_close()
+
+    async def test_reconnect_resyncs_every_device_in_one_request(self) -> None:
+        account = await self._acquire(_entry("a"))
+        resync_a, resync_b = MagicMock(), MagicMock()
+        await account.async_add_handler("a", AsyncMock(), device_id="111", on_resync=resync_a)
+        await account.async_add_handler("b", AsyncMock(), device_id="222", on_resync=resync_b)
+        records = {"111": {"DeviceId": 111}, "222": {"DeviceId": 222}}
+
+        with patch.object(account.client, "get_devices_status", new=AsyncMock(return_value=records)) as fetch:
+            await account._resync()
+
+        fetch.assert_awaited_once_with(["111", "222"], coalesce=False)
+        self.assertEqual(resync_a.call_args.args[0], records["111"])
+        self.assertEqual(resync_b.call_args.args[0], records["222"])
+        await account.async_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import time
+import unittest
+
+from _support import ROOT, FakeResponse, FakeSession, ensure_custom_component_packages, load_module
+
+ensure_custom_component_packages()
+
+load_module(
+    "custom_components.came_connect.const",
+    ROOT / "custom_components" / "came_connect" / "const.py",
+)
+api_module = load_module(
+    "custom_components.came_connect.api",
+    ROOT / "custom_components" / "came_connect" / "api.py",
+)
+
+DUMMY_DEVICE_ID = "424242"
+DUMMY_TOKEN = "dummy-access-token"
+DUMMY_NEW_TOKEN = "dummy-new-access-token"
+
+
+def _make_client(session, **kwargs):
+    return api_module.CameConnectClient(
+        session=session,
+        client_id="client",
+        client_secret="secret",
+        username="user",
+        password="pass",
+        redirect_uri="https://app.cameconnect.net/role",
+        **kwargs,
+    )
+
+
+def _login_routes(token: str = DUMMY_NEW_TOKEN) -> dict[str, list[FakeResponse]]:
+    return {
+        "/oauth/auth-code": [FakeResponse(200, {"code": "dummy-code"})],
+        "/oauth/token": [FakeResponse(200, {"access_token": token, "expires_in": 3600})],
+    }
+
+
+class TokenPersistenceTests(unittest.IsolatedAsyncioTestCase):
+    async def test_export_and_restore_round_trip_skips_login(self) -> None:
+        saved: list[dict] = []
+        session = FakeSession(_login_routes())
+        client = _make_client(session)
+        client._on_token_update = lambda: saved.append(client.export_token_state())
+
+        await client.ensure_token()
+        state = saved[-1]
+        self.assertEqual(state["access_token"], DUMMY_NEW_TOKEN)
+        self.assertGreater(state["expires_at"], time.time())
+        self.assertTrue(state["code_verifier"])
+
+        restored_session = FakeSession({})
+        restored = _make_client(restored_session)
+        self.assertTrue(restored.restore_token_state(state))
+        self.assertEqual(await restored.ensure_token(), DUMMY_NEW_TOKEN)
+        self.assertEqual(restored_session.calls, [])
+
+    async def test_restore_rejects_expired_or_malformed_state(self) -> None:
+        client = _make_client(None)
+        self.assertFalse(client.restore_token_state(None))
+        self.assertFalse(client.restore_token_state({"access_token": DUMMY_TOKEN}))
+        self.assertFalse(
+            client.restore_token_state({"access_token": DUMMY_TOKEN, "expires_at": time.time() - 5})
+        )
+        self.assertEqual(client.export_token_state(), {})
+
+    async def test_restored_token_falls_back_to_login_on_401(self) -> None:
+        routes = _login_routes()
+        routes["/devicestatus"] = [
+            FakeResponse(401, {"error": "unauthorized"}),
+            FakeResponse(200, {"Data": [{"Id": DUMMY_DEVICE_ID}]}),
+        ]
+        session = FakeSession(routes)
+        client = _make_client(session)
+        client.restore_token_state({"access_token": DUMMY_TOKEN, "expires_at": time.time() + 600})
+
+        result = await client.get_device_status(DUMMY_DEVICE_ID)
+
+        self.assertEqual(result["Id"], DUMMY_DEVICE_ID)
+        self.assertEqual(session.count("/oauth/auth-code"), 1)
+        auth_headers = [kw["headers"]["Authorization"] for _, url, kw in session.calls if url.endswith("/devicestatus")]
+        self.assertEqual(auth_headers, [f"Bearer {DUMMY_TOKEN}", f"Bearer {DUMMY_NEW_TOKEN}"])
+
+
+class RefreshTokenTests(unittest.IsolatedAsyncioTestCase):
+    async def test_expired_token_renews_with_single_refresh_grant(self) -> None:
+        session = FakeSession(
+            {
+                "/oauth/token": [
+                    FakeResponse(200, {"access_token": DUMMY_NEW_TOKEN, "expires_in": 3600}),
+                ],
+            }
+        )
+        client = _make_client(session)
+        self.assertTrue(
+            client.restore_token_state(
+                {"access_token": DUMMY_TOKEN, "expires_at": time.time() - 5, "refresh_token": "dummy-refresh"}
+            )
+        )
+
+        self.assertEqual(await client.ensure_token(), DUMMY_NEW_TOKEN)
+
+        self.assertEqual(session.count("/oauth/auth-code"), 0)
+        _, _, kwargs = session.calls[0]
+        self.assertEqual(kwargs["data"], {"grant_type": "refresh_token", "refresh_token": "dummy-refresh"})
+        # the old refresh token stays usable when the server does not rotate it
+        self.assertEqual(client.export_token_state()["refresh_token"], "dummy-refresh")
+        self.assertEqual((client.token_stats.renewals, client.token_stats.refresh_grants), (1, 1))
+
+    async def test_rejected_refresh_falls_back_to_password_flow(self) -> None:
+        session = FakeSession(
+            {
+                "/oauth/auth-code": [FakeResponse(200, {"code": "dummy-code"})],
+                "/oauth/token": [
+                    FakeResponse(400, {"error": "invalid_grant"}),
+                    FakeResponse(
+                        200,
+                        {"access_token": DUMMY_NEW_TOKEN, "expires_in": 3600, "refresh_token": "dummy-refresh-2"},
+                    ),
+                ],
+            }
+        )
+        client = _make_client(session)
+        client.restore_token_state({"refresh_token": "dummy-refresh"})
+
+        self.assertEqual(await client.ensure_token(), DUMMY_NEW_TOKEN)
+
+        self.assertEqual(session.count("/oauth/auth-code"), 1)
+        self.assertEqual(client.export_token_state()["refresh_token"], "dummy-refresh-2")
+
+
+def _jwt(exp: float) -> str:
+    def _segment(value: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+    return f"{_segment({'alg': 'none'})}.{_segment({'exp': exp})}.signature"
+
+
+class TokenLifecycleTests(unittest.IsolatedAsyncioTestCase):
+    async def test_missing_expires_in_uses_jwt_exp_claim(self) -> None:
+        token = _jwt(time.time() + 1800)
+        session = FakeSession(
+            {
+                "/oauth/auth-code": [FakeResponse(200, {"code": "dummy-code"})],
+                "/oauth/token": [FakeResponse(200, {"access_token": token})],
+            }
+        )
+        client = _make_client(session)
+
+        await client.ensure_token()
+
+        remaining = client.export_token_state()["expires_at"] - time.time()
+        self.assertGreater(remaining, 1700)
+        self.assertLess(remaining, 1800)
+
+    async def test_background_refresh_renews_before_foreground_needs_it(self) -> None:
+        session = FakeSession(
+            {
+                "/oauth/auth-code": [FakeResponse(200, {"code": "dummy-code"})],
+                "/oauth/token": [
+                    FakeResponse(200, {"access_token": DUMMY_TOKEN, "expires_in": 1, "refresh_token": "dummy-refresh"}),
+                    FakeResponse(200, {"access_token": DUMMY_NEW_TOKEN, "expires_in": 3600}),
+                ],
+            }
+        )
+        client = _make_client(session, refresh_fraction=0.2)
+        client.start_token_refresh()
+        try:
+            self.assertEqual(await client.ensure_token(), DUMMY_TOKEN)
+            await asyncio.sleep(0.4)
+
+            calls_before = len(session.calls)
+            self.assertEqual(await client.ensure_token(), DUMMY_NEW_TOKEN)
+            self.assertEqual(len(session.calls), calls_before)
+        finally:
+            await client.async_close()
+
+        stats = client.token_stats.as_dict()
+        self.assertEqual(stats["password_logins"], 1)
+        self.assertEqual(stats["refresh_grants"], 1)
+        self.assertEqual(stats["failures"], 0)
+        self.assertIsNotNone(stats["last_latency"])
+
+
+if __name__ == "__main__":
+    unittest.main()
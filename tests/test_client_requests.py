@@ -0,0 +1,457 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+import unittest
+
+from _support import ROOT, FakeResponse, FakeSession, ensure_custom_component_packages, load_module
+
+ensure_custom_component_packages()
+
+load_module(
+    "custom_components.came_connect.const",
+    ROOT / "custom_components" / "came_connect" / "const.py",
+)
+api_module = load_module(
+    "custom_components.came_connect.api",
+    ROOT / "custom_components" / "came_connect" / "api.py",
+)
+
+DUMMY_TOKEN = "dummy-access-token"
+DUMMY_DEVICE_ONE = "111111"
+DUMMY_DEVICE_TWO = "222222"
+DUMMY_DEVICE_MISSING = "999999"
+FAST_RETRY = api_module.RetryPolicy(base_delay=0.001, max_delay=0.001)
+
+
+def _make_client(session, **kwargs):
+    client = api_module.CameConnectClient(
+        session=session,
+        client_id="client",
+        client_secret="secret",
+        username="user",
+        password="pass",
+        redirect_uri="https://app.cameconnect.net/role",
+        **kwargs,
+    )
+    client.restore_token_state({"access_token": DUMMY_TOKEN, "expires_at": time.time() + 3600})
+    return client
+
+
+def _status(device_id: str, phase: int = 17) -> dict:
+    return {"DeviceId": int(device_id), "States": [{}, {}, {"Data": [phase, 0]}]}
+
+
+class DeviceStatusBatchTests(unittest.IsolatedAsyncioTestCase):
+    async def test_get_devices_status_returns_records_keyed_by_id(self) -> None:
+        session = FakeSession(
+            {"/devicestatus": [FakeResponse(200, {"Data": [_status(DUMMY_DEVICE_ONE), _status(DUMMY_DEVICE_TWO)]})]}
+        )
+        client = _make_client(session)
+
+        result = await client.get_devices_status([DUMMY_DEVICE_ONE, int(DUMMY_DEVICE_TWO), DUMMY_DEVICE_ONE])
+
+        self.assertEqual(set(result), {DUMMY_DEVICE_ONE, DUMMY_DEVICE_TWO})
+        _, _, kwargs = session.calls[0]
+        self.assertEqual(kwargs["params"], {"devices": f"[{DUMMY_DEVICE_ONE},{DUMMY_DEVICE_TWO}]"})
+
+    async def test_concurrent_single_device_calls_share_one_request(self) -> None:
+        session = FakeSession(
+            {"/devicestatus": [FakeResponse(200, {"Data": [_status(DUMMY_DEVICE_ONE), _status(DUMMY_DEVICE_TWO, 16)]})]}
+        )
+        client = _make_client(session)
+
+        one, two, again, missing = await asyncio.gather(
+            client.get_device_status(DUMMY_DEVICE_ONE),
+            client.get_device_status(DUMMY_DEVICE_TWO),
+            client.get_device_status(DUMMY_DEVICE_ONE),
+            client.get_device_status(DUMMY_DEVICE_MISSING),
+            return_exceptions=True,
+        )
+
+        self.assertEqual(session.count("/devicestatus"), 1)
+        self.assertEqual(one["DeviceId"], int(DUMMY_DEVICE_ONE))
+        self.assertIs(again, one)
+        self.assertEqual(two["States"][2]["Data"][0], 16)
+        self.assertIsInstance(missing, RuntimeError)
+
+    async def test_uncoalesced_fetch_does_not_join_an_earlier_request(self) -> None:
+        # e.g. the warm-start seed is in flight when the socket connects
+        release = asyncio.Event()
+
+        class _GatedResponse(FakeResponse):
+            async def __aenter__(self):
+                await release.wait()
+                return self
+
+        body = {"Data": [_status(DUMMY_DEVICE_ONE)]}
+        session = FakeSession({"/devicestatus": [_GatedResponse(200, body), FakeResponse(200, body)]})
+        client = _make_client(session)
+
+        seed = asyncio.create_task(client.get_devices_status([DUMMY_DEVICE_ONE]))
+        await asyncio.sleep(0)
+        resync = await client.get_devices_status([DUMMY_DEVICE_ONE], coalesce=False)
+        release.set()
+        await seed
+
+        self.assertIn(DUMMY_DEVICE_ONE, resync)
+        self.assertEqual(session.count("/devicestatus"), 2)
+        self.assertEqual((client.request_stats.issued, client.request_stats.coalesced), (2, 0))
+        self.assertEqual(client._inflight, {})
+
+    async def test_batch_failure_reaches_every_waiter(self) -> None:
+        session = FakeSession({"/devicestatus": [FakeResponse(500, {"error": "boom"})] * 3})
+        client = _make_client(session, retry_policy=FAST_RETRY)
+
+        results = await asyncio.gather(
+            client.get_device_status(DUMMY_DEVICE_ONE),
+            client.get_device_status(DUMMY_DEVICE_TWO),
+            return_exceptions=True,
+        )
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+
+    async def test_abandoned_waiter_failure_is_not_logged(self) -> None:
+        session = FakeSession({"/devicestatus": [FakeResponse(500, {"error": "boom"})] * 3})
+        client = _make_client(session, retry_policy=FAST_RETRY)
+        loop = asyncio.get_running_loop()
+        reported: list[dict] = []
+        loop.set_exception_handler(lambda _loop, context: reported.append(context))
+
+        caller = asyncio.create_task(client.get_device_status(DUMMY_DEVICE_ONE))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.sleep(0.2)  # the batch runs on and fails
+        self.assertFalse(client._status_tasks)
+        del caller
+        gc.collect()
+
+        self.assertEqual(reported, [])
+
+
+class SingleFlightTests(unittest.IsolatedAsyncioTestCase):
+    async def test_identical_concurrent_gets_share_one_request(self) -> None:
+        session = FakeSession(
+            {
+                "/sipaccounts": [FakeResponse(200, [{"DeviceToken": "dummy-token"}])],
+                "/evo/v1/sites": [
+                    FakeResponse(200, [{"Id": 1}]),
+                    FakeResponse(200, [{"Id": 2}]),
+                ],
+            }
+        )
+        client = _make_client(session)
+        url = f"{api_module.API_BASE}/evo/v1/sites"
+
+        results = await asyncio.gather(
+            client._request("GET", f"{api_module.API_BASE}/sipaccounts"),
+            client._request("GET", f"{api_module.API_BASE}/sipaccounts"),
+            client._request("GET", url, params={"dt": "dummy-token"}),
+            client._request("GET", url, params={"dt": "dummy-token"}),
+            client._request("GET", url, params={"dt": "other-token"}),
+        )
+
+        self.assertEqual(session.count("/sipaccounts"), 1)
+        self.assertEqual(session.count("/evo/v1/sites"), 2)
+        self.assertIs(results[0][1], results[1][1])
+        self.assertEqual(results[2], results[3])
+        self.assertEqual(client.request_stats.issued, 3)
+        self.assertEqual(client.request_stats.coalesced, 2)
+
+    async def test_sequential_gets_and_posts_are_not_coalesced(self) -> None:
+        session = FakeSession(
+            {
+                "/sipaccounts": [FakeResponse(200, []), FakeResponse(200, [])],
+                "/commands/2": [FakeResponse(200, {}), FakeResponse(200, {})],
+            }
+        )
+        client = _make_client(session)
+
+        await client._request("GET", f"{api_module.API_BASE}/sipaccounts")
+        await client._request("GET", f"{api_module.API_BASE}/sipaccounts")
+        await asyncio.gather(
+            client.send_command(DUMMY_DEVICE_ONE, 2),
+            client.send_command(DUMMY_DEVICE_ONE, 2),
+        )
+
+        self.assertEqual(session.count("/sipaccounts"), 2)
+        self.assertEqual(session.count("/commands/2"), 2)
+        self.assertEqual(client.request_stats.coalesced, 0)
+
+
+def _bpt_routes(devices: list[dict]) -> dict[str, list[FakeResponse]]:
+    return {
+        "/sipaccounts": [
+            FakeResponse(
+                200,
+                [
+                    {
+                        "DeviceToken": "dummy-device-token",
+                        "SipUserName": "dummy_sip_user",
+                        "BptL3Addr": "dummy-src",
+                        "Keycode": "EXAMPLEKEYCODE01",
+                    }
+                ],
+            )
+        ],
+        "/evo/v1/sites": [FakeResponse(200, [{"Id": 313131}])],
+        "/evo/v1/sites/313131/devices": [FakeResponse(200, devices)],
+    }
+
+
+class BptDiscoveryCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def test_discovery_endpoints_are_served_from_cache(self) -> None:
+        session = FakeSession(_bpt_routes([{"DeviceId": 424242}]))
+        client = _make_client(session)
+
+        for _ in range(3):
+            accounts = await client.async_get_sip_accounts()
+            sites = await client.async_get_sites(accounts[0].device_token)
+            await client.async_get_site_devices(sites[0]["Id"], accounts[0].device_token)
+
+        self.assertEqual(len(session.calls), 3)
+        self.assertEqual(client.request_stats.cache_hits, 6)
+
+    async def test_auth_error_invalidates_cache(self) -> None:
+        routes = _bpt_routes([])
+        routes["/sipaccounts"].append(FakeResponse(200, []))
+        session = FakeSession(routes)
+        client = _make_client(session)
+
+        await client.async_get_sip_accounts()
+        with patch.object(
+            client, "_send_bpt_xml_command", side_effect=api_module.CameAuthError("SIP REGISTER failed")
+        ), patch.object(client, "_async_bpt_xipregister", new=AsyncMock(return_value={})):
+            with self.assertRaises(api_module.CameAuthError):
+                await client.async_open_bpt_door(MagicMock())
+
+        with self.assertRaises(api_module.CameApiError):
+            await client.async_get_sip_accounts()
+        self.assertEqual(session.count("/sipaccounts"), 2)
+
+    async def test_device_not_found_is_cached_briefly(self) -> None:
+        session = FakeSession(_bpt_routes([{"DeviceId": 1}]))
+        client = _make_client(session)
+
+        errors = []
+        for _ in range(3):
+            with self.assertRaises(api_module.CameApiError) as ctx:
+                await client.async_resolve_bpt_target(424242, {})
+            self.assertIn("not found", str(ctx.exception))
+            errors.append(ctx.exception)
+
+        self.assertEqual(session.count("/devices"), 1)
+        # a fresh exception per hit, so tracebacks do not pile up on one object
+        self.assertIsNot(errors[1], errors[2])
+        self.assertIsNone(errors[2].__context__)
+        # only the discovery lookups of the first resolve count as misses
+        self.assertEqual(client.request_stats.cache_misses, 3)
+
+    def test_cache_evicts_least_recently_used_entry(self) -> None:
+        cache = api_module._TtlLruCache(2)
+        cache.set(("a",), 1, 60)
+        cache.set(("b",), 2, 60)
+        cache.get(("a",))
+        cache.set(("c",), 3, 60)
+
+        self.assertEqual(cache.get(("a",)), (True, 1))
+        self.assertEqual(cache.get(("b",)), (False, None))
+        cache.set(("d",), 4, 0)
+        self.assertEqual(cache.get(("d",)), (False, None))
+
+
+class RateLimitTests(unittest.IsolatedAsyncioTestCase):
+    async def test_429_raises_rate_limit_error_with_retry_after(self) -> None:
+        session = FakeSession(
+            {"/commands/2": [FakeResponse(429, {"error": "slow down"}, headers={"Retry-After": "7"})]}
+        )
+        client = _make_client(session)
+
+        with self.assertRaises(api_module.CameRateLimitError) as ctx:
+            await client.send_command(DUMMY_DEVICE_ONE, 2)
+
+        self.assertEqual(ctx.exception.retry_after, 7.0)
+        stats = client.rate_limiter.as_dict()
+        self.assertEqual(stats["rate_limited"], 1)
+        self.assertLess(stats["rate"], stats["max_rate"])
+
+    async def test_limiter_throttles_bursts_and_recovers(self) -> None:
+        limiter = api_module._AdaptiveRateLimiter(rate=50.0, burst=2, min_rate=1.0, recovery_step=10.0)
+
+        started = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+        elapsed = time.monotonic() - started
+
+        self.assertGreaterEqual(elapsed, 0.03)
+        self.assertEqual(limiter.throttled, 2)
+
+        limiter.on_rate_limited(None)
+        self.assertEqual(limiter.rate, 25.0)
+        for _ in range(3):
+            limiter.on_success()
+        self.assertEqual(limiter.rate, 50.0)
+
+    def test_parse_retry_after_accepts_seconds_and_http_dates(self) -> None:
+        self.assertEqual(api_module._parse_retry_after("3"), 3.0)
+        self.assertIsNone(api_module._parse_retry_after(None))
+        self.assertIsNone(api_module._parse_retry_after("soon"))
+        self.assertEqual(api_module._parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        for bogus in ("inf", "-inf", "nan", "1e400"):
+            self.assertIsNone(api_module._parse_retry_after(bogus))
+        self.assertEqual(api_module._parse_retry_after("86400"), api_module.RETRY_AFTER_MAX)
+
+
+class _HangingResponse(FakeResponse):
+    async def __aenter__(self):
+        await asyncio.sleep(10)
+
+
+class _FailingResponse(FakeResponse):
+    async def __aenter__(self):
+        raise api_module.aiohttp.ClientConnectionError("connection reset")
+
+
+class RetryPolicyTests(unittest.IsolatedAsyncioTestCase):
+    async def test_get_retries_5xx_and_connection_errors(self) -> None:
+        session = FakeSession(
+            {
+                "/devicestatus": [
+                    FakeResponse(502, {"error": "bad gateway"}),
+                    _FailingResponse(),
+                    FakeResponse(200, {"Data": [_status(DUMMY_DEVICE_ONE)]}),
+                ]
+            }
+        )
+        client = _make_client(session, retry_policy=FAST_RETRY)
+
+        result = await client.get_devices_status([DUMMY_DEVICE_ONE])
+
+        self.assertIn(DUMMY_DEVICE_ONE, result)
+        self.assertEqual(client.request_stats.retries, 2)
+
+    async def test_commands_are_not_retried(self) -> None:
+        session = FakeSession({"/commands/2": [FakeResponse(502, {"error": "bad gateway"})]})
+        client = _make_client(session, retry_policy=FAST_RETRY)
+
+        with self.assertRaises(RuntimeError):
+            await client.send_command(DUMMY_DEVICE_ONE, 2)
+
+        self.assertEqual(session.count("/commands/2"), 1)
+
+    async def test_deadline_caps_total_time(self) -> None:
+        session = FakeSession({"/sipaccounts": [_HangingResponse()]})
+        client = _make_client(session, retry_policy=api_module.RetryPolicy(attempts=1))
+
+        started = time.monotonic()
+        with self.assertRaises(api_module.CameApiError) as ctx:
+            await client._request("GET", f"{api_module.API_BASE}/sipaccounts", deadline=0.05)
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertIn("timed out", str(ctx.exception))
+
+    async def test_deadline_covers_a_slow_token_renewal(self) -> None:
+        session = FakeSession({"/sipaccounts": [FakeResponse(200, [])]})
+        client = _make_client(session)
+        client.invalidate_token()
+        renewed = asyncio.Event()
+
+        async def _slow_login() -> None:
+            await asyncio.sleep(0.2)
+            client.restore_token_state({"access_token": DUMMY_TOKEN, "expires_at": time.time() + 3600})
+            renewed.set()
+
+        started = time.monotonic()
+        with patch.object(client, "_renew_token", side_effect=_slow_login):
+            with self.assertRaises(api_module.CameApiError) as ctx:
+                await client._request("GET", f"{api_module.API_BASE}/sipaccounts", deadline=0.05)
+            self.assertLess(time.monotonic() - started, 0.15)
+            self.assertIn("waiting for a token", str(ctx.exception))
+            self.assertEqual(session.calls, [])
+            # the login itself carries on for the next caller
+            await asyncio.wait_for(renewed.wait(), timeout=1)
+        self.assertEqual(client.request_stats.deadline_exceeded, 1)
+
+    async def test_rate_limit_pause_past_the_deadline_fails_at_once(self) -> None:
+        session = FakeSession({"/commands/2": [FakeResponse(200, {})]})
+        client = _make_client(session)
+        client.rate_limiter.on_rate_limited(4)
+
+        started = time.monotonic()
+        with self.assertRaises(api_module.CameRateLimitError) as ctx:
+            await client._request("POST", f"{api_module.API_BASE}/devices/1/commands/2", deadline=0.5)
+
+        self.assertLess(time.monotonic() - started, 0.1)
+        self.assertGreater(ctx.exception.retry_after, 3)
+        self.assertEqual(session.calls, [])
+
+    def test_backoff_is_jittered_and_capped(self) -> None:
+        policy = api_module.RetryPolicy(base_delay=1.0, max_delay=3.0)
+        delays = [policy.backoff(attempt) for attempt in range(1, 8) for _ in range(20)]
+        self.assertTrue(all(0 <= delay <= 3.0 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+
+class CircuitBreakerTests(unittest.IsolatedAsyncioTestCase):
+    def test_opens_on_failure_rate_and_probes_once(self) -> None:
+        breaker = api_module.CircuitBreaker(window=10, min_calls=4, failure_threshold=0.5, open_seconds=0)
+        changes: list[str] = []
+        breaker.add_listener(lambda: changes.append(breaker.state))
+
+        breaker.record_success()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, api_module.CIRCUIT_CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, api_module.CIRCUIT_OPEN)
+
+        breaker.before_call()  # open period elapsed: this caller is the probe
+        self.assertEqual(breaker.state, api_module.CIRCUIT_HALF_OPEN)
+        with self.assertRaises(api_module.CameCircuitOpenError):
+            breaker.before_call()
+        breaker.record_success()
+
+        self.assertEqual(breaker.state, api_module.CIRCUIT_CLOSED)
+        self.assertEqual(changes, ["open", "half_open", "closed"])
+
+    def test_failed_probe_reopens(self) -> None:
+        breaker = api_module.CircuitBreaker(min_calls=1, open_seconds=0)
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, api_module.CIRCUIT_OPEN)
+        self.assertEqual(breaker.times_opened, 2)
+
+    async def test_open_circuit_fails_fast_without_touching_the_network(self) -> None:
+        session = FakeSession({"/devicestatus": [FakeResponse(503, {})] * 20})
+        client = _make_client(session, retry_policy=api_module.RetryPolicy(attempts=1))
+        client.circuit_breaker = api_module.CircuitBreaker(min_calls=3, open_seconds=60)
+
+        for _ in range(3):
+            with self.assertRaises(RuntimeError):
+                await client.get_devices_status([DUMMY_DEVICE_ONE])
+        calls = session.count("/devicestatus")
+
+        with self.assertRaises(api_module.CameCircuitOpenError):
+            await client.get_devices_status([DUMMY_DEVICE_ONE])
+
+        self.assertEqual(session.count("/devicestatus"), calls)
+        self.assertEqual(client.circuit_breaker.rejected, 1)
+
+    async def test_rate_limit_does_not_count_as_an_outage(self) -> None:
+        session = FakeSession({"/devicestatus": [FakeResponse(429, {})] * 5})
+        client = _make_client(session)
+        client.circuit_breaker = api_module.CircuitBreaker(min_calls=3)
+
+        for _ in range(5):
+            with self.assertRaises(api_module.CameRateLimitError):
+                await client.get_devices_status([DUMMY_DEVICE_ONE])
+
+        self.assertEqual(client.circuit_breaker.state, api_module.CIRCUIT_CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
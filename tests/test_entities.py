@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import sys
+import unittest
+
+from _support import ROOT, ensure_custom_component_packages, install_homeassistant_stubs, load_module
+
+ensure_custom_component_packages()
+install_homeassistant_stubs()
+
+load_module(
+    "custom_components.came_connect.const",
+    ROOT / "custom_components" / "came_connect" / "const.py",
+)
+hub_module = load_module(
+    "custom_components.came_connect.hub",
+    ROOT / "custom_components" / "came_connect" / "hub.py",
+)
+sensor_module = load_module(
+    "custom_components.came_connect.sensor",
+    ROOT / "custom_components" / "came_connect" / "sensor.py",
+)
+binary_sensor_module = load_module(
+    "custom_components.came_connect.binary_sensor",
+    ROOT / "custom_components" / "came_connect" / "binary_sensor.py",
+)
+events_module = sys.modules["custom_components.came_connect.events"]
+
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+DUMMY_DEVICE = "111111"
+
+
+class SelectiveDispatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.hub = hub_module.CameEventHub(DUMMY_DEVICE)
+        self.coordinator = DataUpdateCoordinator(None, None, name="test")
+        self.coordinator.data = self.hub.seed_from_devicestatus(
+            {"Online": True, "States": [{}, {}, {"Data": [17, 0]}]}
+        )
+        self.writes: list[str] = []
+        self.entities = [
+            sensor_module.CamePhaseSensor(self.coordinator, DUMMY_DEVICE),
+            sensor_module.CamePositionSensor(self.coordinator, DUMMY_DEVICE),
+            sensor_module.CameLastSeenSensor(self.coordinator, DUMMY_DEVICE),
+            sensor_module.CameManeuverCountSensor(self.coordinator, DUMMY_DEVICE),
+            sensor_module.CameErrorSensor(self.coordinator, DUMMY_DEVICE),
+            binary_sensor_module.CameMovingBinarySensor(self.coordinator, DUMMY_DEVICE),
+            binary_sensor_module.CameHubOnlineBinarySensor(self.coordinator, DUMMY_DEVICE),
+        ]
+        for entity in self.entities:
+            entity.async_write_ha_state = lambda name=entity.name: self.writes.append(name)
+            self.coordinator.async_add_listener(entity._handle_coordinator_update)
+        self._push(None)  # first update writes everything
+        self.writes.clear()
+
+    def _push(self, event) -> None:
+        snapshot = self.hub.apply_event(event) if event is not None else self.coordinator.data
+        self.coordinator.async_set_updated_data(snapshot)
+
+    def test_movement_only_wakes_gate_entities(self) -> None:
+        self._push(events_module.StatusEvent(DUMMY_DEVICE, 32, 40))
+
+        self.assertEqual(
+            sorted(self.writes),
+            ["Gate Hub Last Seen", "Gate Moving", "Gate Phase", "Gate Position"],
+        )
+
+    def test_error_states_attribute_does_not_go_stale_on_movement(self) -> None:
+        error_sensor = self.entities[4]
+        before = error_sensor.extra_state_attributes
+        self._push(events_module.StatusEvent(DUMMY_DEVICE, 32, 40))
+
+        self.assertNotIn("Gate Error", self.writes)
+        self.assertEqual(error_sensor.extra_state_attributes, before)
+        self.assertNotIn("Data", before["states"][2])
+
+    def test_connectivity_wakes_online_and_last_seen(self) -> None:
+        self._push(events_module.ConnectivityEvent(DUMMY_DEVICE, False))
+
+        self.assertEqual(sorted(self.writes), ["Gate Hub Last Seen", "Gate Hub Online"])
+
+    def test_restored_snapshot_is_an_assumed_state(self) -> None:
+        self.assertFalse(self.entities[0].assumed_state)
+        current = self.coordinator.data
+        self.coordinator.async_set_updated_data(
+            hub_module.HubSnapshot(current, current.version + 1, restored=True)
+        )
+
+        self.assertTrue(all(entity.assumed_state for entity in self.entities))
+        self.assertEqual(len(self.writes), len(self.entities))
+
+    def test_repeated_snapshot_writes_every_entity(self) -> None:
+        # e.g. the coordinator re-notifying after an availability change
+        self._push(None)
+
+        self.assertEqual(len(self.writes), len(self.entities))
+
+
+class CircuitSensorTests(unittest.TestCase):
+    def test_attributes_only_change_with_the_state(self) -> None:
+        api_module = sys.modules["custom_components.came_connect.api"]
+        breaker = api_module.CircuitBreaker(min_calls=1, open_seconds=60)
+        sensor = sensor_module.CameCloudCircuitSensor(breaker, DUMMY_DEVICE)
+        writes: list[dict] = []
+        sensor.async_write_ha_state = lambda: writes.append(sensor.extra_state_attributes)
+        breaker.add_listener(sensor._async_circuit_changed)
+
+        breaker.record_failure()
+        self.assertEqual(sensor.native_value, api_module.CIRCUIT_OPEN)
+        opened = sensor.extra_state_attributes
+        self.assertEqual(opened["times_opened"], 1)
+        self.assertIsNotNone(opened["retry_at"])
+
+        with self.assertRaises(api_module.CameCircuitOpenError):
+            breaker.before_call()  # rejected calls are not a state change
+        self.assertEqual(sensor.extra_state_attributes, opened)
+        self.assertEqual(writes, [opened])
+
+
+if __name__ == "__main__":
+    unittest.main()
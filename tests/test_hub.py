@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import copy
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+from _support import ROOT, ensure_custom_component_packages, install_homeassistant_stubs, load_module
+
+ensure_custom_component_packages()
+install_homeassistant_stubs()
+
+load_module(
+    "custom_components.came_connect.const",
+    ROOT / "custom_components" / "came_connect" / "const.py",
+)
+hub_module = load_module(
+    "custom_components.came_connect.hub",
+    ROOT / "custom_components" / "came_connect" / "hub.py",
+)
+events_module = sys.modules["custom_components.came_connect.events"]
+
+from homeassistant.helpers.storage import Store
+
+DUMMY_DEVICE = "111111"
+OTHER_DEVICE = "222222"
+
+
+def _seeded_hub() -> hub_module.CameEventHub:
+    hub = hub_module.CameEventHub(DUMMY_DEVICE)
+    hub.seed_from_devicestatus({"Online": True, "States": [{}, {}, {"Data": [17, 0]}]})
+    return hub
+
+
+class EventHubTests(unittest.TestCase):
+    def test_status_event_updates_phase_and_position(self) -> None:
+        hub = _seeded_hub()
+        snapshot = hub.apply_event(events_module.StatusEvent(int(DUMMY_DEVICE), 32, 40))
+        self.assertEqual(snapshot["States"][2]["Data"], (32, 40))
+        self.assertIn("LastSeen", snapshot)
+
+    def test_connectivity_error_and_counter_events(self) -> None:
+        hub = _seeded_hub()
+        hub.apply_event(events_module.ConnectivityEvent(DUMMY_DEVICE, False))
+        hub.apply_event(events_module.ErrorEvent(DUMMY_DEVICE, 7))
+        snapshot = hub.apply_event(events_module.ManeuverCountEvent(DUMMY_DEVICE, 1234))
+
+        self.assertIs(snapshot["Online"], False)
+        self.assertEqual(snapshot["States"][2]["ErrorCode"], 7)
+        self.assertEqual(snapshot["ManeuverCount"], 1234)
+        self.assertEqual(snapshot["States"][2]["Data"], (17, 0))
+
+    def test_snapshot_event_replaces_state(self) -> None:
+        hub = _seeded_hub()
+        snapshot = hub.apply_event(
+            events_module.SnapshotEvent(DUMMY_DEVICE, {"Online": False, "States": [{}, {}, {"Data": [16, 100]}]})
+        )
+        self.assertIs(snapshot["Online"], False)
+        self.assertEqual(snapshot["States"][2]["Data"], (16, 100))
+
+    def test_events_for_other_devices_are_ignored(self) -> None:
+        hub = _seeded_hub()
+        self.assertIsNone(hub.apply_event(events_module.StatusEvent(OTHER_DEVICE, 16, 100)))
+        self.assertIsNone(hub.apply_event(events_module.StatusEvent(DUMMY_DEVICE, 99, 0)))
+
+
+class SnapshotTests(unittest.TestCase):
+    def test_snapshots_are_read_only(self) -> None:
+        snapshot = _seeded_hub().snapshot
+        with self.assertRaises(TypeError):
+            snapshot["Online"] = False
+        with self.assertRaises(TypeError):
+            snapshot["States"][2]["Data"] = (16, 100)
+        with self.assertRaises(TypeError):
+            snapshot["States"][2].update(ErrorCode=1)
+
+    def test_each_publish_is_a_new_version_sharing_untouched_parts(self) -> None:
+        hub = _seeded_hub()
+        before = hub.snapshot
+
+        after = hub.apply_event(events_module.StatusEvent(DUMMY_DEVICE, 32, 40))
+
+        self.assertGreater(after.version, before.version)
+        self.assertEqual(after.version, hub.version)
+        self.assertEqual(before["States"][2]["Data"], (17, 0))  # old snapshot unchanged
+        self.assertIs(after["States"][0], before["States"][0])
+        self.assertIsNot(after["States"][2], before["States"][2])
+        self.assertIsNone(hub.apply_event(events_module.StatusEvent(OTHER_DEVICE, 16, 100)))
+        self.assertIs(hub.snapshot, after)
+
+    def test_untouched_tuples_are_not_rebuilt(self) -> None:
+        hub = hub_module.CameEventHub(DUMMY_DEVICE)
+        before = hub.seed_from_devicestatus(
+            {"Extra": [{"Code": 1}, [2, 3]], "States": [{"Data": [1]}, {}, {"Data": [17, 0]}]}
+        )
+
+        after = hub.apply_event(events_module.ErrorEvent(DUMMY_DEVICE, 7))
+
+        self.assertIs(after["Extra"], before["Extra"])
+        self.assertIs(after["States"][0], before["States"][0])
+        self.assertIs(after["States"][2]["Data"], before["States"][2]["Data"])
+
+    def test_changed_lists_the_fields_that_differ(self) -> None:
+        self.assertEqual(hub_module.CameEventHub(DUMMY_DEVICE).snapshot.changed, hub_module.ALL_FIELDS)
+        hub = _seeded_hub()
+
+        moved = hub.apply_event(events_module.StatusEvent(DUMMY_DEVICE, 17, 0))
+        self.assertEqual(moved.changed, {"last_seen"})  # same phase and position
+        moved = hub.apply_event(events_module.StatusEvent(DUMMY_DEVICE, 32, 40))
+        self.assertEqual(moved.changed, {"phase", "position", "last_seen"})
+        errored = hub.apply_event(events_module.ErrorEvent(DUMMY_DEVICE, 7))
+        self.assertEqual(errored.changed, {"error", "last_seen"})
+
+    def test_pushed_zero_clears_the_gate_error_only(self) -> None:
+        hub = hub_module.CameEventHub(DUMMY_DEVICE)
+        hub.seed_from_devicestatus({"States": [{}, {}, {"Data": [17, 0], "ErrorCode": 3}]})
+        self.assertEqual(hub.snapshot.gate.error, 3)
+        self.assertIsNone(hub.apply_event(events_module.ErrorEvent(DUMMY_DEVICE, 0)).gate.error)
+
+        hub.seed_from_devicestatus({"States": [{"ResponseCode": 4}, {}, {"Data": [17, 0], "ErrorCode": 3}]})
+        self.assertEqual(hub.apply_event(events_module.ErrorEvent(DUMMY_DEVICE, 0)).gate.error, 4)
+
+    def test_copies_are_the_snapshot_itself(self) -> None:
+        snapshot = _seeded_hub().snapshot
+        self.assertIs(copy.copy(snapshot), snapshot)
+        self.assertIs(copy.deepcopy(snapshot), snapshot)
+        self.assertEqual(dict(snapshot), snapshot)
+
+
+class GateStateTests(unittest.TestCase):
+    def test_gate_state_is_typed_and_precomputed(self) -> None:
+        hub = hub_module.CameEventHub(DUMMY_DEVICE)
+        hub.seed_from_devicestatus(
+            {
+                "Online": 1,
+                "ManeuverCount": 12,
+                "States": [{"ResponseCode": 4}, {}, {"Data": ["32", "40"], "ErrorCode": 0}],
+            }
+        )
+
+        gate = hub.snapshot.gate
+        self.assertEqual((gate.phase, gate.position, gate.online), (32, 40, True))
+        self.assertEqual((gate.error, gate.maneuver_count, gate.raw), (4, 12, (32, 40)))
+        self.assertIsNone(gate.last_seen)
+        with self.assertRaises(AttributeError):
+            gate.extra = 1  # __slots__
+
+    def test_last_seen_is_never_reparsed(self) -> None:
+        hub = _seeded_hub()
+        with patch.object(hub_module.dt_util, "parse_datetime", side_effect=AssertionError("parsed")):
+            touched = hub.apply_event(events_module.StatusEvent(DUMMY_DEVICE, 32, 40))
+            merged = hub.merge_devicestatus(
+                {"States": [{}, {}, {"Data": [16, 100]}]}, time.monotonic() - 1
+            )
+
+        self.assertEqual(touched.gate.last_seen.isoformat(), touched["LastSeen"])
+        self.assertIs(merged.gate.last_seen, touched.gate.last_seen)
+
+    def test_snapshot_from_a_plain_record_gets_a_gate_state(self) -> None:
+        snapshot = hub_module.HubSnapshot(
+            {"LastSeen": "2024-01-01T00:00:00", "States": [{}, {}, {"Data": [17, 0]}]}, 1
+        )
+        self.assertEqual(snapshot.gate.phase, 17)
+        self.assertIsNotNone(snapshot.gate.last_seen.tzinfo)
+
+
+class PersistenceTests(unittest.IsolatedAsyncioTestCase):
+    async def test_changes_are_saved_and_restored_on_the_next_start(self) -> None:
+        store = Store(None, 1, "snapshot")
+        hub = hub_module.CameEventHub(DUMMY_DEVICE, store=store)
+        self.assertIsNone(store.data)  # defaults are not worth saving
+        hub.seed_from_devicestatus({"Online": True, "States": [{}, {}, {"Data": [17, 0]}]})
+        hub.apply_event(events_module.StatusEvent(DUMMY_DEVICE, 16, 100))
+        saved = store.data
+
+        restarted = hub_module.CameEventHub(DUMMY_DEVICE, store=store)
+        self.assertTrue(await restarted.async_restore())
+
+        snapshot = restarted.snapshot
+        self.assertTrue(snapshot.restored)
+        self.assertEqual(snapshot.changed, hub_module.ALL_FIELDS)
+        self.assertEqual((snapshot.gate.phase, snapshot.gate.position, snapshot.gate.online), (16, 100, True))
+        self.assertIs(store.data, saved)  # restoring does not write back
+
+    async def test_restored_flag_holds_until_a_rest_record_arrives(self) -> None:
+        store = Store(None, 1, "snapshot")
+        store.data = {"device_id": DUMMY_DEVICE, "snapshot": {"States": [{}, {}, {"Data": [16, 100]}]}}
+        hub = hub_module.CameEventHub(DUMMY_DEVICE, store=store)
+        await hub.async_restore()
+
+        self.assertTrue(hub.apply_event(events_module.StatusEvent(DUMMY_DEVICE, 33, 60)).restored)
+        merged = hub.merge_devicestatus({"States": [{}, {}, {"Data": [17, 0]}]}, time.monotonic() + 1)
+        self.assertFalse(merged.restored)
+        self.assertEqual(merged.changed, hub_module.ALL_FIELDS)  # entities drop assumed_state
+
+    async def test_updates_on_a_restored_snapshot_are_saved(self) -> None:
+        store = Store(None, 1, "snapshot")
+        store.data = {"device_id": DUMMY_DEVICE, "snapshot": {"States": [{}, {}, {"Data": [16, 100]}]}}
+        hub = hub_module.CameEventHub(DUMMY_DEVICE, store=store)
+        await hub.async_restore()
+
+        hub.apply_event(events_module.StatusEvent(DUMMY_DEVICE, 33, 60))
+
+        self.assertEqual(store.data["snapshot"]["States"][2]["Data"], (33, 60))
+
+    async def test_close_flushes_the_pending_save_and_stops_saving(self) -> None:
+        store = Store(None, 1, "snapshot")
+        hub = hub_module.CameEventHub(DUMMY_DEVICE, store=store)
+        hub.seed_from_devicestatus({"States": [{}, {}, {"Data": [17, 0]}]})
+
+        with patch.object(store, "async_delay_save") as delay_save, patch.object(
+            store, "async_save", wraps=store.async_save
+        ) as save:
+            hub.apply_event(events_module.StatusEvent(DUMMY_DEVICE, 32, 40))
+            await hub.async_close()
+            save.assert_awaited_once()
+            self.assertEqual(store.data["snapshot"]["States"][2]["Data"], (32, 40))
+
+            await store.async_remove()
+            hub.apply_event(events_module.StatusEvent(DUMMY_DEVICE, 16, 100))
+            await hub.async_close()
+
+        delay_save.assert_called_once()
+        save.assert_awaited_once()
+        self.assertIsNone(store.data)  # nothing written after removal
+
+    async def test_snapshot_of_another_device_is_not_restored(self) -> None:
+        store = Store(None, 1, "snapshot")
+        store.data = {"device_id": OTHER_DEVICE, "snapshot": {"States": [{}, {}, {"Data": [16, 100]}]}}
+        hub = hub_module.CameEventHub(DUMMY_DEVICE, store=store)
+
+        self.assertFalse(await hub.async_restore())
+        self.assertFalse(await hub_module.CameEventHub(DUMMY_DEVICE).async_restore())
+        self.assertFalse(hub.restored)
+
+
+class ResyncMergeTests(unittest.TestCase):
+    def test_rest_record_fills_fields_without_newer_ws_data(self) -> None:
+        hub = _seeded_hub()
+        requested_at = time.monotonic() - 1
+        hub.apply_event(events_module.StatusEvent(DUMMY_DEVICE, 32, 40))
+
+        snapshot = hub.merge_devicestatus(
+            {"Online": False, "States": [{}, {}, {"Data": [17, 0], "ErrorCode": 3}]},
+            requested_at,
+        )
+
+        self.assertEqual(snapshot["States"][2]["Data"], (32, 40))  # WS is newer
+        self.assertIs(snapshot["Online"], False)
+        self.assertEqual(snapshot["States"][2]["ErrorCode"], 3)
+
+    def test_rest_record_wins_over_older_ws_data(self) -> None:
+        hub = _seeded_hub()
+        hub.apply_event(events_module.StatusEvent(DUMMY_DEVICE, 32, 40))
+        requested_at = time.monotonic() + 1
+
+        snapshot = hub.merge_devicestatus({"States": [{}, {}, {"Data": [16, 100]}]}, requested_at)
+
+        self.assertEqual(snapshot["States"][2]["Data"], (16, 100))
+
+    def test_queued_frame_counts_from_its_receive_time(self) -> None:
+        hub = _seeded_hub()
+        event = events_module.StatusEvent(DUMMY_DEVICE, 32, 40)
+        event.received_at = time.monotonic()
+        requested_at = event.received_at + 1  # fetched while the frame waited
+        hub.apply_event(event)
+
+        snapshot = hub.merge_devicestatus({"States": [{}, {}, {"Data": [16, 100]}]}, requested_at)
+
+        self.assertEqual(snapshot["States"][2]["Data"], (16, 100))
+
+
+if __name__ == "__main__":
+    unittest.main()
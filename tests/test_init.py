@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+import unittest
+
+from _support import ROOT, ensure_custom_component_packages, install_homeassistant_stubs, load_module
+
+ensure_custom_component_packages()
+install_homeassistant_stubs()
+
+const_module = load_module(
+    "custom_components.came_connect.const",
+    ROOT / "custom_components" / "came_connect" / "const.py",
+)
+account_module = load_module(
+    "custom_components.came_connect.account",
+    ROOT / "custom_components" / "came_connect" / "account.py",
+)
+hub_module = load_module(
+    "custom_components.came_connect.hub",
+    ROOT / "custom_components" / "came_connect" / "hub.py",
+)
+init_module = load_module(
+    "custom_components.came_connect",
+    ROOT / "custom_components" / "came_connect" / "__init__.py",
+)
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.storage import Store
+
+DOMAIN = const_module.DOMAIN
+
+DUMMY_DEVICE = "111111"
+DUMMY_ENTRY_ID = "entry-1"
+ENTRY_DATA = {
+    const_module.CONF_CLIENT_ID: "dummy-client-id",
+    const_module.CONF_CLIENT_SECRET: "dummy-client-secret",
+    const_module.CONF_USERNAME: "user@example.com",
+    const_module.CONF_PASSWORD: "dummy-password",
+    const_module.CONF_DEVICE_ID: DUMMY_DEVICE,
+}
+SNAPSHOT_KEY = const_module.STORAGE_KEY_SNAPSHOT.format(entry_id=DUMMY_ENTRY_ID)
+RESTORED = {"device_id": DUMMY_DEVICE, "snapshot": {"Online": True, "States": [{}, {}, {"Data": [16, 100]}]}}
+RECORD = {"Online": True, "States": [{}, {}, {"Data": [17, 0]}]}
+
+
+def _disk_store(files: dict):
+    """Store stub whose instances share `files`, like .storage on disk."""
+
+    class DiskStore(Store):
+        def __init__(self, hass, version, key):
+            super().__init__(hass, version, key)
+            self.data = files.get(key)
+
+        def async_delay_save(self, data_func, delay=0):
+            files[self.key] = data_func()
+
+        async def async_save(self, data):
+            files[self.key] = data
+
+        async def async_remove(self):
+            files.pop(self.key, None)
+
+    return DiskStore
+
+
+class SetupEntryTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.files: dict = {}
+        self.client = SimpleNamespace(get_device_status=AsyncMock(return_value=RECORD))
+        self.account = SimpleNamespace(client=self.client, async_add_handler=AsyncMock())
+        self.hass = SimpleNamespace(
+            data={},
+            config=SimpleNamespace(path=lambda *parts: "/config/" + "/".join(parts)),
+            config_entries=SimpleNamespace(
+                async_update_entry=lambda entry, **kwargs: None,
+                async_forward_entry_setups=AsyncMock(),
+                async_unload_platforms=AsyncMock(return_value=True),
+                async_entries=lambda domain: [],
+            ),
+        )
+        self.entry = ConfigEntry(data=dict(ENTRY_DATA), entry_id=DUMMY_ENTRY_ID)
+
+        DiskStore = _disk_store(self.files)
+        for target in (
+            patch.object(init_module, "Store", DiskStore),
+            patch.object(account_module, "Store", DiskStore),
+            patch.object(init_module, "SNAPSHOT_SEED_RETRY", 0.01),
+            patch.object(init_module, "async_acquire_account", AsyncMock(return_value=self.account)),
+            patch.object(init_module, "async_release_account", AsyncMock()),
+        ):
+            target.start()
+            self.addCleanup(target.stop)
+
+    async def asyncTearDown(self) -> None:
+        for task in self.entry.background_tasks:
+            task.cancel()
+        await asyncio.gather(*self.entry.background_tasks, return_exceptions=True)
+
+    def _coordinator(self):
+        return self.hass.data[DOMAIN][DUMMY_ENTRY_ID]["coordinator"]
+
+    def _seed_task(self) -> asyncio.Task:
+        (task,) = self.entry.background_tasks
+        return task
+
+    async def test_cold_start_seeds_from_rest_before_platforms(self) -> None:
+        self.assertTrue(await init_module.async_setup_entry(self.hass, self.entry))
+
+        snapshot = self._coordinator().data
+        self.assertFalse(snapshot.restored)
+        self.assertEqual(snapshot.gate.phase, 17)
+        self.client.get_device_status.assert_awaited_once_with(DUMMY_DEVICE)
+        self.assertEqual(self.entry.background_tasks, [])
+
+    async def test_warm_start_publishes_the_snapshot_then_seeds_in_the_background(self) -> None:
+        self.files[SNAPSHOT_KEY] = RESTORED
+        release = asyncio.Event()
+
+        async def _slow_status(device_id):
+            await release.wait()
+            return RECORD
+
+        self.client.get_device_status.side_effect = _slow_status
+
+        self.assertTrue(await init_module.async_setup_entry(self.hass, self.entry))
+
+        # platforms come up from the stored snapshot while the cloud is still answering
+        snapshot = self._coordinator().data
+        self.assertTrue(snapshot.restored)
+        self.assertEqual((snapshot.gate.phase, snapshot.gate.position), (16, 100))
+        self.hass.config_entries.async_forward_entry_setups.assert_awaited_once()
+
+        release.set()
+        await asyncio.wait_for(self._seed_task(), 1)
+
+        snapshot = self._coordinator().data
+        self.assertFalse(snapshot.restored)
+        self.assertEqual(snapshot.gate.phase, 17)
+
+    async def test_failed_seed_keeps_the_assumed_state_and_retries(self) -> None:
+        self.files[SNAPSHOT_KEY] = RESTORED
+        self.client.get_device_status.side_effect = [RuntimeError("cloud down"), RuntimeError("cloud down"), RECORD]
+        sleeps = []
+        real_sleep = asyncio.sleep
+
+        async def _record_sleep(delay):
+            sleeps.append(delay)
+            # entities stay on the restored snapshot, not unavailable
+            self.assertTrue(self._coordinator().data.restored)
+            await real_sleep(0)
+
+        with patch.object(init_module.asyncio, "sleep", _record_sleep):
+            await init_module.async_setup_entry(self.hass, self.entry)
+            await asyncio.wait_for(self._seed_task(), 1)
+
+        self.assertEqual(sleeps, [0.01, 0.02])  # backoff doubles
+        self.assertEqual(self.client.get_device_status.await_count, 3)
+        self.assertFalse(self._coordinator().data.restored)
+
+    async def test_seed_loop_stops_once_a_ws_resync_arrives(self) -> None:
+        self.files[SNAPSHOT_KEY] = RESTORED
+        attempted = asyncio.Event()
+
+        async def _cloud_down(device_id):
+            attempted.set()
+            raise RuntimeError("cloud down")
+
+        self.client.get_device_status.side_effect = _cloud_down
+
+        await init_module.async_setup_entry(self.hass, self.entry)
+        on_resync = self.account.async_add_handler.await_args.kwargs["on_resync"]
+        await asyncio.wait_for(attempted.wait(), 1)  # first seed attempt fails and backs off
+
+        on_resync(RECORD, time.monotonic())
+        await asyncio.wait_for(self._seed_task(), 1)
+
+        self.assertFalse(self._coordinator().data.restored)
+        self.assertEqual(self._coordinator().data.gate.phase, 17)
+        self.assertEqual(self.client.get_device_status.await_count, 1)
+
+    async def test_remove_entry_drops_the_snapshot_and_token_stores(self) -> None:
+        key = account_module.account_key(ENTRY_DATA[const_module.CONF_CLIENT_ID], ENTRY_DATA[const_module.CONF_USERNAME])
+        token_key = account_module.token_store_for(self.hass, key).key
+        self.files[token_key] = {"access_token": "dummy-token"}
+
+        await init_module.async_setup_entry(self.hass, self.entry)
+        self.assertTrue(await init_module.async_unload_entry(self.hass, self.entry))
+        self.assertIn(SNAPSHOT_KEY, self.files)  # flushed on unload for the next start
+
+        await init_module.async_remove_entry(self.hass, self.entry)
+
+        self.assertNotIn(SNAPSHOT_KEY, self.files)
+        self.assertNotIn(token_key, self.files)
+
+    async def test_remove_entry_keeps_the_token_of_an_account_still_in_use(self) -> None:
+        key = account_module.account_key(ENTRY_DATA[const_module.CONF_CLIENT_ID], ENTRY_DATA[const_module.CONF_USERNAME])
+        token_key = account_module.token_store_for(self.hass, key).key
+        self.files[token_key] = {"access_token": "dummy-token"}
+        other = ConfigEntry(data=dict(ENTRY_DATA, device_id="222222"), entry_id="entry-2")
+        self.hass.config_entries.async_entries = lambda domain: [self.entry, other]
+
+        await init_module.async_remove_entry(self.hass, self.entry)
+
+        self.assertIn(token_key, self.files)
+
+
+if __name__ == "__main__":
+    unittest.main()
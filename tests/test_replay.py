@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import replay_ws
+
+api_module = replay_ws.api_module
+
+DUMMY_DEVICE = 111111
+
+
+def _frame(event_id: int, payload, device_id: int = DUMMY_DEVICE) -> str:
+    inner = json.dumps({"Payload": payload})
+    return json.dumps({"Data": {"EventId": event_id, "DeviceId": device_id, "Data": inner}})
+
+
+class RecordReplayTests(unittest.IsolatedAsyncioTestCase):
+    async def test_recording_replays_into_entity_timeline(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "capture.jsonl"
+            recorder = api_module.FrameRecorder(str(path))
+            for frame in (
+                _frame(21, [32, 0]),
+                _frame(21, [32, 50]),
+                _frame(99, []),  # no decoder
+                _frame(21, [16, 100], device_id=222222),  # another gate
+                _frame(21, [16, 100]).encode(),
+                _frame(6, {"Online": False}),
+            ):
+                recorder.record(frame)
+            await recorder.async_close()
+
+            frames = replay_ws.load_recording(path)
+
+        report = await replay_ws.replay(frames, device_id=str(DUMMY_DEVICE))
+
+        self.assertEqual(report.frames, 6)
+        self.assertEqual(report.events, 5)
+        self.assertEqual(report.applied, 4)
+        self.assertIn((report.timeline[0][1], report.timeline[0][2]), [("Gate Phase", "Opening"), ("Gate Moving", True)])
+        phases = [state for _t, name, state in report.timeline if name == "Gate Phase"]
+        self.assertEqual(phases, ["Opening", "Open"])
+        self.assertEqual([s for _t, n, s in report.timeline if n == "Gate Hub Online"], [False])
+        self.assertEqual(set(report.cpu_seconds), set(replay_ws.STAGES))
+        self.assertGreater(report.events_per_second, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
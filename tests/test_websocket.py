@@ -0,0 +1,616 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+import unittest
+
+from _support import ROOT, ensure_custom_component_packages, load_module
+
+ensure_custom_component_packages()
+
+load_module(
+    "custom_components.came_connect.const",
+    ROOT / "custom_components" / "came_connect" / "const.py",
+)
+api_module = load_module(
+    "custom_components.came_connect.api",
+    ROOT / "custom_components" / "came_connect" / "api.py",
+)
+events_module = sys.modules["custom_components.came_connect.events"]
+
+DUMMY_DEVICE_ONE = 111111
+DUMMY_DEVICE_TWO = 222222
+
+
+def _frame(event_id: int, payload, device_id: int | None = None) -> str:
+    data = {"EventId": event_id, "Data": json.dumps({"Payload": payload})}
+    if device_id is not None:
+        data["DeviceId"] = device_id
+    return json.dumps({"Data": data})
+
+
+def _status_frame(device_id: int | None, phase: int, percent: int) -> str:
+    return _frame(21, [phase, percent], device_id)
+
+
+def _ws_client(on_event, **kwargs):
+    async def _token() -> str:
+        return "dummy-access-token"
+
+    return api_module.CameWebsocketClient(
+        session=None,
+        ws_url="wss://example.test/ws",
+        token_getter=_token,
+        on_event=on_event,
+        **kwargs,
+    )
+
+
+class FrameDecoderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = _ws_client(None)
+
+    def test_status_frame_as_str_and_bytes(self) -> None:
+        frame = _status_frame(DUMMY_DEVICE_ONE, 32, 40)
+        expected = events_module.StatusEvent(DUMMY_DEVICE_ONE, 32, 40)
+        self.assertEqual(self.client._parse_frame(frame), expected)
+        self.assertEqual(self.client._parse_frame(frame.encode()), expected)
+
+    def test_every_registered_event_type_decodes(self) -> None:
+        cases = [
+            (_frame(5, {"Online": True}, DUMMY_DEVICE_ONE), events_module.ConnectivityEvent(DUMMY_DEVICE_ONE, True)),
+            (_frame(6, {"Online": False}, DUMMY_DEVICE_ONE), events_module.ConnectivityEvent(DUMMY_DEVICE_ONE, False)),
+            (_frame(22, {"ErrorCode": 7}, DUMMY_DEVICE_ONE), events_module.ErrorEvent(DUMMY_DEVICE_ONE, 7)),
+            (_frame(23, [1234], DUMMY_DEVICE_ONE), events_module.ManeuverCountEvent(DUMMY_DEVICE_ONE, 1234)),
+            (
+                _frame(23, {"Online": True, "States": []}, DUMMY_DEVICE_ONE),
+                events_module.SnapshotEvent(DUMMY_DEVICE_ONE, {"Online": True, "States": []}),
+            ),
+        ]
+        for frame, expected in cases:
+            with self.subTest(frame=frame):
+                self.assertEqual(self.client._parse_frame(frame), expected)
+
+    def test_events_are_slotted(self) -> None:
+        event = events_module.StatusEvent(DUMMY_DEVICE_ONE, 16, 100)
+        self.assertFalse(hasattr(event, "__dict__"))
+
+    def test_unhandled_events_skip_json_parsing(self) -> None:
+        frame = _frame(99, [1, 2])
+        with patch.object(api_module, "_ws_json_loads") as loads:
+            self.assertIsNone(self.client._parse_frame(frame))
+        loads.assert_not_called()
+
+    def test_malformed_payload_is_dropped(self) -> None:
+        self.assertIsNone(self.client._parse_frame(_frame(21, ["x", 1])))
+        self.assertIsNone(self.client._parse_frame(_frame(22, {"Message": "?"})))
+
+    def test_unconfirmed_event_ids_need_the_expected_payload(self) -> None:
+        for frame in (
+            _frame(5, None, DUMMY_DEVICE_ONE),
+            _frame(5, {"Online": False}, DUMMY_DEVICE_ONE),
+            _frame(6, [0], DUMMY_DEVICE_ONE),
+            _frame(22, [7], DUMMY_DEVICE_ONE),
+            _frame(22, {"ErrorCode": "7"}, DUMMY_DEVICE_ONE),
+        ):
+            with self.subTest(frame=frame):
+                self.assertIsNone(self.client._parse_frame(frame))
+
+    def test_frames_for_unknown_devices_are_dropped_before_decoding(self) -> None:
+        client = _ws_client(None, device_filter=lambda device_id: device_id == str(DUMMY_DEVICE_ONE))
+        with patch.object(api_module, "_ws_json_loads") as loads:
+            self.assertIsNone(client._parse_frame(_status_frame(DUMMY_DEVICE_TWO, 16, 100).encode()))
+        loads.assert_not_called()
+        self.assertEqual(client.stats.foreign_frames, 1)
+        self.assertIsNotNone(client._parse_frame(_status_frame(DUMMY_DEVICE_ONE, 16, 100)))
+
+    def test_device_id_sniffed_by_the_caller_is_reused(self) -> None:
+        client = _ws_client(None, device_filter=lambda device_id: device_id == str(DUMMY_DEVICE_ONE))
+        frame = _status_frame(DUMMY_DEVICE_TWO, 16, 100)
+        with patch.object(api_module, "_sniff_device_id") as sniff:
+            self.assertIsNone(client._parse_frame(frame, str(DUMMY_DEVICE_TWO)))
+            self.assertIsNotNone(client._parse_frame(_status_frame(None, 16, 100), None))
+        sniff.assert_not_called()
+
+    def test_inner_event_id_is_not_mistaken_for_outer(self) -> None:
+        inner = json.dumps({"EventId": 99, "Payload": [16, 100]})
+        frame = json.dumps({"Data": {"EventId": 21, "Data": inner}})
+        self.assertEqual(self.client._parse_frame(frame), events_module.StatusEvent(None, 16, 100))
+
+
+class EventQueueTests(unittest.IsolatedAsyncioTestCase):
+    async def test_overflow_keeps_latest_event_per_device(self) -> None:
+        stats = api_module.WebsocketStats()
+        queue = api_module._CoalescingEventQueue(3, stats)
+
+        queue.put_nowait(DUMMY_DEVICE_ONE, "a10")
+        queue.put_nowait(DUMMY_DEVICE_TWO, "b10")
+        queue.put_nowait(DUMMY_DEVICE_ONE, "a50")
+        queue.put_nowait(DUMMY_DEVICE_ONE, "a100")
+
+        items = [(await queue.get())[1] for _ in range(len(queue))]
+        self.assertEqual(items, ["b10", "a50", "a100"])
+        self.assertEqual(stats.coalesced, 1)
+        self.assertEqual(stats.dropped, 0)
+        self.assertEqual(stats.max_queue_depth, 3)
+
+    async def test_overflow_without_duplicates_drops_oldest(self) -> None:
+        stats = api_module.WebsocketStats()
+        queue = api_module._CoalescingEventQueue(2, stats)
+
+        for device_id in (1, 2, 3):
+            queue.put_nowait(device_id, device_id)
+
+        self.assertEqual(await queue.get(), (2, 2))
+        self.assertEqual(stats.dropped, 1)
+
+
+class DispatcherTests(unittest.IsolatedAsyncioTestCase):
+    async def test_slow_handler_does_not_block_reads(self) -> None:
+        release = asyncio.Event()
+        received: list[tuple[int, int | None]] = []
+
+        async def _handler(event):
+            await release.wait()
+            received.append((event.phase, event.percent))
+
+        client = _ws_client(_handler, queue_size=4)
+        client._dispatch_task = asyncio.create_task(client._dispatch_loop())
+        try:
+            client._enqueue_frame(_status_frame(DUMMY_DEVICE_ONE, 32, 0))
+            await asyncio.sleep(0)  # dispatcher picks it up and blocks in the handler
+            for percent in range(10, 100, 10):
+                client._enqueue_frame(_status_frame(DUMMY_DEVICE_ONE, 32, percent))
+            client._enqueue_frame(_status_frame(DUMMY_DEVICE_ONE, 16, 100))
+            self.assertEqual(client.stats.frames, 11)
+
+            release.set()
+            for _ in range(20):
+                await asyncio.sleep(0)
+        finally:
+            await client.stop()
+
+        self.assertEqual(received[0], (32, 0))
+        self.assertEqual(received[-1], (16, 100))
+        self.assertLessEqual(len(received), 5)
+        self.assertGreater(client.stats.coalesced, 0)
+        self.assertEqual(client.stats.handler_calls, len(received))
+
+    async def test_handler_errors_do_not_stop_dispatch(self) -> None:
+        received: list[int] = []
+
+        async def _handler(event):
+            received.append(event.percent)
+            if event.percent == 0:
+                raise ValueError("boom")
+
+        client = _ws_client(_handler)
+        client._dispatch_task = asyncio.create_task(client._dispatch_loop())
+        try:
+            client._enqueue_frame(_status_frame(None, 32, 0))
+            client._enqueue_frame(_status_frame(None, 32, 40))
+            for _ in range(5):
+                await asyncio.sleep(0)
+        finally:
+            await client.stop()
+
+        self.assertEqual(received, [0, 40])
+
+
+class _FakeWebSocket:
+    """Async-iterable socket fed from a queue; answers pings unless `silent`."""
+
+    def __init__(self, silent: bool = False) -> None:
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.silent = silent
+        self.pings = 0
+        self.pongs: list = []
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.messages.get()
+
+    async def ping(self, data: bytes = b"") -> None:
+        self.pings += 1
+        if not self.silent:
+            self.messages.put_nowait(SimpleNamespace(type=api_module.aiohttp.WSMsgType.PONG, data=data))
+
+    async def pong(self, data: bytes = b"") -> None:
+        self.pongs.append(data)
+
+    async def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.messages.put_nowait(SimpleNamespace(type=api_module.aiohttp.WSMsgType.CLOSED, data=None))
+
+
+class HeartbeatTests(unittest.IsolatedAsyncioTestCase):
+    async def test_silent_connection_is_dropped_by_the_watchdog(self) -> None:
+        client = _ws_client(None, heartbeat=0.01, idle_timeout=0.05)
+        ws = _FakeWebSocket(silent=True)
+
+        await asyncio.wait_for(client._read(ws), timeout=1)
+
+        self.assertGreater(ws.pings, 0)
+        self.assertEqual(client.stats.stale_reconnects, 1)
+        self.assertGreaterEqual(client.stats.seconds_since_last_frame, 0.05)
+
+    async def test_pongs_keep_the_connection_and_measure_rtt(self) -> None:
+        client = _ws_client(None, heartbeat=0.01, idle_timeout=0.05)
+        ws = _FakeWebSocket()
+
+        reader = asyncio.create_task(client._read(ws))
+        await asyncio.sleep(0.15)
+        self.assertFalse(reader.done())
+        ws.messages.put_nowait(SimpleNamespace(type=api_module.aiohttp.WSMsgType.CLOSED, data=None))
+        await asyncio.wait_for(reader, timeout=1)
+
+        self.assertEqual(client.stats.stale_reconnects, 0)
+        self.assertIsNotNone(client.stats.last_rtt)
+        self.assertIn("seconds_since_last_frame", client.stats.as_dict())
+
+    def test_rtt_is_measured_from_the_ping_a_pong_answers(self) -> None:
+        client = _ws_client(None)
+        client._pings_in_flight = {b"1": 10.0, b"2": 40.0}  # the first pong was lost
+
+        client._on_pong(b"2", 40.25)
+        self.assertEqual(client.stats.last_rtt, 0.25)
+        self.assertEqual(client._pings_in_flight, {})
+
+        client._on_pong(b"1", 41.0)  # late answer to a ping already given up on
+        self.assertEqual(client.stats.last_rtt, 0.25)
+
+    async def test_server_pings_are_answered(self) -> None:
+        client = _ws_client(None)
+        ws = _FakeWebSocket()
+        ws.messages.put_nowait(SimpleNamespace(type=api_module.aiohttp.WSMsgType.PING, data=b"hi"))
+        ws.messages.put_nowait(SimpleNamespace(type=api_module.aiohttp.WSMsgType.CLOSED, data=None))
+
+        await asyncio.wait_for(client._read(ws), timeout=1)
+
+        self.assertEqual(ws.pongs, [b"hi"])
+
+
+class RotationTests(unittest.IsolatedAsyncioTestCase):
+    async def test_replacement_socket_opens_before_old_one_closes(self) -> None:
+        tokens = iter(["token-2"])
+        old_ws, new_ws = _FakeWebSocket(), _FakeWebSocket()
+
+        async def _token() -> str:
+            return next(tokens)
+
+        async def _connect(url, *, protocols, **kwargs):
+            self.assertFalse(old_ws.closed)  # make before break
+            self.assertEqual(protocols, ["token-2"])
+            return new_ws
+
+        client = api_module.CameWebsocketClient(
+            session=SimpleNamespace(ws_connect=_connect),
+            ws_url="wss://example.test/ws",
+            token_getter=_token,
+            on_event=None,
+            token_ttl=lambda: 0.02,
+        )
+
+        ws, token, receive = await asyncio.wait_for(client._read(old_ws, "token-1"), timeout=1)
+
+        self.assertIs(ws, new_ws)
+        self.assertEqual(token, "token-2")
+        self.assertTrue(old_ws.closed)
+        self.assertFalse(receive.done())
+        self.assertEqual(client.stats.rotations, 1)
+        await new_ws.close()
+        await receive
+
+    async def test_rotation_is_skipped_until_token_is_renewed(self) -> None:
+        async def _token() -> str:
+            return "token-1"
+
+        client = _ws_client(None, token_ttl=lambda: 0.02, heartbeat=0.01, idle_timeout=0.1)
+        client._token_getter = _token
+        ws = _FakeWebSocket(silent=True)
+
+        self.assertIsNone(await asyncio.wait_for(client._read(ws, "token-1"), timeout=1))
+        self.assertEqual(client.stats.rotations, 0)
+        self.assertEqual(client.stats.stale_reconnects, 1)
+
+    def test_frames_seen_twice_during_overlap_are_dropped(self) -> None:
+        client = _ws_client(None)
+        frame = _status_frame(DUMMY_DEVICE_ONE, 32, 40)
+        self.assertFalse(client._is_duplicate(frame, 1))  # no rotation in progress
+
+        client._dedupe_until = time.monotonic() + 5
+        self.assertFalse(client._is_duplicate(frame, 1))
+        self.assertTrue(client._is_duplicate(frame, 2))
+        self.assertFalse(client._is_duplicate(_status_frame(DUMMY_DEVICE_ONE, 16, 100), 2))
+        self.assertEqual(client.stats.duplicates_dropped, 1)
+
+        client._dedupe_until = time.monotonic() - 1
+        self.assertFalse(client._is_duplicate(frame, 2))
+
+    def test_repeats_on_one_socket_are_kept(self) -> None:
+        client = _ws_client(None)
+        frame = _status_frame(DUMMY_DEVICE_ONE, 32, 40)
+        client._dedupe_until = time.monotonic() + 5
+
+        self.assertFalse(client._is_duplicate(frame, 1))
+        self.assertFalse(client._is_duplicate(frame, 1))  # sent twice by the server
+        self.assertTrue(client._is_duplicate(frame, 2))
+        self.assertTrue(client._is_duplicate(frame, 2))
+        self.assertFalse(client._is_duplicate(frame, 2))  # a third, new event
+        self.assertEqual(client.stats.duplicates_dropped, 2)
+
+    async def test_rotation_is_retried_until_the_token_is_renewed(self) -> None:
+        tokens = iter(["token-1", "token-1", "token-2"])
+        new_ws = _FakeWebSocket()
+        client = _ws_client(None, token_ttl=lambda: 0.2)
+        client._token_getter = AsyncMock(side_effect=lambda: next(tokens))
+        client._connect = AsyncMock(return_value=new_ws)
+
+        with patch.object(api_module, "WS_ROTATE_RETRY", 0.01):
+            replacement = await asyncio.wait_for(client._rotate("token-1"), timeout=1)
+
+        self.assertEqual(replacement, (new_ws, "token-2"))
+        self.assertEqual(client._token_getter.await_count, 3)
+
+
+class ReconnectSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    def test_backoff_is_decorrelated_and_capped(self) -> None:
+        scheduler = api_module.ReconnectScheduler(base=1, cap=30)
+        delays = []
+        delay = None
+        for _ in range(200):
+            delay = scheduler.backoff(delay)
+            delays.append(delay)
+        self.assertTrue(all(1 <= d <= 30 for d in delays))
+        self.assertGreater(len(set(round(d, 3) for d in delays)), 100)
+
+    async def test_slots_cap_concurrency_and_admit_recent_activity_first(self) -> None:
+        scheduler = api_module.ReconnectScheduler(concurrency=1)
+        order: list[str] = []
+        release = asyncio.Event()
+
+        async def _connect(name: str, priority: float, hold: bool = False) -> None:
+            async with scheduler.slot(priority):
+                order.append(name)
+                if hold:
+                    await release.wait()
+
+        first = asyncio.create_task(_connect("first", 0, hold=True))
+        await asyncio.sleep(0)
+        idle = asyncio.create_task(_connect("idle", 0))
+        active = asyncio.create_task(_connect("active", -100))
+        await asyncio.sleep(0)
+        self.assertEqual(scheduler.as_dict()["waiting"], 2)
+
+        release.set()
+        await asyncio.gather(first, idle, active)
+
+        self.assertEqual(order, ["first", "active", "idle"])
+        self.assertEqual(scheduler.as_dict()["connecting"], 0)
+
+    def test_recovery_time_spans_first_loss_to_last_reconnect(self) -> None:
+        scheduler = api_module.ReconnectScheduler()
+        a, b = object(), object()
+        for client in (a, b):
+            scheduler.register(client)
+            scheduler.mark_connected(client)
+
+        scheduler.mark_disconnected(a)
+        scheduler.mark_disconnected(b)
+        scheduler.mark_connected(a)
+        self.assertIsNotNone(scheduler.as_dict()["outage_seconds"])
+        scheduler.mark_connected(b)
+
+        info = scheduler.as_dict()
+        self.assertEqual(info["outages"], 1)
+        self.assertIsNone(info["outage_seconds"])
+        self.assertIsNotNone(info["last_recovery_seconds"])
+
+
+class CloseCodePolicyTests(unittest.IsolatedAsyncioTestCase):
+    def test_close_codes_and_statuses_are_classified(self) -> None:
+        cases = {
+            (1000, None): api_module.WS_OUTCOME_NORMAL,
+            (1001, None): api_module.WS_OUTCOME_NORMAL,
+            (1008, None): api_module.WS_OUTCOME_AUTH,
+            (4401, None): api_module.WS_OUTCOME_AUTH,
+            (1013, None): api_module.WS_OUTCOME_OVERLOAD,
+            (1006, None): api_module.WS_OUTCOME_ERROR,
+            (None, None): api_module.WS_OUTCOME_ERROR,
+            (None, 401): api_module.WS_OUTCOME_AUTH,
+            (None, 503): api_module.WS_OUTCOME_OVERLOAD,
+            (None, 404): api_module.WS_OUTCOME_ERROR,
+        }
+        for (close_code, status), expected in cases.items():
+            with self.subTest(close_code=close_code, status=status):
+                self.assertEqual(api_module.classify_ws_close(close_code, status), expected)
+
+    def test_delays_follow_the_outcome(self) -> None:
+        invalidate = MagicMock()
+        client = _ws_client(None, on_auth_failure=invalidate)
+
+        self.assertEqual(client._reconnect_delay(api_module.WS_OUTCOME_AUTH, None), 0.0)
+        self.assertGreaterEqual(client._reconnect_delay(api_module.WS_OUTCOME_AUTH, None), 1)  # repeated
+        self.assertEqual(invalidate.call_count, 2)
+        self.assertLessEqual(client._reconnect_delay(api_module.WS_OUTCOME_NORMAL, None), 1)
+        self.assertGreaterEqual(client._reconnect_delay(api_module.WS_OUTCOME_OVERLOAD, None), 15)
+        self.assertEqual(client._reconnect_delay(api_module.WS_OUTCOME_AUTH, None), 0.0)  # reset by other outcome
+
+    async def test_rejected_handshake_refreshes_token_and_reconnects_at_once(self) -> None:
+        tokens = iter(["revoked", "fresh"])
+        invalidate = MagicMock()
+        connected = asyncio.Event()
+        seen: list[str] = []
+
+        async def _token() -> str:
+            return next(tokens)
+
+        async def _connect(url, *, protocols, **kwargs):
+            seen.append(protocols[0])
+            if protocols[0] == "revoked":
+                raise api_module.aiohttp.WSServerHandshakeError(
+                    SimpleNamespace(real_url=url), (), status=401, message="unauthorized"
+                )
+            connected.set()
+            return _FakeWebSocket()
+
+        client = api_module.CameWebsocketClient(
+            session=SimpleNamespace(ws_connect=_connect),
+            ws_url="wss://example.test/ws",
+            token_getter=_token,
+            on_event=None,
+            on_auth_failure=invalidate,
+        )
+        await client.start()
+        try:
+            await asyncio.wait_for(connected.wait(), timeout=0.5)
+        finally:
+            await client.stop()
+
+        self.assertEqual(seen, ["revoked", "fresh"])
+        invalidate.assert_called_once_with()
+        self.assertEqual(client.stats.auth_rejections, 1)
+
+
+class CompressionTests(unittest.IsolatedAsyncioTestCase):
+    async def test_broken_deflate_answer_falls_back_to_uncompressed(self) -> None:
+        offered: list[int] = []
+
+        async def _connect(url, *, compress, **kwargs):
+            offered.append(compress)
+            if compress:
+                raise api_module.aiohttp.WSServerHandshakeError(
+                    SimpleNamespace(real_url=url), (), status=101, message="Invalid window size"
+                )
+            return _FakeWebSocket()
+
+        client = _ws_client(None)
+        client._session = SimpleNamespace(ws_connect=_connect)
+
+        await client._connect("token")
+        await client._connect("token")
+
+        self.assertEqual(offered, [15, 0, 0])  # the offer is not repeated
+        self.assertEqual(client.stats.compression_fallbacks, 1)
+        self.assertEqual(client.stats.compression, 0)
+
+    def test_wire_and_payload_bytes_are_counted(self) -> None:
+        received: list[bytes] = []
+        protocol = SimpleNamespace(data_received=received.append)
+        ws = SimpleNamespace(compress=15, _conn=SimpleNamespace(protocol=protocol))
+        client = _ws_client(None)
+        one = _status_frame(DUMMY_DEVICE_ONE, 32, 40)
+        two = _status_frame(DUMMY_DEVICE_TWO, 32, 40).encode()
+
+        client._track_connection(ws)
+        protocol.data_received(b"x" * 30)
+        client._count_payload(one, str(DUMMY_DEVICE_ONE))
+        client._count_payload(two, str(DUMMY_DEVICE_TWO))
+
+        stats = client.stats
+        self.assertEqual(received, [b"x" * 30])  # still reaches aiohttp's parser
+        self.assertEqual(stats.compression, 15)
+        self.assertEqual(stats.connection_wire_bytes, 30)
+        self.assertEqual(stats.connection_frames, 2)
+        self.assertEqual(stats.connection_payload_bytes, len(one) + len(two))
+        self.assertEqual(
+            stats.device_payload_bytes,
+            {str(DUMMY_DEVICE_ONE): len(one), str(DUMMY_DEVICE_TWO): len(two)},
+        )
+        self.assertAlmostEqual(stats.as_dict()["compression_ratio"], (len(one) + len(two)) / 30)
+
+        client._track_connection(_FakeWebSocket())  # not instrumentable
+        self.assertIsNone(stats.connection_wire_bytes)
+        self.assertEqual(stats.wire_bytes, 30)
+        self.assertIsNone(stats.compression_ratio)
+
+
+class ConnectHookTests(unittest.IsolatedAsyncioTestCase):
+    async def test_connects_during_a_resync_run_one_more_and_errors_are_contained(self) -> None:
+        release = asyncio.Event()
+        calls = 0
+
+        async def _on_connect():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            raise RuntimeError("devicestatus failed")
+
+        client = _ws_client(None, on_connect=_on_connect)
+        client._notify_connected()
+        await asyncio.sleep(0)
+        client._notify_connected()  # still running: not started twice
+        client._notify_connected()
+        self.assertEqual(calls, 1)
+        release.set()
+        await client._connect_task
+
+        self.assertEqual(calls, 2)  # one follow-up for both connects
+        await client.stop()
+
+    async def test_events_carry_the_receive_time(self) -> None:
+        client = _ws_client(None)
+        client._enqueue_frame(_status_frame(DUMMY_DEVICE_ONE, 32, 40), received_at=12.5)
+        _key, event = await client._queue.get()
+        self.assertEqual(event.received_at, 12.5)
+        self.assertEqual(event, events_module.StatusEvent(DUMMY_DEVICE_ONE, 32, 40))
+
+
+class BreakerGuardTests(unittest.IsolatedAsyncioTestCase):
+    def _client(self, breaker, connect):
+        return api_module.CameWebsocketClient(
+            session=SimpleNamespace(ws_connect=connect),
+            ws_url="wss://example.test/ws",
+            token_getter=AsyncMock(return_value="dummy-access-token"),
+            on_event=None,
+            circuit_breaker=breaker,
+        )
+
+    async def test_connect_waits_while_another_caller_holds_the_probe(self) -> None:
+        breaker = api_module.CircuitBreaker(min_calls=1, open_seconds=0)
+        breaker.record_failure()
+        breaker.before_call()  # a REST call is the half-open probe
+        connect = AsyncMock(return_value=_FakeWebSocket())
+        client = self._client(breaker, connect)
+
+        with self.assertRaises(api_module.CameCircuitOpenError):
+            await client._guarded_connect("dummy-access-token")
+        connect.assert_not_awaited()
+
+        breaker.record_success()
+        await client._guarded_connect("dummy-access-token")
+        connect.assert_awaited_once()
+
+    async def test_connect_outcomes_are_recorded(self) -> None:
+        breaker = api_module.CircuitBreaker(min_calls=1, open_seconds=60)
+
+        async def _rejected(url, **kwargs):
+            raise api_module.aiohttp.WSServerHandshakeError(
+                SimpleNamespace(real_url=url), (), status=401, message="unauthorized"
+            )
+
+        with self.assertRaises(api_module.aiohttp.ClientResponseError):
+            await self._client(breaker, _rejected)._guarded_connect("revoked")
+        self.assertEqual(breaker.state, api_module.CIRCUIT_CLOSED)
+
+        async def _unavailable(url, **kwargs):
+            raise api_module.aiohttp.WSServerHandshakeError(
+                SimpleNamespace(real_url=url), (), status=503, message="unavailable"
+            )
+
+        breaker = api_module.CircuitBreaker(min_calls=1, open_seconds=60)
+        with self.assertRaises(api_module.aiohttp.ClientResponseError):
+            await self._client(breaker, _unavailable)._guarded_connect("dummy-access-token")
+        self.assertEqual(breaker.state, api_module.CIRCUIT_OPEN)
+
+
+if __name__ == "__main__":
+    unittest.main()